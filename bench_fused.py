@@ -0,0 +1,69 @@
+import argparse
+import statistics
+import time
+from services.auth_service import AuthService
+from services.resume_service import ResumeService
+from services.ai_service import AiService
+from utils.helpers import get_job_description
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+parser = argparse.ArgumentParser(description="Benchmark fused vs two-pass JD optimisation on the same inputs.")
+parser.add_argument("--jd", type=str, required=True, help="Job description (text or file path)")
+parser.add_argument("--runs", type=int, default=3, help="Runs per strategy. Default: 3")
+args = parser.parse_args()
+
+log_step(logger, 9, "Benchmarking Fused vs Two-Pass Optimisation")
+
+def two_pass(ai_service, resume_data, job_description):
+    optimised = ai_service.optimise_generic(resume_data)
+    return ai_service.optimise_with_jd(optimised, job_description)
+
+def fused(ai_service, resume_data, job_description):
+    return ai_service.optimise_fused(resume_data, job_description)
+
+try:
+    auth_service = AuthService()
+    auth_service.authenticate()
+
+    resume_data = ResumeService(auth_service).fetch_resume_data()
+    job_description = get_job_description(args.jd)
+
+    # no cache, so every run pays the full round trips
+    ai_service = AiService()
+    timings = {"two-pass": [], "fused": []}
+    failures = {"two-pass": 0, "fused": 0}
+
+    for run in range(1, args.runs + 1):
+        for name, strategy in (("two-pass", two_pass), ("fused", fused)):
+            logger.info(f"\n--- Run {run}/{args.runs}: {name} ---")
+            start = time.perf_counter()
+            try:
+                strategy(ai_service, resume_data, job_description)
+                timings[name].append(time.perf_counter() - start)
+            except ValueError as e:
+                failures[name] += 1
+                log_message(logger, f"{name} output failed validation: {e}", LogType.WARNING)
+
+    logger.info("\n--- Results ---")
+    for name, samples in timings.items():
+        if not samples:
+            logger.info(f"  {name:<9} no successful runs ({failures[name]} failed)")
+            continue
+        logger.info(
+            f"  {name:<9} median {statistics.median(samples):6.1f}s  "
+            f"mean {statistics.mean(samples):6.1f}s  "
+            f"min {min(samples):6.1f}s  max {max(samples):6.1f}s  "
+            f"failed {failures[name]}"
+        )
+
+    if timings["two-pass"] and timings["fused"]:
+        speedup = statistics.median(timings["two-pass"]) / statistics.median(timings["fused"])
+        log_message(logger, f"Fused is {speedup:.2f}x the speed of two-pass (median)", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Benchmark failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
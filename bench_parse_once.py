@@ -0,0 +1,175 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from config.settings import settings
+from utils.payload import compact_payload, minify_json
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+parser = argparse.ArgumentParser(description="Micro-benchmark the resume's parse/serialise cycles through the real AI and generator services.")
+parser.add_argument("--jobs", type=int, default=200, help="Experience entries in the synthetic resume. Default: 200")
+parser.add_argument("--runs", type=int, default=20, help="Timed runs per configuration. Default: 20")
+args = parser.parse_args()
+
+log_step(logger, 11, "Benchmarking Parse-Once Resume Handling")
+
+def build_resume(jobs: int) -> dict:
+    return {
+        "name": "Jane Doe",
+        "summary": "Backend engineer who cut p99 latency by 40% across #1-ranked services.",
+        "skills": {"languages": ["Python", "C#", "Go"], "cloud": ["AWS", "Azure"]},
+        "experience": [
+            {
+                "role": f"Engineer {i}",
+                "company": f"Company #{i}",
+                "startDate": f"20{i % 20:02d}-01",
+                "bullets": [f"Improved throughput of service {i}.{b} by {b * 7}% using Python and C#" for b in range(6)]
+            }
+            for i in range(jobs)
+        ]
+    }
+
+class Counting:
+    # counts only resume-sized documents, so ledger lines and latency files don't show up
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.ops = Counter()
+        self._dumps = json.dumps
+        self._loads = json.loads
+
+    def dumps(self, value, **kwargs):
+        text = self._dumps(value, **kwargs)
+        if len(text) >= self.threshold:
+            self.ops["serialise"] += 1
+        return text
+
+    def loads(self, text, **kwargs):
+        if len(text) >= self.threshold:
+            self.ops["parse"] += 1
+        return self._loads(text, **kwargs)
+
+    def __enter__(self):
+        json.dumps, json.loads = self.dumps, self.loads
+        return self
+
+    def __exit__(self, *exc):
+        json.dumps, json.loads = self._dumps, self._loads
+
+class StubResponse:
+    status_code = 200
+    headers = {}
+    elapsed = timedelta(0)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+class StubTransport:
+    # stands in for the pooled client and the authenticated API; bodies are encoded the way requests would
+    def __init__(self, replies: dict):
+        self.replies = replies
+
+    def post(self, url: str, endpoint: str = "default", **kwargs) -> StubResponse:
+        json.dumps(kwargs["json"])
+        user_content = kwargs["json"]["messages"][-1]["content"]
+        return StubResponse(self.replies["p2" if user_content.startswith('{"jd"') else "p1"])
+
+    def request(self, method: str, url: str, endpoint: str = "default", **kwargs) -> StubResponse:
+        json.dumps(kwargs["json"])
+        return StubResponse('{"data":{"jobId":"job-1"}}')
+
+def model_reply(content: dict) -> str:
+    # what the server sends back: the rewritten resume wrapped in a chat-completions envelope
+    return json.dumps({"choices": [{"message": {"content": "```json\n" + minify_json(content) + "\n```"}}]})
+
+try:
+    tmp = tempfile.mkdtemp()
+    settings_class = type(settings)
+    settings_class.AI_REQUESTS_PER_MINUTE = 0
+    settings_class.AI_FALLBACK_MODELS = []
+    settings_class.AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    settings_class.AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+    settings_class.RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    settings_class.JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+
+    from services.ai_service import AiService
+    from services.generator_service import GeneratorService
+    from utils.cache import ResponseCache
+
+    for name in ("services.ai_service", "services.generator_service", "utils.render_index"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    resume = build_resume(args.jobs)
+    jd = "Senior backend engineer, Python, C#, AWS. " * 50
+    size = len(json.dumps(resume))
+    logger.info(f"Synthetic resume: {size / 1024:.0f} KiB, {args.jobs} jobs")
+
+    # the model's replies are produced server-side, so they are built outside the timed region
+    compact, _ = compact_payload(resume)
+    transport = StubTransport({
+        "p1": model_reply({**compact, "_issues": []}),
+        "p2": model_reply({**compact, "_issues": [], "score": 80})
+    })
+
+    def run(cache: bool, io: Counting) -> dict:
+        ai_service = AiService(
+            cache=ResponseCache(os.path.join(tmp, "cache"), 512 * 1024 * 1024, 3600) if cache else None,
+            refresh_cache=True
+        )
+        ai_service.http = transport
+        generator_service = GeneratorService(transport)
+
+        stages = {}
+
+        def timed(stage: str, call):
+            before = Counter(io.ops)
+            start = time.perf_counter()
+            result = call()
+            stages[stage] = (time.perf_counter() - start, io.ops - before)
+            return result
+
+        p1 = timed("P1", lambda: ai_service.optimise_generic(resume))
+        p2 = timed("P2", lambda: ai_service.optimise_with_jd(p1, jd))
+        timed("render", lambda: generator_service.generate_resume(p2, "templates/a.cshtml", "Jane"))
+        return stages
+
+    for cache in (False, True):
+        label = "cache on" if cache else "cache off"
+        with Counting(size // 2) as io:
+            counts = run(cache, io)
+
+        samples = {stage: [] for stage in counts}
+        for _ in range(args.runs):
+            with Counting(size // 2) as io:
+                for stage, (elapsed, _) in run(cache, io).items():
+                    samples[stage].append(elapsed)
+
+        logger.info(f"\n--- {label} ---")
+        for stage, (_, ops) in counts.items():
+            logger.info(
+                f"  {stage:<7} parses {ops['parse']:>2}  serialisations {ops['serialise']:>2}  "
+                f"median {statistics.median(samples[stage]) * 1000:7.1f} ms"
+            )
+
+    log_message(logger, "Counts cover resume-sized documents only; each AI call has two parses (envelope, content)", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Benchmark failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -7,15 +7,71 @@ class Settings:
   RESUME_API_BASE_URL: str = os.getenv("RESUME_API_BASE_URL", "https://portfolio-api-oo25.onrender.com/api")
   RESUME_API_USERNAME: str = os.getenv("RESUME_API_USERNAME")
   RESUME_API_PASSWORD: str = os.getenv("RESUME_API_PASSWORD")
+  RESUME_API_WARMUP_URL: str = os.getenv("RESUME_API_WARMUP_URL", "")
+  RESUME_API_KEEPALIVE_SECONDS: float = float(os.getenv("RESUME_API_KEEPALIVE_SECONDS", 240))
+  RESUME_SNAPSHOT_PATH: str = os.getenv("RESUME_SNAPSHOT_PATH", ".cache/resume_snapshot.json")
+  AUTH_TOKEN_CACHE_PATH: str = os.getenv("AUTH_TOKEN_CACHE_PATH", ".cache/auth_token.json")
+  AUTH_REFRESH_MARGIN_SECONDS: int = int(os.getenv("AUTH_REFRESH_MARGIN_SECONDS", 300))
+  AUTH_DEFAULT_TOKEN_TTL_SECONDS: int = int(os.getenv("AUTH_DEFAULT_TOKEN_TTL_SECONDS", 900))
   GITHUB_PAT: str = os.getenv("GITHUB_PAT")
   OPENAI_BASE_URL: str = "https://models.github.ai/inference/chat/completions"
   OPENAI_MODEL: str = "openai/gpt-4.1"
   TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN")
   TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID")
+  HTTP_POOL_CONNECTIONS: int = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+  HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+  HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 10))
+  HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", 30))
+  HTTP_AUTH_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_AUTH_TIMEOUT_SECONDS", 30))
+  HTTP_POLL_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_POLL_TIMEOUT_SECONDS", 30))
+  HTTP_AI_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_AI_TIMEOUT_SECONDS", 120))
+  HTTP_NOTIFY_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_NOTIFY_TIMEOUT_SECONDS", 30))
+  HTTP_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_WARMUP_TIMEOUT_SECONDS", 90))
+  HTTP_DOWNLOAD_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_DOWNLOAD_TIMEOUT_SECONDS", 120))
   POLL_INTERVAL_SECONDS: int = int(os.getenv("POLL_INTERVAL_SECONDS", 30))
   MAX_POLL_ATTEMPTS: int = int(os.getenv("MAX_POLL_ATTEMPTS", 20))
+  POLL_INITIAL_INTERVAL_SECONDS: float = float(os.getenv("POLL_INITIAL_INTERVAL_SECONDS", 1))
+  POLL_BACKOFF_MULTIPLIER: float = float(os.getenv("POLL_BACKOFF_MULTIPLIER", 2))
+  POLL_JITTER: float = float(os.getenv("POLL_JITTER", 0.2))
+  POLL_PRIOR_MIN_SAMPLES: int = int(os.getenv("POLL_PRIOR_MIN_SAMPLES", 3))
+  JOB_DURATION_HISTORY_PATH: str = os.getenv("JOB_DURATION_HISTORY_PATH", ".cache/job_durations.json")
+  RENDER_INDEX_PATH: str = os.getenv("RENDER_INDEX_PATH", ".cache/render_index.json")
+  RENDER_INDEX_TTL_SECONDS: int = int(os.getenv("RENDER_INDEX_TTL_SECONDS", 24 * 3600))
+  CALLBACK_HOST: str = os.getenv("CALLBACK_HOST", "127.0.0.1")
+  CALLBACK_PORT: int = int(os.getenv("CALLBACK_PORT", 0))
+  # full public address of the listener, including the /callback path it serves
+  CALLBACK_PUBLIC_URL: str = os.getenv("CALLBACK_PUBLIC_URL", "")
+  CALLBACK_TIMEOUT_SECONDS: float = float(os.getenv("CALLBACK_TIMEOUT_SECONDS", 60))
+  ARTIFACT_DIR: str = os.getenv("ARTIFACT_DIR", "artifacts")
+  DOWNLOAD_CHUNK_BYTES: int = int(os.getenv("DOWNLOAD_CHUNK_BYTES", 64 * 1024))
+  DOWNLOAD_ATTEMPTS: int = int(os.getenv("DOWNLOAD_ATTEMPTS", 3))
   DEFAULT_TEMPLATE_ID: str = os.getenv("DEFAULT_TEMPLATE_ID", "templates/resume_template.cshtml")
   DEFAULT_RESUME_NAME: str = os.getenv("DEFAULT_RESUME_NAME", "Vikramaditya_Pratap_Singh")
+  BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", 4))
+  ASYNC_WORKER_THREADS: int = int(os.getenv("ASYNC_WORKER_THREADS", 64))
+  BATCH_OUTPUT_PATH: str = os.getenv("BATCH_OUTPUT_PATH", "batch_results.jsonl")
+  ATS_SCORE_TOLERANCE: float = float(os.getenv("ATS_SCORE_TOLERANCE", 20))
+  AI_FALLBACK_MODELS: list = [model.strip() for model in os.getenv("AI_FALLBACK_MODELS", "").split(",") if model.strip()]
+  AI_HEDGE_AFTER_SECONDS: float = float(os.getenv("AI_HEDGE_AFTER_SECONDS", 0))
+  AI_HEDGE_DEFAULT_SECONDS: float = float(os.getenv("AI_HEDGE_DEFAULT_SECONDS", 45))
+  AI_HEDGE_MIN_SAMPLES: int = int(os.getenv("AI_HEDGE_MIN_SAMPLES", 5))
+  AI_LATENCY_HISTORY_PATH: str = os.getenv("AI_LATENCY_HISTORY_PATH", ".cache/ai_latency.json")
+  AI_LEDGER_PATH: str = os.getenv("AI_LEDGER_PATH", ".cache/ai_ledger.jsonl")
+  AI_PROMPT_COST_PER_MTOK: float = float(os.getenv("AI_PROMPT_COST_PER_MTOK", 0))
+  AI_COMPLETION_COST_PER_MTOK: float = float(os.getenv("AI_COMPLETION_COST_PER_MTOK", 0))
+  AI_STREAM_USAGE: bool = os.getenv("AI_STREAM_USAGE", "false").lower() == "true"
+  AI_REPAIR_ATTEMPTS: int = int(os.getenv("AI_REPAIR_ATTEMPTS", 2))
+  AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", 4))
+  AI_RETRY_BASE_SECONDS: float = float(os.getenv("AI_RETRY_BASE_SECONDS", 2))
+  AI_RETRY_MAX_SECONDS: float = float(os.getenv("AI_RETRY_MAX_SECONDS", 60))
+  AI_REQUESTS_PER_MINUTE: float = float(os.getenv("AI_REQUESTS_PER_MINUTE", 10))
+  AI_TOKENS_PER_MINUTE: float = float(os.getenv("AI_TOKENS_PER_MINUTE", 0))
+  AI_CACHE_DIR: str = os.getenv("AI_CACHE_DIR", ".cache/ai")
+  AI_CACHE_MAX_BYTES: int = int(os.getenv("AI_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+  AI_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("AI_CACHE_MAX_AGE_SECONDS", 7 * 24 * 3600))
+  AI_SECTION_WORKERS: int = int(os.getenv("AI_SECTION_WORKERS", 4))
+  AI_SECTION_RETRIES: int = int(os.getenv("AI_SECTION_RETRIES", 2))
+  AI_SECTION_STORE_PATH: str = os.getenv("AI_SECTION_STORE_PATH", ".cache/sections.json")
 
   @classmethod
   def validate(cls) -> bool:
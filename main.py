@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 
 import argparse
+import asyncio
+import json
+import os
 import sys
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from config.settings import settings
 from services.auth_service import AuthService
@@ -10,7 +15,27 @@ from services.resume_service import ResumeService
 from services.ai_service import AiService
 from services.generator_service import GeneratorService
 from services.notification_service import NotificationService
-from utils.helpers import get_job_description, validate_resume_name, validate_template_id, format_mode_name
+from services.warmup_service import WarmupService
+from utils.cache import ResponseCache
+from utils.section_store import SectionStore
+from utils.ats_scoring import score_resume
+from utils.rate_limiter import get_rate_limiter
+from utils.http_client import get_http_client
+from utils.ledger import load_ledger, format_report
+from utils.scheduler import StageScheduler
+from utils.callback_server import CallbackServer, is_loopback_url
+from utils.artifact_store import ArtifactStore, safe_filename
+from utils.latex import escape_latex_specials
+from utils.helpers import (
+  get_job_description,
+  read_file,
+  resolve_jd_files,
+  batch_resume_name,
+  resolve_render_targets,
+  validate_resume_name,
+  validate_template_id,
+  format_mode_name
+)
 from utils.logger import setup_logger, log_message, log_step, LogType
 
 def parse_args():
@@ -28,8 +53,15 @@ Examples:
   # JD-optimised with file
   python main.py --mode job-description --jd job_description.txt
 
+  # One resume against every JD in a directory
+  python main.py --jd-batch jds/ --batch-concurrency 4
+
   # Custom template and name
   python main.py --mode generic --template-id templates/modern.cshtml --resume-name John_Doe_2024
+
+  # Same resume rendered in two templates, polled together (exit status 2 if only some of them render)
+  python main.py --mode generic --template-id templates/modern.cshtml --resume-name John_Modern \\
+    --template-id templates/classic.cshtml --resume-name John_Classic
     """
   )
 
@@ -47,18 +79,129 @@ Examples:
     help="Job description (text or file path). Default: 'no' (generic mode)"
   )
 
+  parser.add_argument(
+    "--jd-batch",
+    type=str,
+    default=None,
+    help="Directory or glob of job description files; runs P1 once and P2 + generation per JD"
+  )
+  parser.add_argument(
+    "--batch-concurrency",
+    type=int,
+    default=settings.BATCH_CONCURRENCY,
+    help=f"Max job descriptions processed at once with --jd-batch. Default: {settings.BATCH_CONCURRENCY}"
+  )
+  parser.add_argument(
+    "--batch-output",
+    type=str,
+    default=settings.BATCH_OUTPUT_PATH,
+    help=f"JSONL file that per-JD results are appended to. Default: {settings.BATCH_OUTPUT_PATH}"
+  )
+
   parser.add_argument(
     "--template-id",
     type=str,
-    default=settings.DEFAULT_TEMPLATE_ID,
-    help=f"Template ID for resume generation. Default: {settings.DEFAULT_TEMPLATE_ID}"
+    action="append",
+    help=f"Template ID for resume generation, repeat to render several templates in one run. Default: {settings.DEFAULT_TEMPLATE_ID}"
   )
 
   parser.add_argument(
     "--resume-name",
     type=str,
-    default=settings.DEFAULT_RESUME_NAME,
-    help=f"Output resume filename. Default: {settings.DEFAULT_RESUME_NAME}"
+    action="append",
+    help=f"Output resume filename, repeat to pair with each --template-id. Default: {settings.DEFAULT_RESUME_NAME}"
+  )
+
+  parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Stream AI responses and abort as soon as the output stops being valid JSON"
+  )
+
+  parser.add_argument(
+    "--fused",
+    action="store_true",
+    help="In job-description mode, run AI P1 and P2 as a single request (falls back to two passes if the output is invalid)"
+  )
+  parser.add_argument(
+    "--parallel-sections",
+    action="store_true",
+    help="Run AI P1 per top-level resume section concurrently and merge the results"
+  )
+  parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Only re-optimise resume sections that changed since the last run (implies --parallel-sections)"
+  )
+  parser.add_argument(
+    "--section-workers",
+    type=int,
+    default=settings.AI_SECTION_WORKERS,
+    help=f"Max concurrent section requests with --parallel-sections. Default: {settings.AI_SECTION_WORKERS}"
+  )
+  parser.add_argument(
+    "--structured",
+    action="store_true",
+    help="Request schema-constrained AI output and re-ask only for sections that come back invalid"
+  )
+  parser.add_argument(
+    "--no-hedge",
+    action="store_true",
+    help="Only use the primary model; don't race AI_FALLBACK_MODELS against slow or failed requests"
+  )
+  parser.add_argument(
+    "--offline",
+    nargs="?",
+    const="",
+    default=None,
+    metavar="PATH",
+    help="Use the local resume snapshot (or the given JSON file) instead of fetching resume data from the Resume API"
+  )
+  parser.add_argument(
+    "--force-render",
+    action="store_true",
+    help="Always submit a new render, even if an identical PDF was generated within RENDER_INDEX_TTL_SECONDS"
+  )
+  parser.add_argument(
+    "--download",
+    action="store_true",
+    help="Save each finished PDF under ARTIFACT_DIR/<run id>/ (identical PDFs are hard-linked, not stored twice)"
+  )
+  parser.add_argument(
+    "--callback",
+    action="store_true",
+    help=(
+      "Ask the Resume API to call back when a PDF is ready instead of polling (falls back to polling after "
+      "CALLBACK_TIMEOUT_SECONDS). Needs CALLBACK_PUBLIC_URL, e.g. https://tunnel.example.com/callback, "
+      "unless the API is on localhost"
+    )
+  )
+  parser.add_argument(
+    "--serial",
+    action="store_true",
+    help="Run pipeline stages one at a time instead of overlapping independent ones (for debugging)"
+  )
+
+  cache_group = parser.add_mutually_exclusive_group()
+  cache_group.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Disable the on-disk AI response cache (and the --incremental section store) for this run"
+  )
+  cache_group.add_argument(
+    "--refresh-cache",
+    action="store_true",
+    help="Ignore cached AI responses and stored sections and overwrite them with fresh results"
+  )
+
+  parser.add_argument(
+    "--usage-report",
+    type=int,
+    nargs="?",
+    const=0,
+    default=None,
+    metavar="RUNS",
+    help="Print p50/p95 latency and token usage per AI pass from the ledger and exit (optionally only the last RUNS runs)"
   )
 
   parser.add_argument(
@@ -69,120 +212,486 @@ Examples:
 
   return parser.parse_args()
 
+def render_targets(args) -> List[Tuple[str, str]]:
+  return resolve_render_targets(
+    args.template_id or [settings.DEFAULT_TEMPLATE_ID],
+    args.resume_name or [settings.DEFAULT_RESUME_NAME]
+  )
+
 def validate_args(args):
   logger = setup_logger()
 
-  if not validate_template_id(args.template_id):
-    log_message(logger, f"Invalid template ID: {args.template_id}", LogType.ERROR)
-    log_message(logger, "Template ID must be in format: templates/name.cshtml", LogType.ERROR)
+  try:
+    targets = render_targets(args)
+  except ValueError as e:
+    log_message(logger, str(e), LogType.ERROR)
+    sys.exit(1)
+
+  for template_id, resume_name in targets:
+    if not validate_template_id(template_id):
+      log_message(logger, f"Invalid template ID: {template_id}", LogType.ERROR)
+      log_message(logger, "Template ID must be in format: templates/name.cshtml", LogType.ERROR)
+      sys.exit(1)
+
+    if not validate_resume_name(resume_name):
+      log_message(logger, f"Invalid resume name: {resume_name}", LogType.ERROR)
+      log_message(logger, "Resume name cannot contain: / \\ : * ? \" < > |", LogType.ERROR)
+      sys.exit(1)
+
+  if args.jd_batch and len(targets) > 1:
+    log_message(logger, "Multiple --template-id/--resume-name pairs are not supported with --jd-batch", LogType.ERROR)
+    sys.exit(1)
+
+  if args.section_workers < 1:
+    log_message(logger, "--section-workers must be at least 1", LogType.ERROR)
+    sys.exit(1)
+
+  if args.batch_concurrency < 1:
+    log_message(logger, "--batch-concurrency must be at least 1", LogType.ERROR)
+    sys.exit(1)
+
+  if args.jd_batch and args.fused:
+    log_message(logger, "--fused is not supported with --jd-batch (P1 is shared across all JDs)", LogType.ERROR)
+    sys.exit(1)
+
+  if args.offline and not os.path.isfile(args.offline):
+    log_message(logger, f"Offline resume file not found: {args.offline}", LogType.ERROR)
     sys.exit(1)
 
-  if not validate_resume_name(args.resume_name):
-    log_message(logger, f"Invalid resume name: {args.resume_name}", LogType.ERROR)
-    log_message(logger, "Resume name cannot contain: / \\ : * ? \" < > |", LogType.ERROR)
+  if args.jd_batch and args.callback:
+    log_message(logger, "--callback is not supported with --jd-batch", LogType.ERROR)
     sys.exit(1)
 
-  if args.mode == "job-description" and args.jd.lower() == "no":
+  # a hosted API can't reach our local listener; every job would sit out the callback timeout
+  if args.callback and not settings.CALLBACK_PUBLIC_URL and not is_loopback_url(settings.RESUME_API_BASE_URL or ""):
+    log_message(logger, "--callback needs CALLBACK_PUBLIC_URL unless the Resume API runs on this machine", LogType.ERROR)
+    log_message(logger, "Set it to the public address forwarded to CALLBACK_PORT, including the /callback path", LogType.ERROR)
+    sys.exit(1)
+
+  if args.jd_batch and args.serial:
+    log_message(logger, "--serial is not supported with --jd-batch", LogType.ERROR)
+    sys.exit(1)
+
+  if args.mode == "job-description" and args.jd.lower() == "no" and not args.jd_batch:
     log_message(logger, "Job description mode requires --jd to be provided", LogType.ERROR)
     log_message(logger, "Either provide a job description or use --mode generic", LogType.ERROR)
     sys.exit(1)
 
-def run_pipeline(mode: str, jd_input: Optional[str], template_id: str, resume_name: str, debug: bool = False):
+def print_usage_report(last_runs: int):
+  logger = setup_logger()
+
+  entries = load_ledger(settings.AI_LEDGER_PATH, last_runs=last_runs)
+  if not entries:
+    log_message(logger, f"No AI calls recorded in {settings.AI_LEDGER_PATH}", LogType.WARNING)
+    return
+
+  runs = len({entry.get("run") for entry in entries})
+  logger.info(f"AI usage across {runs} runs ({len(entries)} calls) from {settings.AI_LEDGER_PATH}:")
+  for line in format_report(entries):
+    logger.info(line)
+
+def create_ai_cache() -> ResponseCache:
+  return ResponseCache(
+    cache_dir=settings.AI_CACHE_DIR,
+    max_bytes=settings.AI_CACHE_MAX_BYTES,
+    max_age_seconds=settings.AI_CACHE_MAX_AGE_SECONDS
+  )
+
+def create_artifact_store() -> ArtifactStore:
+  return ArtifactStore(
+    root=settings.ARTIFACT_DIR,
+    http=get_http_client(),
+    chunk_size=settings.DOWNLOAD_CHUNK_BYTES,
+    max_attempts=settings.DOWNLOAD_ATTEMPTS
+  )
+
+def artifact_path(run_id: str, resume_name: str) -> str:
+  return os.path.join(safe_filename(run_id), f"{safe_filename(resume_name)}.pdf")
+
+async def download_artifact_async(store: ArtifactStore, result: dict, run_id: str, resume_name: str) -> Optional[dict]:
+  if result.get("status") != "success" or not result.get("pdfUrl"):
+    return None
+  return await asyncio.to_thread(store.download, result["pdfUrl"], artifact_path(run_id, resume_name))
+
+async def run_generic_pass_async(
+  ai_service: AiService,
+  resume_data: dict,
+  parallel_sections: bool = False,
+  section_workers: Optional[int] = None,
+  incremental: bool = False
+) -> dict:
+  # --no-cache leaves the section store alone too; every section is sent as if it had changed
+  if incremental and ai_service.cache is not None:
+    section_store = SectionStore(settings.AI_SECTION_STORE_PATH)
+    return await ai_service.optimise_generic_sections_async(
+      resume_data,
+      max_workers=section_workers,
+      store=section_store
+    )
+  if parallel_sections or incremental:
+    return await ai_service.optimise_generic_sections_async(resume_data, max_workers=section_workers)
+
+  return await ai_service.optimise_generic_async(resume_data)
+
+def cross_check_ats_score(optimised_data: dict, job_description: str) -> Optional[dict]:
+  logger = setup_logger()
+
+  start = time.perf_counter()
+  try:
+    local = score_resume(optimised_data, job_description)
+  except Exception as e:
+    # the local score is advisory; a scoring bug must never cost us the PDF
+    log_message(logger, f"Local ATS scoring failed, skipping cross-check: {e}", LogType.WARNING)
+    return None
+  elapsed_ms = (time.perf_counter() - start) * 1000
+
+  logger.info(
+    f"Local ATS score: {local['score']}/100 ({local['matched']}/{local['terms']} JD terms, "
+    f"coverage {local['coverage']:.0%}, {elapsed_ms:.1f} ms)"
+  )
+  if local["missing"]:
+    logger.info(f"Top missing JD terms: {', '.join(local['missing'])}")
+
+  model_score = optimised_data.get("score")
+  if isinstance(model_score, (int, float)) and abs(model_score - local["score"]) > settings.ATS_SCORE_TOLERANCE:
+    log_message(
+      logger,
+      f"Model ATS score {model_score} differs from local score {local['score']} by more than {settings.ATS_SCORE_TOLERANCE:g}",
+      LogType.WARNING
+    )
+
+  return local
+
+async def run_pipeline_async(
+  mode: str,
+  jd_input: Optional[str],
+  targets: List[Tuple[str, str]],
+  debug: bool = False,
+  use_cache: bool = True,
+  refresh_cache: bool = False,
+  stream: bool = False,
+  parallel_sections: bool = False,
+  section_workers: Optional[int] = None,
+  incremental: bool = False,
+  fused: bool = False,
+  hedge: bool = True,
+  structured: bool = False,
+  serial: bool = False,
+  offline: Optional[str] = None,
+  callback: bool = False,
+  force_render: bool = False,
+  download: bool = False
+) -> int:
+  # returns the exit status instead of exiting, so one failed run can't take down others on the same loop
   import logging
   logger = setup_logger(level=logging.DEBUG if debug else logging.INFO)
 
-  print("\n" + "=" * 70)
-  print(" " * 20 + "RESUME AUTOMATION PIPELINE")
-  print("=" * 70 + "\n")
-
   logger.info(f"Mode: {format_mode_name(mode)}")
-  logger.info(f"Template: {template_id}")
-  logger.info(f"Resume Name: {resume_name}")
+  for template_id, resume_name in targets:
+    logger.info(f"Template: {template_id}")
+    logger.info(f"Resume Name: {resume_name}")
 
   auth_service = None
+  ai_cache = None
+  ai_service = None
+  generator_service = None
+  callback_server = None
+  callback_tokens = {}
+  artifact_store = create_artifact_store() if download else None
+  downloads = {}
   notification_service = NotificationService()
+  warmup_service = WarmupService()
+  scheduler = StageScheduler(serial=serial)
 
-  try:
+  async def validate_config(results: dict):
     log_step(logger, 0, "Validating config")
     settings.validate()
     log_message(logger, "Configs validated", LogType.SUCCESS)
 
-    notification_service.send_pipeline_start_notification(mode=mode)
+  async def notify_start(results: dict):
+    await notification_service.send_pipeline_start_notification_async(mode=mode)
+
+  async def read_job_description(results: dict) -> str:
+    job_description = await asyncio.to_thread(get_job_description, jd_input)
+    if not job_description:
+      log_message(logger, "Failed to get job description", LogType.ERROR)
+      raise ValueError("Job description is required for job-description mode")
 
-    # Step#01: auth
+    logger.info(f"Job description length: {len(job_description)} chars")
+    return job_description
+
+  async def authenticate(results: dict):
+    nonlocal auth_service
     log_step(logger, 1, "Authentication")
+    await warmup_service.wait(warmup_task, "authentication")
     auth_service = AuthService()
-    auth_service.authenticate()
+    await auth_service.authenticate_async()
 
-    # Step#02: fetch resume data
+  async def fetch_resume(results: dict) -> dict:
     log_step(logger, 2, "Fetching resume data")
-    resume_service = ResumeService(auth_service)
-    resume_data = resume_service.fetch_resume_data()
+    if offline is not None:
+      return await ResumeService().load_offline_resume_data_async(offline or None)
+    return await ResumeService(auth_service).fetch_resume_data_async()
 
-    # Step#03: AI P1
-    log_step(logger, 3, "AI P1")
-    ai_service = AiService()
-    optimised_data = ai_service.optimise_generic(resume_data)
+  def start_ai_service():
+    nonlocal ai_cache, ai_service
+    ai_cache = create_ai_cache() if use_cache else None
+    ai_service = AiService(cache=ai_cache, refresh_cache=refresh_cache, stream=stream, hedge=hedge, structured=structured)
 
-    # Step#04 AI P2 (if jd provided)
-    if mode == "job-description":
-      log_step(logger, 4, "AI P2")
-      job_description = get_job_description(jd_input)
+    # AI passes can take long enough for the Resume API to fall asleep again before generation
+    warmup_service.start_keep_warm(settings.RESUME_API_KEEPALIVE_SECONDS)
 
-      if not job_description:
-        log_message(logger, "Failed to get job description", LogType.ERROR)
-        raise ValueError("Job description is required for job-description mode")
+  async def ai_p1(results: dict) -> dict:
+    start_ai_service()
 
-      logger.info(f"Job description length: {len(job_description)} chars")
+    log_step(logger, 3, "AI P1")
+    optimised_data = await run_generic_pass_async(
+      ai_service,
+      results["fetch"],
+      parallel_sections=parallel_sections,
+      section_workers=section_workers,
+      incremental=incremental
+    )
 
-      optimised_data = ai_service.optimise_with_jd(optimised_data, job_description)
-    else:
+    if mode != "job-description":
       logger.info("Skipping AI P2")
+    elif ai_service.last_cache_hit:
+      logger.info("Resume unchanged since last run, skipping straight to AI P2")
+    return optimised_data
+
+  async def ai_p2(results: dict) -> dict:
+    log_step(logger, 4, "AI P2")
+    return await ai_service.optimise_with_jd_async(results["p1"], results["jd"])
+
+  async def ai_fused(results: dict) -> dict:
+    start_ai_service()
 
-    # Step#05: resume generation
-    log_step(logger, 5, "Generating resume PDF")
+    # Step#03: AI P1+P2 in one request
+    log_step(logger, 3, "AI P1+P2 (fused)")
+    try:
+      return await ai_service.optimise_fused_async(results["fetch"], results["jd"])
+    except ValueError as e:
+      log_message(logger, f"Falling back to two-pass optimisation: {e}", LogType.WARNING)
+
+    log_step(logger, 3, "AI P1")
+    optimised_data = await run_generic_pass_async(
+      ai_service,
+      results["fetch"],
+      parallel_sections=parallel_sections,
+      section_workers=section_workers,
+      incremental=incremental
+    )
+    log_step(logger, 4, "AI P2")
+    return await ai_service.optimise_with_jd_async(optimised_data, results["jd"])
+
+  async def ats_check(results: dict) -> Optional[dict]:
+    # NumPy scoring is CPU-bound; keep it off the loop so generation isn't held up
+    return await asyncio.to_thread(cross_check_ats_score, results[final_stage], results["jd"])
+
+  async def start_callback_server(results: dict):
+    nonlocal callback_server
+    callback_server = CallbackServer(
+      host=settings.CALLBACK_HOST,
+      port=settings.CALLBACK_PORT,
+      public_url=settings.CALLBACK_PUBLIC_URL or None
+    )
+    callback_server.start()
+
+  async def generate(results: dict) -> List[dict]:
+    nonlocal generator_service
+    # Step#05: resume generation, every template submitted up front
+    log_step(logger, 5, "Generating resume PDF" if len(targets) == 1 else f"Generating {len(targets)} resume PDFs")
+    await warmup_service.stop_keep_warm("generation")
     generator_service = GeneratorService(auth_service)
-    job_id = generator_service.generate_resume(
-      resume_data=optimised_data,
-      template_id=template_id,
-      resume_name=resume_name
+    # escaped once here and shared by the reuse check and every template's submission
+    resume_data = await asyncio.to_thread(escape_latex_specials, results[final_stage])
+
+    async def submit(template_id: str, resume_name: str) -> dict:
+      if not force_render:
+        reused = await generator_service.find_rendered_async(resume_data, template_id, resume_name, escaped=True)
+        if reused:
+          return { "jobId": None, "result": reused }
+
+      token = callback_server.expect() if callback_server else None
+      job_id = await generator_service.generate_resume_async(
+        resume_data=resume_data,
+        template_id=template_id,
+        resume_name=resume_name,
+        callback_url=callback_server.callback_url(token) if token else None,
+        escaped=True
+      )
+      if token:
+        callback_tokens[job_id] = token
+      return { "jobId": job_id, "result": None }
+
+    return await asyncio.gather(*(submit(template_id, resume_name) for template_id, resume_name in targets))
+
+  def start_download(index: int, result: dict):
+    # each PDF starts downloading as soon as it's ready, while the other templates are still rendering
+    if artifact_store is None:
+      return
+    _, resume_name = targets[index]
+    if mode == "job-description" and os.path.isfile(jd_input or ""):
+      resume_name = batch_resume_name(resume_name, jd_input)
+    downloads[index] = asyncio.create_task(
+      download_artifact_async(artifact_store, result, ai_service.ledger.run_id, resume_name)
     )
 
+  async def poll(results: dict) -> List[dict]:
+    submissions = results["generate"]
+    job_ids = [submission["jobId"] for submission in submissions if submission["jobId"]]
+    templates = { submission["jobId"]: template_id for submission, (template_id, _) in zip(submissions, targets) }
+    indexes = { submission["jobId"]: index for index, submission in enumerate(submissions) }
+    by_job = {}
+
+    for index, submission in enumerate(submissions):
+      if submission["result"]:
+        start_download(index, submission["result"])
+
+    if not job_ids:
+      logger.info("Every PDF was reused, nothing to poll")
+      return [submission["result"] for submission in submissions]
+
     # Step#06: polling
     log_step(logger, 6, "Polling")
-    result = generator_service.poll_job_status(job_id)
+    if callback_server:
+      updates = generator_service.wait_for_jobs_async(
+        job_ids,
+        callback_server,
+        callback_tokens,
+        settings.CALLBACK_TIMEOUT_SECONDS
+      )
+    else:
+      updates = generator_service.poll_jobs_async(job_ids)
+
+    async for job_id, result in updates:
+      by_job[job_id] = result
+      start_download(indexes[job_id], result)
+      if len(job_ids) > 1:
+        logger.info(f"[{len(by_job)}/{len(job_ids)}] {templates[job_id]}: {result.get('status')}")
+
+    return [submission["result"] or by_job[submission["jobId"]] for submission in submissions]
+
+  async def save_artifacts(results: dict) -> List[Optional[dict]]:
+    if downloads:
+      logger.info(f"Waiting for {len(downloads)} PDF download(s)....")
+    outcomes = await asyncio.gather(*(downloads[index] for index in sorted(downloads)), return_exceptions=True)
+
+    saved = []
+    for outcome in outcomes:
+      if isinstance(outcome, Exception):
+        # the PDF itself rendered fine; a failed local copy shouldn't fail the run
+        log_message(logger, f"PDF download failed: {outcome}", LogType.WARNING)
+        outcome = { "path": None, "error": str(outcome) }
+      saved.append(outcome)
+    return saved
+
+  # P1 only needs the fetched resume, not the JD; P2 joins the two branches.
+  # Offline, the fetch needs no auth, so the AI passes overlap authentication too.
+  scheduler.add("validate", validate_config)
+  scheduler.add("notify", notify_start, deps=["validate"])
+  scheduler.add("auth", authenticate, deps=["validate"])
+  scheduler.add("fetch", fetch_resume, deps=["validate"] if offline is not None else ["auth"])
+  if mode != "job-description":
+    scheduler.add("p1", ai_p1, deps=["fetch"])
+    final_stage = "p1"
+  elif fused:
+    scheduler.add("jd", read_job_description)
+    scheduler.add("fused", ai_fused, deps=["fetch", "jd"])
+    final_stage = "fused"
+  else:
+    scheduler.add("jd", read_job_description)
+    scheduler.add("p1", ai_p1, deps=["fetch"])
+    scheduler.add("p2", ai_p2, deps=["p1", "jd"])
+    final_stage = "p2"
+  if mode == "job-description":
+    scheduler.add("ats", ats_check, deps=[final_stage, "jd"])
+  if callback:
+    scheduler.add("callback", start_callback_server)
+    scheduler.add("generate", generate, deps=[final_stage, "auth", "callback"])
+  else:
+    scheduler.add("generate", generate, deps=[final_stage, "auth"])
+  scheduler.add("poll", poll, deps=["generate"])
+  if download:
+    scheduler.add("download", save_artifacts, deps=["poll"])
+
+  try:
+    # the Resume API may be asleep; let it wake up while we validate and notify
+    warmup_task = warmup_service.start("startup")
+
+    results = await scheduler.run()
+    outcomes = list(zip(targets, results["poll"]))
 
     # Step#07: handle result
     log_step(logger, 7, "Processing result")
 
-    if result.get("status") == "success":
-      pdf_url = result.get("pdfUrl", "No URL provided")
+    failed = [(target, result) for target, result in outcomes if result.get("status") != "success"]
+    pdf_urls = [result.get("pdfUrl", "No URL provided") for _, result in outcomes if result.get("status") == "success"]
+    saved_paths = [saved["path"] for saved in results.get("download") or [] if saved and saved["path"]]
+    download_errors = [saved["error"] for saved in results.get("download") or [] if saved and saved.get("error")]
+
+    if failed:
+      if len(outcomes) == 1:
+        error = failed[0][1].get("error", "Unknown error")
+      else:
+        error = "; ".join(f"{template_id}: {result.get('error', 'Unknown error')}" for (template_id, _), result in failed)
 
-      log_message(logger, "Resume generated successfully", LogType.SUCCESS)
+    if pdf_urls:
+      if failed:
+        log_message(logger, f"{len(pdf_urls)}/{len(outcomes)} resumes generated successfully", LogType.WARNING)
+      else:
+        log_message(logger, "Resume generated successfully", LogType.SUCCESS)
       logger.info(f"\n{'=' * 70}")
-      logger.info(f"PDF URL: {pdf_url}")
+      for pdf_url in pdf_urls:
+        logger.info(f"PDF URL: {pdf_url}")
       logger.info(f"{'=' * 70}\n")
 
-      notification_service.send_success_notification(pdf_url=pdf_url, mode=mode)
+    if not failed:
+      await notification_service.send_success_notification_async(pdf_url="\n".join(pdf_urls), mode=mode)
 
       print("\n SUCCESS! your resume is ready!")
-      print(f"Download: {pdf_url}\n")
+      for pdf_url in pdf_urls:
+        print(f"Download: {pdf_url}")
+      for path in saved_paths:
+        print(f"Saved: {path}")
+      for download_error in download_errors:
+        print(f"Not saved locally: {download_error}")
+      print()
+      return 0
+
+    elif pdf_urls:
+      # the finished PDFs are still worth delivering when another template failed
+      log_message(logger, f"Resume generation failed for some templates: {error}", LogType.ERROR)
+
+      await notification_service.send_partial_success_notification_async(
+        pdf_url="\n".join(pdf_urls),
+        error=error,
+        mode=mode
+      )
+
+      print(f"\n PARTIAL SUCCESS! {len(pdf_urls)}/{len(outcomes)} resumes are ready")
+      for pdf_url in pdf_urls:
+        print(f"Download: {pdf_url}")
+      for path in saved_paths:
+        print(f"Saved: {path}")
+      for download_error in download_errors:
+        print(f"Not saved locally: {download_error}")
+      print(f"Error: {error}\n")
+      return 2
 
     else:
-      error = result.get("error", "Unknown error")
       log_message(logger, f"Resume generation failed: {error}", LogType.ERROR)
 
-      notification_service.send_failure_notification(error=error, mode=mode)
+      await notification_service.send_failure_notification_async(error=error, mode=mode)
 
       print("\n FAILED! resume generation unsuccessful!")
       print(f"Error: {error}\n")
-      sys.exit(1)
+      return 1
 
-  except KeyboardInterrupt:
+  except (KeyboardInterrupt, asyncio.CancelledError):
     log_message(logger, "Pipeline interrupted by user", LogType.WARNING)
-    notification_service.send_message("Pipeline interrupted by user")
-    print("\n\nPipeline interrupted by user\n")
-    sys.exit(1)
+    await notification_service.send_message_async("Pipeline interrupted by user")
+    raise
   except Exception as e:
     log_message(logger, f"Pipeline failed: {e}")
 
@@ -191,26 +700,359 @@ def run_pipeline(mode: str, jd_input: Optional[str], template_id: str, resume_na
       traceback.print_exc()
 
     error_msg = str(e)
-    notification_service.send_failure_notification(error=error_msg, mode=mode)
+    await notification_service.send_failure_notification_async(error=error_msg, mode=mode)
 
     print(f"\n pipeline failed: {e}\n")
-    sys.exit(1)
+    return 1
 
   finally:
+    if callback_server:
+      callback_server.stop()
+    for task in downloads.values():
+      task.cancel()
+    scheduler.log_timings()
+    warmup_service.cancel()
+    warmup_service.log_stats()
+    if ai_cache:
+      ai_cache.log_stats()
+    if ai_service:
+      ai_service.log_hedge_stats()
+      ai_service.log_repair_stats()
+      ai_service.ledger.log_summary()
+    if generator_service:
+      generator_service.render_index.log_stats()
+      generator_service.log_poll_stats()
+    if artifact_store:
+      artifact_store.log_stats()
+    get_rate_limiter().log_stats()
+    get_http_client().log_stats()
     if auth_service:
       logger.debug("Cleaning up access token....")
+      auth_service.stop_background_refresh()
+
+def run_async(coro):
+  async def with_worker_threads():
+    # the services block on requests inside asyncio.to_thread, so the default executor
+    # (min(32, cpus + 4) threads) would cap how many calls can be in flight at once
+    asyncio.get_running_loop().set_default_executor(
+      ThreadPoolExecutor(max_workers=settings.ASYNC_WORKER_THREADS, thread_name_prefix="pipeline")
+    )
+    return await coro
+
+  return asyncio.run(with_worker_threads())
+
+def run_pipeline(*args, **kwargs):
+  print("\n" + "=" * 70)
+  print(" " * 20 + "RESUME AUTOMATION PIPELINE")
+  print("=" * 70 + "\n")
+
+  try:
+    status = run_async(run_pipeline_async(*args, **kwargs))
+  except KeyboardInterrupt:
+    print("\n\nPipeline interrupted by user\n")
+    sys.exit(1)
+
+  if status:
+    sys.exit(status)
+
+async def run_batch_job_async(
+  jd_file: str,
+  optimised_data: dict,
+  ai_service: AiService,
+  generator_service: GeneratorService,
+  template_id: str,
+  resume_name: str,
+  force_render: bool = False
+) -> Tuple[dict, Optional[dict]]:
+  logger = setup_logger()
+  timings = {}
+  result = None
+  record = {
+    "jd": jd_file,
+    "resumeName": resume_name,
+    "status": "failed",
+    "score": None,
+    "localScore": None,
+    "pdfUrl": None,
+    "path": None,
+    "error": None,
+    "downloadError": None,
+    "timings": timings
+  }
+  job_start = time.perf_counter()
+
+  try:
+    job_description = read_file(jd_file)
+
+    step_start = time.perf_counter()
+    jd_optimised = await ai_service.optimise_with_jd_async(optimised_data, job_description)
+    timings["p2"] = round(time.perf_counter() - step_start, 3)
+    record["score"] = jd_optimised.get("score")
+    local = await asyncio.to_thread(cross_check_ats_score, jd_optimised, job_description)
+    record["localScore"] = local["score"] if local else None
+    escaped_data = escape_latex_specials(jd_optimised)
+
+    if not force_render:
+      result = await generator_service.find_rendered_async(escaped_data, template_id, resume_name, escaped=True)
+
+    if result is None:
+      step_start = time.perf_counter()
+      job_id = await generator_service.generate_resume_async(
+        resume_data=escaped_data,
+        template_id=template_id,
+        resume_name=resume_name,
+        escaped=True
+      )
+      timings["generate"] = round(time.perf_counter() - step_start, 3)
+
+      step_start = time.perf_counter()
+      result = await generator_service.poll_job_status_async(job_id)
+      timings["poll"] = round(time.perf_counter() - step_start, 3)
+
+    record["status"] = result.get("status")
+    record["pdfUrl"] = result.get("pdfUrl")
+    record["error"] = result.get("error")
+
+  except Exception as e:
+    log_message(logger, f"Batch job for {jd_file} failed: {e}", LogType.ERROR)
+    record["error"] = str(e)
+
+  timings["total"] = round(time.perf_counter() - job_start, 3)
+  return record, result
+
+async def run_batch_pipeline_async(
+  jd_pattern: str,
+  template_id: str,
+  resume_name: str,
+  output_path: str,
+  concurrency: Optional[int] = None,
+  debug: bool = False,
+  use_cache: bool = True,
+  refresh_cache: bool = False,
+  stream: bool = False,
+  parallel_sections: bool = False,
+  section_workers: Optional[int] = None,
+  incremental: bool = False,
+  hedge: bool = True,
+  structured: bool = False,
+  offline: Optional[str] = None,
+  force_render: bool = False,
+  download: bool = False
+) -> int:
+  import logging
+  logger = setup_logger(level=logging.DEBUG if debug else logging.INFO)
+  mode = "job-description"
+
+  if concurrency is None:
+    concurrency = settings.BATCH_CONCURRENCY
+
+  auth_service = None
+  ai_cache = None
+  ai_service = None
+  generator_service = None
+  artifact_store = create_artifact_store() if download else None
+  notification_service = NotificationService()
+  warmup_service = WarmupService()
+
+  try:
+    warmup_task = warmup_service.start("startup")
+
+    jd_files = resolve_jd_files(jd_pattern)
+    logger.info(f"Job descriptions: {len(jd_files)}")
+    logger.info(f"Template: {template_id}")
+    logger.info(f"Concurrency: {concurrency}")
+    logger.info(f"Summary: {output_path}")
+
+    log_step(logger, 0, "Validating config")
+    settings.validate()
+    log_message(logger, "Configs validated", LogType.SUCCESS)
+
+    await notification_service.send_pipeline_start_notification_async(mode=f"{mode} batch ({len(jd_files)} JDs)")
+
+    log_step(logger, 1, "Authentication")
+    await warmup_service.wait(warmup_task, "authentication")
+    auth_service = AuthService()
+    await auth_service.authenticate_async()
+
+    log_step(logger, 2, "Fetching resume data")
+    if offline is not None:
+      resume_data = await ResumeService().load_offline_resume_data_async(offline or None)
+    else:
+      resume_data = await ResumeService(auth_service).fetch_resume_data_async()
+
+    log_step(logger, 3, "AI P1")
+    # keeps the Resume API awake through P1 and every job's P2
+    warmup_service.start_keep_warm(settings.RESUME_API_KEEPALIVE_SECONDS)
+    ai_cache = create_ai_cache() if use_cache else None
+    ai_service = AiService(cache=ai_cache, refresh_cache=refresh_cache, stream=stream, hedge=hedge, structured=structured)
+    optimised_data = await run_generic_pass_async(
+      ai_service,
+      resume_data,
+      parallel_sections=parallel_sections,
+      section_workers=section_workers,
+      incremental=incremental
+    )
+
+    log_step(logger, 4, f"AI P2 + generation for {len(jd_files)} job descriptions")
+    generator_service = GeneratorService(auth_service)
+    succeeded = 0
+    batch_start = time.perf_counter()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_limited(jd_file: str) -> dict:
+      job_resume_name = batch_resume_name(resume_name, jd_file)
+      async with semaphore:
+        record, result = await run_batch_job_async(
+          jd_file,
+          optimised_data,
+          ai_service,
+          generator_service,
+          template_id,
+          job_resume_name,
+          force_render=force_render
+        )
+
+      # downloads happen outside the semaphore so they don't hold a slot another JD could render in
+      if artifact_store and record["status"] == "success":
+        step_start = time.perf_counter()
+        try:
+          saved = await download_artifact_async(artifact_store, result, ai_service.ledger.run_id, job_resume_name)
+          record["path"] = saved["path"] if saved else None
+        except Exception as e:
+          # status stays the generation status; the PDF is still at pdfUrl
+          log_message(logger, f"Download for {jd_file} failed: {e}", LogType.WARNING)
+          record["downloadError"] = str(e)
+        record["timings"]["download"] = round(time.perf_counter() - step_start, 3)
+      return record
+
+    with open(output_path, 'a', encoding='utf-8') as summary:
+      tasks = [asyncio.create_task(run_limited(jd_file)) for jd_file in jd_files]
+
+      for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+        record = await task
+        summary.write(json.dumps(record) + "\n")
+        summary.flush()
+
+        if record["status"] == "success":
+          succeeded += 1
+          log_message(logger, f"[{done}/{len(jd_files)}] {record['jd']}: score {record['score']}, {record['pdfUrl']}", LogType.SUCCESS)
+        else:
+          log_message(logger, f"[{done}/{len(jd_files)}] {record['jd']}: {record['error']}", LogType.ERROR)
+
+    elapsed = time.perf_counter() - batch_start
+    log_step(logger, 5, "Batch summary")
+    logger.info(f"{succeeded}/{len(jd_files)} resumes generated in {elapsed:.1f}s")
+
+    await notification_service.send_message_async(
+      f"Batch resume generation finished\n\n"
+      f"Succeeded: {succeeded}/{len(jd_files)}\n"
+      f"Summary: {output_path}"
+    )
+
+    return 0 if succeeded == len(jd_files) else 1
+
+  except (KeyboardInterrupt, asyncio.CancelledError):
+    log_message(logger, "Batch pipeline interrupted by user", LogType.WARNING)
+    await notification_service.send_message_async("Batch pipeline interrupted by user")
+    raise
+  except Exception as e:
+    log_message(logger, f"Batch pipeline failed: {e}", LogType.ERROR)
+
+    if debug:
+      import traceback
+      traceback.print_exc()
+
+    await notification_service.send_failure_notification_async(error=str(e), mode=mode)
+
+    print(f"\n batch pipeline failed: {e}\n")
+    return 1
+
+  finally:
+    warmup_service.cancel()
+    warmup_service.log_stats()
+    if ai_cache:
+      ai_cache.log_stats()
+    if ai_service:
+      ai_service.log_hedge_stats()
+      ai_service.log_repair_stats()
+      ai_service.ledger.log_summary()
+    if generator_service:
+      generator_service.render_index.log_stats()
+      generator_service.log_poll_stats()
+    if artifact_store:
+      artifact_store.log_stats()
+    get_rate_limiter().log_stats()
+    get_http_client().log_stats()
+    if auth_service:
+      auth_service.stop_background_refresh()
+
+def run_batch_pipeline(*args, **kwargs):
+  print("\n" + "=" * 70)
+  print(" " * 17 + "RESUME AUTOMATION PIPELINE (BATCH)")
+  print("=" * 70 + "\n")
+
+  try:
+    status = run_async(run_batch_pipeline_async(*args, **kwargs))
+  except KeyboardInterrupt:
+    print("\n\nBatch pipeline interrupted by user\n")
+    sys.exit(1)
+
+  if status:
+    sys.exit(status)
 
 def main():
   args = parse_args()
 
+  if args.usage_report is not None:
+    print_usage_report(args.usage_report)
+    return
+
   validate_args(args)
+  targets = render_targets(args)
+
+  if args.jd_batch:
+    template_id, resume_name = targets[0]
+    run_batch_pipeline(
+      jd_pattern=args.jd_batch,
+      template_id=template_id,
+      resume_name=resume_name,
+      output_path=args.batch_output,
+      concurrency=args.batch_concurrency,
+      debug=args.debug,
+      use_cache=not args.no_cache,
+      refresh_cache=args.refresh_cache,
+      stream=args.stream,
+      parallel_sections=args.parallel_sections,
+      section_workers=args.section_workers,
+      incremental=args.incremental,
+      hedge=not args.no_hedge,
+      structured=args.structured,
+      offline=args.offline,
+      force_render=args.force_render,
+      download=args.download
+    )
+    return
 
   run_pipeline(
     mode=args.mode,
     jd_input=args.jd,
-    template_id=args.template_id,
-    resume_name=args.resume_name,
-    debug=args.debug
+    targets=targets,
+    debug=args.debug,
+    use_cache=not args.no_cache,
+    refresh_cache=args.refresh_cache,
+    stream=args.stream,
+    parallel_sections=args.parallel_sections,
+    section_workers=args.section_workers,
+    incremental=args.incremental,
+    fused=args.fused,
+    hedge=not args.no_hedge,
+    structured=args.structured,
+    serial=args.serial,
+    offline=args.offline,
+    callback=args.callback,
+    force_render=args.force_render,
+    download=args.download
   )
 
 if __name__ == "__main__":
@@ -1,30 +1,142 @@
+import asyncio
 import requests
 import json
+import logging
 import re
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Dict, List, Optional, Tuple
 from config.settings import settings
+from utils.cache import ResponseCache, make_cache_keys
+from utils.json_stream import IncrementalJsonParser, JsonStreamError
+from utils.payload import PRESERVED_KEYS, compact_payload, rehydrate_payload, minify_json, estimate_tokens
+from utils.latency import LatencyTracker
+from utils.http_client import get_http_client
+from utils.ledger import Ledger
+from utils.schema import derive_schema, object_schema, salvage_members, validate_schema
+from utils.rate_limiter import RateLimiter, RETRYABLE_STATUS_CODES, backoff_delay, get_rate_limiter, parse_retry_after
 from utils.logger import setup_logger, log_message, LogType
+from utils.section_store import SectionStore, fingerprint_section
 
 logger = setup_logger(__name__)
 
+GENERIC_SYSTEM_PROMPT = (
+  "Task: Rewrite values in the provided resume JSON to improve grammar, "
+  "clarity, technical impact, action verbs, and ATS strength. Keep exact JSON "
+  "structure and keys. Do NOT change metrics, numbers, dates, fabricate achievements, "
+  "modify fields with null dates, or add/remove keys. Output only valid JSON. "
+  "Allowed: add relevant keywords, rewrite bullets, and enhance clarity while keeping "
+  "meaning. If issues: include a top-level _issues array listing them (empty if none)."
+)
+
+JD_SYSTEM_PROMPT = (
+  "Task: Rewrite values in the provided resume JSON so they align strongly with the supplied Job Description (JD), maximize ATS relevance, and follow modern resume-writing standards. Preserve exact JSON structure and keys. Do NOT change metrics, numbers, dates, fabricate achievements, modify null-date fields, or add/remove keys (except _issues and score). Output only valid JSON.\n\n"
+  "Allowed: rewrite bullet points for JD alignment; add JD-relevant keywords, skills, "
+  "and terminology; improve clarity and technical impact while preserving factual meaning.\n\n"
+  "Resume Rules: Use strong action verbs and technical language; keep bullet points concise and impactful; avoid passive tone; prefer result-oriented phrasing; each bullet should start with a verb and show clear value, outcome, or impact; do not produce long paragraphs; keep bullets within typical professional resume length (~12–20 words unless necessary); avoid filler words.\n\n"
+  "ATS Score: after optimization, output a numeric field named \"score\" (0–100) "
+  "representing the resume's relevance to the JD.\n\n"
+  "If issues arise (unclear or missing fields), include a top-level _issues array (empty if none)."
+)
+
+FUSED_SYSTEM_PROMPT = (
+  "Task: In a single pass, (1) clean up the provided resume JSON for grammar, clarity, technical impact, action verbs and ATS strength, "
+  "and (2) rewrite its values so they align strongly with the supplied Job Description (JD). Preserve exact JSON structure and keys. "
+  "Do NOT change metrics, numbers, dates, fabricate achievements, modify null-date fields, or add/remove keys (except _issues and score). "
+  "Output only valid JSON containing the rewritten resume object.\n\n"
+  "Allowed: rewrite bullet points for JD alignment; add JD-relevant keywords, skills, "
+  "and terminology; improve clarity and technical impact while preserving factual meaning.\n\n"
+  "Resume Rules: Use strong action verbs and technical language; keep bullet points concise and impactful; avoid passive tone; prefer result-oriented phrasing; each bullet should start with a verb and show clear value, outcome, or impact; do not produce long paragraphs; keep bullets within typical professional resume length (~12–20 words unless necessary); avoid filler words.\n\n"
+  "ATS Score: after optimization, output a numeric field named \"score\" (0–100) "
+  "representing the resume's relevance to the JD.\n\n"
+  "If issues arise (unclear or missing fields), include a top-level _issues array (empty if none)."
+)
+
+def check_resume_structure(original: Dict, optimised: Dict, require_score: bool = False):
+  if not isinstance(optimised, dict):
+    raise ValueError("AI output is not a JSON object")
+
+  missing = [key for key in original if key != "_issues" and key not in optimised]
+  if missing:
+    raise ValueError(f"AI output is missing keys: {', '.join(missing)}")
+
+  extra = [key for key in optimised if key not in original and key not in ("_issues", "score")]
+  if extra:
+    raise ValueError(f"AI output added unexpected keys: {', '.join(extra)}")
+
+  if require_score:
+    score = optimised.get("score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+      raise ValueError(f"AI output has no valid score (got {score!r})")
+
+REPAIR_PROMPT_SUFFIX = (
+  "\n\nRepair: the resume JSON provided contains only the fields that still need rewriting. "
+  "Return a JSON object with exactly these fields (plus _issues, and score if requested) following the same rules."
+)
+
+RESCORE_PROMPT_SUFFIX = (
+  "\n\nRepair: the full resume JSON is provided so it can be scored against the JD. "
+  "Return a JSON object with score and _issues{fields} following the same rules."
+)
+
+class HedgeCancelled(Exception):
+  pass
+
 class AiService:
-  def __init__(self):
+  def __init__(
+    self,
+    cache: Optional[ResponseCache] = None,
+    refresh_cache: bool = False,
+    stream: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    hedge: bool = True,
+    structured: bool = False,
+    ledger: Optional[Ledger] = None
+  ):
     self.base_url = settings.OPENAI_BASE_URL
     self.model = settings.OPENAI_MODEL
+    self.models = [self.model] + [model for model in settings.AI_FALLBACK_MODELS if model != self.model]
+    self.hedge = hedge and len(self.models) > 1
     self.headers = {
       "Authorization": f"Bearer {settings.GITHUB_PAT}",
       "Content-Type": "application/json"
     }
+    self.cache = cache
+    self.refresh_cache = refresh_cache
+    self.stream = stream
+    self.structured = structured
+    self.rate_limiter = rate_limiter or get_rate_limiter()
+    self.http = get_http_client()
+    self.retry_count = 0
+    self.latency = LatencyTracker(settings.AI_LATENCY_HISTORY_PATH)
+    self.ledger = ledger or Ledger(settings.AI_LEDGER_PATH)
+    self.hedge_stats = { "requests": 0, "hedged": 0, "fallbacks": 0, "wins": {} }
+    self.repair_stats = {
+      "repairs": 0,
+      "repaired_sections": 0,
+      "repair_seconds": 0.0,
+      "full_retries": 0,
+      "full_retry_seconds": 0.0
+    }
+    self._stats_lock = threading.Lock()
+    self._local = threading.local()
+
+  @property
+  def last_cache_hit(self) -> bool:
+    return getattr(self._local, "cache_hit", False)
+
+  @last_cache_hit.setter
+  def last_cache_hit(self, value: bool):
+    self._local.cache_hit = value
 
-  def _escape_percent_hash(self, value):
-    if isinstance(value, list):
-      return [self._escape_percent_hash(v) for v in value]
-    if isinstance(value, dict):
-      return { k: self._escape_percent_hash(v) for k, v in value.items() }
-    if isinstance(value, str):
-      return value.replace('%', '\\\\%').replace('#', '\\\\#')
+  @property
+  def last_skipped(self) -> bool:
+    return getattr(self._local, "skipped", False)
 
-    return value
+  @last_skipped.setter
+  def last_skipped(self, value: bool):
+    self._local.skipped = value
 
   def _clean_json_response(self, content: str) -> str:
     content = re.sub(r'```json\s*', '', content)
@@ -33,148 +145,865 @@ class AiService:
 
     return content
 
-  def optimise_generic(self, resume_data: Dict) -> str:
-    log_message(logger, "Starting AI P1 optimisation....")
+  def _post(self, payload: Dict, stream: bool = False, cancel: Optional[threading.Event] = None) -> requests.Response:
+    max_retries = settings.AI_MAX_RETRIES
+    # completions roughly mirror the resume they rewrite, so budget for twice the prompt
+    estimated_tokens = 2 * sum(estimate_tokens(message["content"]) for message in payload["messages"])
 
-    system_prompt = (
-      "Task: Rewrite values in the provided resume JSON to improve grammar, "
-      "clarity, technical impact, action verbs, and ATS strength. Keep exact JSON "
-      "structure and keys. Do NOT change metrics, numbers, dates, fabricate achievements, "
-      "modify fields with null dates, or add/remove keys. Output only valid JSON. "
-      "Allowed: add relevant keywords, rewrite bullets, and enhance clarity while keeping "
-      "meaning. If issues: include a top-level _issues array listing them (empty if none)."
-    )
+    for attempt in range(1, max_retries + 2):
+      if cancel is not None and cancel.is_set():
+        raise HedgeCancelled(payload["model"])
+
+      waited = self.rate_limiter.acquire(estimated_tokens)
+      if waited:
+        logger.info(f"Waited {waited:.1f}s for client-side AI rate limit")
+
+      try:
+        response = self.http.post(
+          self.base_url,
+          endpoint="ai",
+          json=payload,
+          headers=self.headers,
+          stream=stream
+        )
+      except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        if attempt > max_retries:
+          raise
+        delay = backoff_delay(attempt, settings.AI_RETRY_BASE_SECONDS, settings.AI_RETRY_MAX_SECONDS)
+        log_message(logger, f"AI request failed ({e}), retry {attempt}/{max_retries} in {delay:.1f}s", LogType.WARNING)
+        self.retry_count += 1
+        time.sleep(delay)
+        continue
+
+      self.rate_limiter.update_from_headers(response.headers)
+
+      if response.status_code in RETRYABLE_STATUS_CODES and attempt <= max_retries:
+        delay = backoff_delay(attempt, settings.AI_RETRY_BASE_SECONDS, settings.AI_RETRY_MAX_SECONDS)
+        retry_after = parse_retry_after(response.headers)
+        if retry_after is not None:
+          delay = max(delay, min(retry_after, settings.AI_RETRY_MAX_SECONDS))
+        if response.status_code == 429:
+          # every worker sharing the limiter should back off, not just this one
+          self.rate_limiter.pause(delay)
+
+        log_message(
+          logger,
+          f"AI request returned {response.status_code}, retry {attempt}/{max_retries} in {delay:.1f}s",
+          LogType.WARNING
+        )
+        response.close()
+        self.retry_count += 1
+        time.sleep(delay)
+        continue
+
+      response.raise_for_status()
+      return response
+
+  def _post_completion(self, payload: Dict, cancel: Optional[threading.Event] = None) -> Tuple[str, Dict]:
+    response = self._post(payload, cancel=cancel)
+
+    result = response.json()
+    # elapsed runs until the response headers were parsed, i.e. time to first byte
+    metrics = { "usage": result.get("usage"), "ttfb": response.elapsed.total_seconds() }
+    return result["choices"][0]["message"]["content"], metrics
+
+  def _stream_completion(self, payload: Dict, cancel: Optional[threading.Event] = None) -> Tuple[str, Dict]:
+    start = time.perf_counter()
+    # the usage chunk only comes after the last content delta, so waiting for it is opt-in;
+    # otherwise the ledger estimates tokens from the text
+    drain_for_usage = settings.AI_STREAM_USAGE
+    stream_payload = { **payload, "stream": True }
+    if drain_for_usage:
+      stream_payload["stream_options"] = { "include_usage": True }
+    response = self._post(stream_payload, stream=True, cancel=cancel)
+    response.encoding = response.encoding or "utf-8"
+
+    parser = IncrementalJsonParser()
+    metrics = { "usage": None, "ttfb": None }
+
+    try:
+      # chunk_size=None yields data as it arrives instead of waiting for 512-byte blocks
+      for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if cancel is not None and cancel.is_set():
+          raise HedgeCancelled(payload["model"])
+        if not line or not line.startswith("data:"):
+          continue
+
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+          break
+
+        chunk = json.loads(data)
+        if chunk.get("usage"):
+          metrics["usage"] = chunk["usage"]
+
+        choices = chunk.get("choices") or []
+        if not choices:
+          continue
+
+        delta = (choices[0].get("delta") or {}).get("content")
+        if delta and metrics["ttfb"] is None:
+          metrics["ttfb"] = time.perf_counter() - start
+        if delta and not parser.complete and parser.feed(delta):
+          if drain_for_usage:
+            logger.debug(f"JSON document closed after {parser.position} chars, waiting for usage")
+            continue
+          # no need to wait for the rest of the stream (trailing whitespace, [DONE])
+          logger.debug(f"JSON document closed after {parser.position} chars, closing stream early")
+          break
+      return parser.close(), metrics
+    except JsonStreamError as e:
+      # keep what did arrive so structured mode can salvage it
+      e.partial = parser.text
+      raise
+    finally:
+      response.close()
+
+  def _request_content(
+    self,
+    model: str,
+    system_prompt: str,
+    user_content: str,
+    cancel: Optional[threading.Event] = None,
+    schema: Optional[Dict] = None,
+    pass_name: str = "AI",
+    kind: str = "request"
+  ) -> str:
     payload = {
-      "model": self.model,
+      "model": model,
       "temperature": 0,
       "messages": [
         { "role": "system", "content": system_prompt },
-        { "role": "user", "content": json.dumps(resume_data) }
+        { "role": "user", "content": user_content }
       ]
     }
+    if schema is not None:
+      payload["response_format"] = {
+        "type": "json_schema",
+        "json_schema": { "name": "resume", "strict": True, "schema": schema }
+      }
+
+    logger.debug(f"Sending request to {self.base_url}")
+    logger.debug(f"Model: {model}")
+
+    start = time.perf_counter()
+    content = None
+    metrics = { "usage": None, "ttfb": None }
+    status = "error"
 
     try:
-      logger.debug(f"Sending request to {self.base_url}")
-      logger.debug(f"Model: {self.model}")
-
-      response = requests.post(
-        self.base_url,
-        json=payload,
-        headers=self.headers,
-        timeout=120
+      if self.stream:
+        content, metrics = self._stream_completion(payload, cancel)
+      else:
+        content, metrics = self._post_completion(payload, cancel)
+      status = "ok"
+    except HedgeCancelled:
+      status = "cancelled"
+      raise
+    finally:
+      self._record_call(
+        pass_name, model, kind, status, time.perf_counter() - start, metrics,
+        prompt_text=system_prompt + user_content, completion_text=content
       )
-      response.raise_for_status()
 
-      result = response.json()
-      content = result["choices"][0]["message"]["content"]
-      clean_content = self._clean_json_response(content)
+    return self._clean_json_response(content)
 
-      try:
-        json.loads(clean_content)
-      except json.JSONDecodeError as e:
-        log_message(logger, f"AI return invalid JSON: {e}", LogType.ERROR)
-        logger.error(f"Content (first 500 chars): {clean_content[:500]}")
+  def _record_call(
+    self,
+    pass_name: str,
+    model: str,
+    kind: str,
+    status: str,
+    wall_seconds: float,
+    metrics: Dict,
+    prompt_text: str = "",
+    completion_text: Optional[str] = None
+  ):
+    usage = metrics.get("usage") or {}
+    prompt_tokens = usage.get("prompt_tokens")
+    completion_tokens = usage.get("completion_tokens")
+    estimated = not usage and status == "ok"
+    if estimated:
+      # providers that omit usage still get comparable numbers
+      prompt_tokens = estimate_tokens(prompt_text)
+      completion_tokens = estimate_tokens(completion_text or "")
+
+    cost = None
+    if prompt_tokens is not None:
+      cost = (
+        prompt_tokens * settings.AI_PROMPT_COST_PER_MTOK
+        + (completion_tokens or 0) * settings.AI_COMPLETION_COST_PER_MTOK
+      ) / 1_000_000
+
+    self.ledger.record({
+      "pass": pass_name,
+      "model": model,
+      "kind": kind,
+      "status": status,
+      "cache_hit": False,
+      "stream": self.stream,
+      "prompt_tokens": prompt_tokens,
+      "completion_tokens": completion_tokens,
+      "usage_estimated": estimated,
+      "wall_seconds": round(wall_seconds, 3),
+      "ttfb_seconds": round(metrics["ttfb"], 3) if metrics.get("ttfb") is not None else None,
+      "cost": cost
+    })
+
+  def _attempt(
+    self,
+    model: str,
+    system_prompt: str,
+    user_content: str,
+    validator: Optional[Callable[[Dict], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    schema: Optional[Dict] = None,
+    repair: Optional[Callable] = None,
+    pass_name: str = "AI"
+  ) -> Tuple[str, Dict]:
+    start = time.perf_counter()
+    stream_error = None
+    try:
+      clean_content = self._request_content(model, system_prompt, user_content, cancel, schema, pass_name)
+    except JsonStreamError as e:
+      if repair is None:
         raise
+      # a truncated or malformed stream gets the same salvage and repair as a bad non-streamed reply
+      clean_content = self._clean_json_response(e.partial)
+      stream_error = e
+    # only the first request feeds the hedging percentiles; repairs are tracked on their own
+    self.latency.record(model, time.perf_counter() - start)
 
-      optimised_data = self._escape_percent_hash(clean_content)
+    try:
+      if stream_error is not None:
+        raise stream_error
+      parsed = json.loads(clean_content)
+      if validator is not None:
+        validator(parsed)
 
-      log_message(logger, "AI P1 optimisation completed.", LogType.SUCCESS)
-      logger.debug(f"Optimised data length: {len(optimised_data)} characters")
+    except ValueError as e:
+      if repair is None:
+        if isinstance(e, json.JSONDecodeError):
+          log_message(logger, f"AI ({model}) returned invalid JSON: {e}", LogType.ERROR)
+          logger.error(f"Content (first 500 chars): {clean_content[:500]}")
+        raise
 
-      return optimised_data
+      repair_start = time.perf_counter()
+      parsed = repair(model, clean_content, e, cancel)
+      clean_content = minify_json(parsed)
+      self.latency.record(f"{model}:repair", time.perf_counter() - repair_start)
+
+    return clean_content, parsed
+
+  def _hedge_threshold(self, model: str) -> float:
+    if settings.AI_HEDGE_AFTER_SECONDS > 0:
+      return settings.AI_HEDGE_AFTER_SECONDS
+
+    observed = self.latency.percentile(model, 90, min_samples=settings.AI_HEDGE_MIN_SAMPLES)
+    return observed if observed is not None else settings.AI_HEDGE_DEFAULT_SECONDS
+
+  def _hedged_attempt(
+    self,
+    system_prompt: str,
+    user_content: str,
+    pass_name: str,
+    validator: Optional[Callable[[Dict], None]] = None,
+    schema: Optional[Dict] = None,
+    repair: Optional[Callable] = None
+  ) -> Tuple[str, Dict, str]:
+    threshold = self._hedge_threshold(self.models[0])
+    cancels = {}
+    futures = {}
+    errors = []
+    # no context manager: leaving it would block on the losing request
+    executor = ThreadPoolExecutor(max_workers=len(self.models))
+
+    def launch():
+      model = self.models[len(futures)]
+      cancels[model] = threading.Event()
+      future = executor.submit(
+        self._attempt, model, system_prompt, user_content, validator, cancels[model], schema, repair, pass_name
+      )
+      futures[future] = model
+      pending.add(future)
+
+    pending = set()
+
+    with self._stats_lock:
+      self.hedge_stats["requests"] += 1
+
+    launch()
+
+    try:
+      while pending:
+        can_launch = len(futures) < len(self.models)
+        done, pending = wait(pending, timeout=threshold if can_launch else None, return_when=FIRST_COMPLETED)
+
+        if not done:
+          log_message(
+            logger,
+            f"{pass_name}: no answer after {threshold:.1f}s, hedging with {self.models[len(futures)]}",
+            LogType.WARNING
+          )
+          with self._stats_lock:
+            self.hedge_stats["hedged"] += 1
+          launch()
+          continue
+
+        for future in done:
+          model = futures[future]
+          try:
+            clean_content, parsed = future.result()
+          except Exception as e:
+            errors.append(e)
+            log_message(logger, f"{pass_name}: {model} failed: {e}", LogType.WARNING)
+            if len(futures) < len(self.models):
+              with self._stats_lock:
+                self.hedge_stats["fallbacks"] += 1
+              launch()
+            continue
+
+          for other, cancel in cancels.items():
+            if other != model:
+              cancel.set()
+
+          with self._stats_lock:
+            self.hedge_stats["wins"][model] = self.hedge_stats["wins"].get(model, 0) + 1
+          if len(futures) > 1:
+            logger.info(f"{pass_name}: {model} won the hedged request")
+
+          return clean_content, parsed, model
+
+      raise errors[-1]
+
+    finally:
+      executor.shutdown(wait=False, cancel_futures=True)
+
+  def _complete(
+    self,
+    system_prompt: str,
+    user_content: str,
+    pass_name: str,
+    validator: Optional[Callable[[Dict], None]] = None,
+    schema: Optional[Dict] = None,
+    repair: Optional[Callable] = None,
+    user_payload: Optional[Dict] = None
+  ) -> Dict:
+    self.last_cache_hit = False
+    cache_keys = {}
+
+    if self.cache is not None:
+      # keyed from the object when we have it, rather than parsing user_content back
+      cache_keys = make_cache_keys(
+        self.models, system_prompt, user_payload if user_payload is not None else user_content
+      )
+
+      if self.refresh_cache:
+        logger.debug(f"Refreshing cache entry for {pass_name}: {cache_keys[self.model][:12]}")
+      else:
+        for model, cache_key in cache_keys.items():
+          start = time.perf_counter()
+          cached = self.cache.get(cache_key)
+          if cached is not None:
+            self.last_cache_hit = True
+            self.ledger.record({
+              "pass": pass_name,
+              "model": model,
+              "kind": "request",
+              "status": "ok",
+              "cache_hit": True,
+              "wall_seconds": round(time.perf_counter() - start, 3)
+            })
+            log_message(logger, f"{pass_name} served from cache ({model}, {cache_key[:12]})", LogType.SUCCESS)
+            return json.loads(cached)
+
+    try:
+      if self.hedge:
+        clean_content, parsed, model = self._hedged_attempt(system_prompt, user_content, pass_name, validator, schema, repair)
+      else:
+        model = self.model
+        clean_content, parsed = self._attempt(
+          model, system_prompt, user_content, validator, schema=schema, repair=repair, pass_name=pass_name
+        )
 
     except requests.exceptions.HTTPError as e:
-      log_message(logger, f"HTTP error during AI P1 optimisation: {e}", LogType.ERROR)
+      log_message(logger, f"HTTP error during {pass_name} optimisation: {e}", LogType.ERROR)
       if e.response is not None:
         logger.error(f"Response: {e.response.text}")
       raise
     except requests.exceptions.RequestException as e:
-      log_message(logger, f"Network error during AI P1 optimisation: {e}", LogType.ERROR)
+      log_message(logger, f"Network error during {pass_name} optimisation: {e}", LogType.ERROR)
       raise
     except KeyError as e:
       log_message(logger, f"Unexpected API response format: missing key {e}", LogType.ERROR)
       raise
-    except Exception as e:
-      log_message(logger, f"Unexpected error during AI P1 optimisation: {e}", LogType.ERROR)
+    except JsonStreamError as e:
+      log_message(logger, f"AI stream became invalid JSON, aborting early: {e}", LogType.ERROR)
       raise
 
-  def optimise_with_jd(self, resume_data: str, job_description: str) -> str:
-    log_message(logger, "Starting AI P2 optimisation....")
-    logger.info(f"Job description length: {len(job_description)} characters.")
+    if cache_keys:
+      self.cache.set(cache_keys[model], clean_content, metadata={"model": model, "pass": pass_name})
+
+    return parsed
 
-    system_prompt = (
-      "Task: Rewrite values in the provided resume JSON so they align strongly with the supplied Job Description (JD), maximize ATS relevance, and follow modern resume-writing standards. Preserve exact JSON structure and keys. Do NOT change metrics, numbers, dates, fabricate achievements, modify null-date fields, or add/remove keys (except _issues and score). Output only valid JSON.\n\n"
-      "Allowed: rewrite bullet points for JD alignment; add JD-relevant keywords, skills, "
-      "and terminology; improve clarity and technical impact while preserving factual meaning.\n\n"
-      "Resume Rules: Use strong action verbs and technical language; keep bullet points concise and impactful; avoid passive tone; prefer result-oriented phrasing; each bullet should start with a verb and show clear value, outcome, or impact; do not produce long paragraphs; keep bullets within typical professional resume length (~12–20 words unless necessary); avoid filler words.\n\n"
-      "ATS Score: after optimization, output a numeric field named \"score\" (0–100) "
-      "representing the resume's relevance to the JD.\n\n"
-      "If issues arise (unclear or missing fields), include a top-level _issues array (empty if none)."
+  def log_hedge_stats(self):
+    if not self.hedge:
+      return
+
+    stats = self.hedge_stats
+    rate = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+    wins = ", ".join(f"{model}: {count}" for model, count in stats["wins"].items()) or "none"
+    logger.info(
+      f"AI hedging: {stats['requests']} requests, {stats['hedged']} hedged ({rate:.0%}), "
+      f"{stats['fallbacks']} fallbacks, wins by model: {wins}"
     )
 
+  def _unwrap_resume(self, parsed: Dict, resume: Dict) -> Dict:
+    # with {"jd", "resume"} input the model occasionally answers in the same envelope
+    nested = parsed.get("resume") if isinstance(parsed, dict) else None
+    if isinstance(nested, dict) and "resume" not in resume:
+      unwrapped = dict(nested)
+      for key in ("score", "_issues"):
+        if key in parsed and key not in unwrapped:
+          unwrapped[key] = parsed[key]
+      return unwrapped
+
+    return parsed
+
+  def _resume_schema(self, compact: Dict, with_score: bool) -> Dict:
+    properties = dict(derive_schema(compact)["properties"])
+    properties["_issues"] = { "type": "array", "items": { "type": "string" } }
+    if with_score:
+      properties["score"] = { "type": "number", "minimum": 0, "maximum": 100 }
+    return object_schema(properties)
+
+  def _check_schema(self, parsed: Dict, schema: Dict):
+    errors = validate_schema(parsed, schema)
+    if errors:
+      raise ValueError(f"AI output does not match the resume schema: {'; '.join(errors[:5])}")
+
+  def _parse_partial(self, content: str, compact: Dict) -> Dict:
     try:
-      resume_dict = json.loads(resume_data)
+      parsed = json.loads(content)
     except json.JSONDecodeError:
-      resume_dict = resume_data
+      parsed = salvage_members(content)
+    parsed = self._unwrap_resume(parsed, compact)
+    return parsed if isinstance(parsed, dict) else {}
 
-    user_content = {
-      "jd": job_description,
-      "resume": resume_data
-    }
-    payload = {
-      "model": self.model,
-      "temperature": 0,
-      "messages": [
-        { "role": "system", "content": system_prompt },
-        { "role": "user", "content": json.dumps(user_content) }
+  def _repair_resume(
+    self,
+    model: str,
+    system_prompt: str,
+    compact: Dict,
+    job_description: Optional[str],
+    schema: Dict,
+    content: str,
+    error: Exception,
+    cancel: Optional[threading.Event],
+    pass_name: str
+  ) -> Dict:
+    properties = schema["properties"]
+    parsed = self._parse_partial(content, compact)
+
+    for attempt in range(1, settings.AI_REPAIR_ATTEMPTS + 2):
+      parsed = { key: value for key, value in parsed.items() if key in properties }
+      if validate_schema(parsed.get("_issues"), properties["_issues"]):
+        # not worth a request of its own
+        parsed["_issues"] = []
+
+      broken = [
+        key for key in properties
+        if key not in parsed or validate_schema(parsed[key], properties[key], f"$.{key}")
       ]
-    }
+      if not broken:
+        return parsed
+      if attempt > settings.AI_REPAIR_ATTEMPTS:
+        break
 
-    try:
-      logger.debug(f"Sending request to {self.base_url}")
-      logger.debug(f"Model: {self.model}")
-
-      response = requests.post(
-        self.base_url,
-        json=payload,
-        headers=self.headers,
-        timeout=120
+      full_retry = len(broken) >= len(properties) - 1
+      log_message(
+        logger,
+        f"{pass_name}: output invalid ({error}); re-asking {model} for "
+        f"{'the whole document' if full_retry else ', '.join(broken)}",
+        LogType.WARNING
       )
-      response.raise_for_status()
 
-      result = response.json()
-      content = result["choices"][0]["message"]["content"]
-      cleaned_content = self._clean_json_response(content)
+      # a score only means something for the whole resume, so re-scoring sends all of it
+      rescore = "score" in broken
+      fragment = compact if rescore else { key: compact[key] for key in broken if key in compact }
+      if job_description is None:
+        user_content = minify_json(fragment)
+      else:
+        user_content = minify_json({ "jd": job_description, "resume": fragment })
+
+      if rescore:
+        fields = [key for key in broken if key != "score"]
+        suffix = RESCORE_PROMPT_SUFFIX.format(fields=f", plus only these rewritten fields: {', '.join(fields)}," if fields else "")
+      else:
+        suffix = REPAIR_PROMPT_SUFFIX
+
+      fragment_schema = object_schema({ key: properties[key] for key in broken + ["_issues"] if key in properties })
+
+      start = time.perf_counter()
+      try:
+        try:
+          content = self._request_content(
+            model, system_prompt + suffix, user_content, cancel, fragment_schema, pass_name,
+            kind="full-retry" if full_retry else "repair"
+          )
+        except JsonStreamError as e:
+          content = self._clean_json_response(e.partial)
+        repaired = self._parse_partial(content, fragment)
+      finally:
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+          if full_retry:
+            self.repair_stats["full_retries"] += 1
+            self.repair_stats["full_retry_seconds"] += elapsed
+          else:
+            self.repair_stats["repairs"] += 1
+            self.repair_stats["repaired_sections"] += len(broken)
+            self.repair_stats["repair_seconds"] += elapsed
+
+      for key in broken:
+        if key in repaired:
+          parsed[key] = repaired[key]
+      if repaired.get("_issues") and isinstance(parsed.get("_issues"), list):
+        parsed["_issues"] = parsed["_issues"] + repaired["_issues"]
+      error = ValueError("repaired fields still need checking")
+
+    raise ValueError(
+      f"{pass_name}: output still invalid after {settings.AI_REPAIR_ATTEMPTS} repair attempts "
+      f"(fields: {', '.join(broken)})"
+    )
+
+  def log_repair_stats(self):
+    if not self.structured:
+      return
+
+    stats = self.repair_stats
+    repair_avg = stats["repair_seconds"] / stats["repairs"] if stats["repairs"] else 0.0
+    retry_avg = stats["full_retry_seconds"] / stats["full_retries"] if stats["full_retries"] else 0.0
+    full_p50 = self.latency.percentile(self.model, 50)
+    logger.info(
+      f"AI repairs: {stats['repairs']} targeted ({stats['repaired_sections']} fields, {repair_avg:.1f}s avg), "
+      f"{stats['full_retries']} full retries ({retry_avg:.1f}s avg); "
+      f"full request p50: {f'{full_p50:.1f}s' if full_p50 is not None else 'n/a'}"
+    )
+
+  def _complete_resume(
+    self,
+    system_prompt: str,
+    resume: Dict,
+    pass_name: str,
+    job_description: Optional[str] = None,
+    require_score: bool = False
+  ) -> Dict:
+    compact, removed = compact_payload(resume)
+    self.last_skipped = False
+
+    # a JD pass always has to come back with a score, so only P1 can be skipped
+    if job_description is None and not require_score and not any(key not in PRESERVED_KEYS for key in compact):
+      logger.debug(f"{pass_name}: nothing rewritable to send, skipping request")
+      self.last_cache_hit = False
+      self.last_skipped = True
+      return { **resume, "_issues": [] }
+
+    user_payload = compact if job_description is None else { "jd": job_description, "resume": compact }
+    user_content = minify_json(user_payload)
+
+    sent_tokens = estimate_tokens(user_content)
+    logger.info(f"{pass_name} payload: ~{sent_tokens} tokens ({len(removed)} fields masked)")
+    if logger.isEnabledFor(logging.DEBUG):
+      # serialising the old request shape just to compare sizes is only worth it when someone is looking
+      if job_description is None:
+        legacy_tokens = estimate_tokens(json.dumps(resume))
+      else:
+        legacy_tokens = estimate_tokens(json.dumps({ "jd": job_description, "resume": json.dumps(resume) }))
+      saved = legacy_tokens - sent_tokens
+      logger.debug(
+        f"{pass_name} payload was ~{legacy_tokens} tokens before compaction "
+        f"(saved ~{saved}, {saved / legacy_tokens if legacy_tokens else 0:.0%})"
+      )
+
+    validator = None
+    schema = None
+    repair = None
+    if self.structured:
+      schema = self._resume_schema(compact, with_score=job_description is not None)
+      validator = lambda parsed: self._check_schema(self._unwrap_resume(parsed, compact), schema)
+      repair = lambda model, content, error, cancel: self._repair_resume(
+        model, system_prompt, compact, job_description, schema, content, error, cancel, pass_name
+      )
+    elif require_score:
+      validator = lambda parsed: check_resume_structure(compact, self._unwrap_resume(parsed, compact), require_score=True)
+
+    parsed = self._unwrap_resume(
+      self._complete(
+        system_prompt, user_content, pass_name,
+        validator=validator, schema=schema, repair=repair, user_payload=user_payload
+      ),
+      compact
+    )
+    if not isinstance(parsed, dict):
+      raise ValueError("AI output is not a JSON object")
 
+    return rehydrate_payload(parsed, removed, resume)
+
+  def optimise_generic(self, resume_data: Dict) -> Dict:
+    log_message(logger, "Starting AI P1 optimisation....")
+
+    try:
+      optimised_data = self._complete_resume(GENERIC_SYSTEM_PROMPT, resume_data, "AI P1")
+
+      log_message(logger, "AI P1 optimisation completed.", LogType.SUCCESS)
+      logger.debug(f"Optimised data keys: {list(optimised_data.keys())}")
+
+      return optimised_data
+
+    except (requests.exceptions.RequestException, KeyError, ValueError):
+      raise
+    except Exception as e:
+      log_message(logger, f"Unexpected error during AI P1 optimisation: {e}", LogType.ERROR)
+      raise
+
+  def _split_sections(self, resume_data: Dict) -> List[Dict]:
+    sections = []
+    scalars = {}
+
+    for key, value in resume_data.items():
+      if key == "_issues":
+        continue
+      if isinstance(value, (dict, list)):
+        sections.append({ key: value })
+      else:
+        scalars[key] = value
+
+    # scalar fields are too small to be worth a request each, so send them together
+    if scalars:
+      sections.append(scalars)
+
+    return sections
+
+  def _optimise_section(self, section: Dict, retries: int) -> Tuple[Dict, List, bool]:
+    label = ", ".join(section.keys())
+
+    for attempt in range(1, retries + 2):
       try:
-        parsed = json.loads(cleaned_content)
-        if "score" in parsed:
-          logger.info(f"ATS Score: {parsed['score']}/100")
+        parsed = self._complete_resume(GENERIC_SYSTEM_PROMPT, section, f"AI P1 [{label}]")
+
+        missing = [key for key in section if key not in parsed]
+        if missing:
+          raise ValueError(f"AI response is missing section keys: {', '.join(missing)}")
+
+        issues = parsed.get("_issues") or []
+        return { key: parsed[key] for key in section }, issues, self.last_cache_hit
+
+      except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+        if attempt > retries:
+          log_message(logger, f"Section [{label}] failed after {attempt} attempts: {e}", LogType.ERROR)
+          raise
+        log_message(logger, f"Section [{label}] attempt {attempt} failed, retrying: {e}", LogType.WARNING)
+
+  def _section_label(self, section: Dict) -> str:
+    return ", ".join(section.keys())
+
+  def _run_sections(self, sections: List[Dict], max_workers: int, outcomes: Dict[str, Tuple[Dict, List]]) -> int:
+    cache_hits = 0
+    error = None
+
+    if not sections:
+      return cache_hits
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+      futures = {
+        executor.submit(self._optimise_section, section, settings.AI_SECTION_RETRIES): section
+        for section in sections
+      }
+
+      for future in as_completed(futures):
+        try:
+          section_result, issues, cache_hit = future.result()
+        except Exception as e:
+          # let the other sections finish so their results aren't thrown away
+          error = error or e
+          continue
+        cache_hits += int(cache_hit)
+
+        label = self._section_label(futures[future])
+        outcomes[label] = (section_result, issues)
+        logger.debug(f"Section [{label}] optimised")
+
+    if error is not None:
+      raise error
+    return cache_hits
+
+  def optimise_sections(
+    self,
+    resume_data: Dict,
+    max_workers: Optional[int] = None,
+    store: Optional[SectionStore] = None
+  ) -> Tuple[Dict, List]:
+    if max_workers is None:
+      max_workers = settings.AI_SECTION_WORKERS
+
+    sections = self._split_sections(resume_data)
+    pending = sections
+    outcomes = {}
+    fingerprints = {}
+
+    if store is not None:
+      pending = []
+      for section in sections:
+        label = self._section_label(section)
+        fingerprints[label] = fingerprint_section(self.model, GENERIC_SYSTEM_PROMPT, section)
+
+        # a refresh re-optimises every section and overwrites what was stored
+        entry = None if self.refresh_cache else store.get(label, fingerprints[label])
+        if entry is not None:
+          outcomes[label] = (entry["output"], entry["issues"])
         else:
-          log_message(logger, "No ATS score generated", LogType.WARNING)
+          pending.append(section)
 
-      except json.JSONDecodeError as e:
-        log_message(logger, f"AI returned invalid JSON: {e}", LogType.ERROR)
-        logger.error(f"Content (first 500 chars): {cleaned_content[:500]}")
-        raise
+      reused = [label for label in outcomes]
+      changed = [self._section_label(section) for section in pending]
+      logger.info(f"Sections reused: {len(reused)} ({', '.join(reused) or 'none'})")
+      logger.info(f"Sections re-optimised: {len(changed)} ({', '.join(changed) or 'none'})")
 
-      optimised_data = self._escape_percent_hash(cleaned_content)
+    if pending:
+      log_message(logger, f"Optimising {len(pending)} sections with up to {max_workers} workers....")
+    fresh = {}
+    completed = False
+    try:
+      cache_hits = self._run_sections(pending, max_workers, fresh)
+      completed = True
+    finally:
+      if store is not None:
+        # sections that succeeded are saved even when another one failed, so a rerun only repeats the failure
+        for label, (section_result, issues) in fresh.items():
+          store.put(label, fingerprints[label], section_result, issues)
+        if completed:
+          store.prune(fingerprints.keys())
+        store.save()
+    outcomes.update(fresh)
 
-      log_message(logger, "AI P2 optimisations completed", LogType.SUCCESS)
-      logger.debug(f"Optimised data length: {len(optimised_data)} characters")
+    self.last_cache_hit = cache_hits == len(pending)
+
+    results = {}
+    issues = []
+    for section in sections:
+      label = self._section_label(section)
+      section_result, section_issues = outcomes[label]
+      results.update(section_result)
+      issues.extend(
+        f"{label}: {issue}" if isinstance(issue, str) else issue
+        for issue in section_issues
+      )
+
+    merged = { key: results[key] for key in resume_data if key in results }
+    return merged, issues
+
+  def optimise_generic_sections(
+    self,
+    resume_data: Dict,
+    max_workers: Optional[int] = None,
+    store: Optional[SectionStore] = None
+  ) -> Dict:
+    if store is not None:
+      log_message(logger, "Starting incremental AI P1 optimisation....")
+    else:
+      log_message(logger, "Starting section-parallel AI P1 optimisation....")
+
+    try:
+      optimised_data, issues = self.optimise_sections(resume_data, max_workers, store)
+      optimised_data["_issues"] = issues
+
+      log_message(logger, "AI P1 optimisation completed.", LogType.SUCCESS)
+      logger.debug(f"Optimised data keys: {list(optimised_data.keys())}")
 
       return optimised_data
-    except requests.exceptions.HTTPError as e:
-      log_message(logger, f"HTTP error during AI P2 optimization: {e}", LogType.ERROR)
-      if e.response is not None:
-        logger.error(f"Response: {e.response.text}")
+
+    except (requests.exceptions.RequestException, KeyError, ValueError):
       raise
-    except requests.exceptions.RequestException as e:
-      log_message(logger, f"Network error during AI P2 optimization: {e}", LogType.ERROR)
+    except Exception as e:
+      log_message(logger, f"Unexpected error during AI P1 optimisation: {e}", LogType.ERROR)
       raise
-    except KeyError as e:
-      log_message(logger, f"Unexpected API response format: missing key {e}", LogType.ERROR)
+
+  def optimise_with_jd(self, resume_data: Dict, job_description: str) -> Dict:
+    log_message(logger, "Starting AI P2 optimisation....")
+    logger.info(f"Job description length: {len(job_description)} characters.")
+
+    try:
+      optimised_data = self._complete_resume(JD_SYSTEM_PROMPT, resume_data, "AI P2", job_description=job_description)
+      if "score" in optimised_data:
+        logger.info(f"ATS Score: {optimised_data['score']}/100")
+      else:
+        log_message(logger, "No ATS score generated", LogType.WARNING)
+
+      log_message(logger, "AI P2 optimisations completed", LogType.SUCCESS)
+      logger.debug(f"Optimised data keys: {list(optimised_data.keys())}")
+
+      return optimised_data
+
+    except (requests.exceptions.RequestException, KeyError, ValueError):
       raise
     except Exception as e:
       log_message(logger, f"Unexpected error during AI P2 optimization: {e}", LogType.ERROR)
-      raise
\ No newline at end of file
+      raise
+
+  def optimise_fused(self, resume_data: Dict, job_description: str) -> Dict:
+    log_message(logger, "Starting fused AI P1+P2 optimisation....")
+    logger.info(f"Job description length: {len(job_description)} characters.")
+
+    try:
+      optimised_data = self._complete_resume(
+        FUSED_SYSTEM_PROMPT,
+        resume_data,
+        "AI P1+P2",
+        job_description=job_description,
+        require_score=True
+      )
+      logger.info(f"ATS Score: {optimised_data['score']}/100")
+
+      log_message(logger, "Fused AI P1+P2 optimisation completed", LogType.SUCCESS)
+      logger.debug(f"Optimised data keys: {list(optimised_data.keys())}")
+
+      return optimised_data
+
+    except json.JSONDecodeError:
+      raise
+    except ValueError as e:
+      log_message(logger, f"Fused AI output failed validation: {e}", LogType.WARNING)
+      raise
+    except (requests.exceptions.RequestException, KeyError):
+      raise
+    except Exception as e:
+      log_message(logger, f"Unexpected error during fused AI optimisation: {e}", LogType.ERROR)
+      raise
+
+  async def _run_in_thread(self, func: Callable, *args, **kwargs):
+    def call():
+      return func(*args, **kwargs), self.last_cache_hit, self.last_skipped
+
+    result, cache_hit, skipped = await asyncio.to_thread(call)
+    # last_cache_hit is per thread, so carry it back to the awaiting one
+    self.last_cache_hit = cache_hit
+    self.last_skipped = skipped
+    return result
+
+  async def optimise_generic_async(self, resume_data: Dict) -> Dict:
+    return await self._run_in_thread(self.optimise_generic, resume_data)
+
+  async def optimise_generic_sections_async(
+    self,
+    resume_data: Dict,
+    max_workers: Optional[int] = None,
+    store: Optional[SectionStore] = None
+  ) -> Dict:
+    return await self._run_in_thread(self.optimise_generic_sections, resume_data, max_workers, store)
+
+  async def optimise_with_jd_async(self, resume_data: Dict, job_description: str) -> Dict:
+    return await self._run_in_thread(self.optimise_with_jd, resume_data, job_description)
+
+  async def optimise_fused_async(self, resume_data: Dict, job_description: str) -> Dict:
+    return await self._run_in_thread(self.optimise_fused, resume_data, job_description)
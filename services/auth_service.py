@@ -1,20 +1,67 @@
+import asyncio
 import requests
+import threading
+import time
 from typing import Optional
 from config.settings import settings
+from utils.http_client import get_http_client
+from utils.token_store import TokenStore, decode_jwt_expiry, token_identity
 from utils.logger import setup_logger, log_message, LogType
 
 logger = setup_logger(__name__)
 
 class AuthService:
-  def __init__(self):
+  def __init__(self, token_store: Optional[TokenStore] = None, background_refresh: bool = True):
     self.access_token: Optional[str] = None
+    self.expires_at: Optional[float] = None
+    self.refresh_at: Optional[float] = None
     self._authenticated = False
+    self.token_store = token_store or TokenStore(settings.AUTH_TOKEN_CACHE_PATH)
+    self.background_refresh = background_refresh
+    self._identity = token_identity(settings.RESUME_API_BASE_URL, settings.RESUME_API_USERNAME)
+    self._lock = threading.RLock()
+    self._refresh_lock = threading.Lock()
+    self._refresh_timer: Optional[threading.Timer] = None
+    self.http = get_http_client()
+
+  def _token_valid(self) -> bool:
+    if not self._authenticated or not self.access_token:
+      return False
+    return self.refresh_at is None or time.time() < self.refresh_at
+
+  def _set_token(self, access_token: str, expires_at: float, issued_at: float):
+    self.access_token = access_token
+    self.expires_at = expires_at
+    # short-lived tokens are refreshed halfway through instead of immediately
+    self.refresh_at = expires_at - min(settings.AUTH_REFRESH_MARGIN_SECONDS, max(0.0, expires_at - issued_at) / 2)
+    self._authenticated = True
 
   def authenticate(self) -> str:
-    if self._authenticated and self.access_token:
-      log_message(logger, "Using cached access token.")
-      return self.access_token
+    with self._lock:
+      if self._token_valid():
+        log_message(logger, "Using cached access token.")
+        return self.access_token
+
+      entry = self.token_store.load(self._identity)
+      if entry:
+        self._set_token(entry["accessToken"], entry["expiresAt"], entry.get("savedAt", time.time()))
+
+      if entry and self._token_valid():
+        self._schedule_refresh()
+
+        log_message(
+          logger,
+          f"Reusing stored access token (expires in {(self.expires_at - time.time()) / 60:.0f} min).",
+          LogType.SUCCESS
+        )
+        return self.access_token
+
+      return self._login()
 
+  async def authenticate_async(self) -> str:
+    return await asyncio.to_thread(self.authenticate)
+
+  def _login(self) -> str:
     log_message(logger, "Fetching access token....")
 
     url = f"{settings.RESUME_API_BASE_URL}/auth/login"
@@ -24,12 +71,17 @@ class AuthService:
     }
 
     try:
-      response = requests.post(url, json=payload, timeout=30)
+      response = self.http.post(url, endpoint="auth", json=payload)
       response.raise_for_status()
 
       data = response.json()
-      self.access_token = data["token"]["accessToken"]
-      self._authenticated = True
+      access_token = data["token"]["accessToken"]
+      expires_at = self._token_expiry(access_token, data["token"])
+
+      with self._lock:
+        self._set_token(access_token, expires_at, time.time())
+        self.token_store.save(self._identity, access_token, expires_at)
+        self._schedule_refresh()
 
       log_message(logger, "Access token fetched successfully.", LogType.SUCCESS)
       return self.access_token
@@ -49,19 +101,94 @@ class AuthService:
       log_message(logger, f"Unexpected error while fetching access token: {e}", LogType.ERROR)
       raise
 
-  def get_auth_headers(self) -> dict:
-    if not self._authenticated or not self.access_token:
-      self.authenticate()
+  def _token_expiry(self, access_token: str, token_data: dict) -> float:
+    expires_at = decode_jwt_expiry(access_token)
+    if expires_at is not None:
+      return expires_at
+
+    if isinstance(token_data.get("expiresIn"), (int, float)):
+      return time.time() + token_data["expiresIn"]
+    if isinstance(token_data.get("expiresAt"), (int, float)):
+      # accept both epoch seconds and milliseconds
+      expires_at = token_data["expiresAt"]
+      return expires_at / 1000 if expires_at > 1e11 else expires_at
+
+    logger.debug(f"Token expiry unknown, assuming {settings.AUTH_DEFAULT_TOKEN_TTL_SECONDS}s")
+    return time.time() + settings.AUTH_DEFAULT_TOKEN_TTL_SECONDS
+
+  def _schedule_refresh(self):
+    self.stop_background_refresh()
+    if not self.background_refresh or self.refresh_at is None:
+      return
+
+    delay = self.refresh_at - time.time()
+    if delay <= 0:
+      log_message(logger, "Access token is already due for refresh, check the system clock", LogType.WARNING)
+      return
 
+    self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+    self._refresh_timer.daemon = True
+    self._refresh_timer.start()
+    logger.debug(f"Access token refresh scheduled in {delay:.0f}s")
+
+  def _refresh_in_background(self):
+    try:
+      logger.debug("Refreshing access token before it expires....")
+      self.refresh_token(self.access_token)
+    except Exception as e:
+      # the next authenticate() call will try again
+      log_message(logger, f"Background token refresh failed: {e}", LogType.WARNING)
+
+  def stop_background_refresh(self):
+    if self._refresh_timer is not None:
+      self._refresh_timer.cancel()
+      self._refresh_timer = None
+
+  def refresh_token(self, stale_token: Optional[str]) -> str:
+    # single-flight: concurrent callers holding the same stale token share one login
+    with self._refresh_lock:
+      if self.access_token and self.access_token != stale_token:
+        logger.debug("Access token already refreshed by another caller")
+        return self.access_token
+      return self._login()
+
+  def _current_token(self) -> str:
+    with self._lock:
+      if not self._token_valid():
+        self.authenticate()
+      return self.access_token
+
+  def _headers_for(self, token: str) -> dict:
     return {
-      "Authorization": f"Bearer {self.access_token}",
+      "Authorization": f"Bearer {token}",
       "Content-Type": "application/json"
     }
 
+  def get_auth_headers(self) -> dict:
+    return self._headers_for(self._current_token())
+
+  def request(self, method: str, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    extra_headers = kwargs.pop("headers", None) or {}
+    token = self._current_token()
+
+    response = self.http.request(method, url, endpoint, headers={ **self._headers_for(token), **extra_headers }, **kwargs)
+    if response.status_code != 401:
+      return response
+
+    log_message(logger, f"Got 401 from {method} {url}, refreshing access token and retrying", LogType.WARNING)
+    response.close()
+    token = self.refresh_token(token)
+
+    return self.http.request(method, url, endpoint, headers={ **self._headers_for(token), **extra_headers }, **kwargs)
+
   def is_authenticated(self) -> bool:
     return self._authenticated and self.access_token is not None
 
   def logout(self):
     log_message(logger, "Clearing access token.")
+    self.stop_background_refresh()
+    self.token_store.clear()
     self.access_token = None
-    self._authenticated = False
\ No newline at end of file
+    self.expires_at = None
+    self.refresh_at = None
+    self._authenticated = False
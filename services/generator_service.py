@@ -1,41 +1,99 @@
+import asyncio
+import threading
 import time
 import requests
-import json
-from typing import Dict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from config.settings import settings
 from services.auth_service import AuthService
+from utils.callback_server import CallbackServer
+from utils.http_client import get_http_client
+from utils.latency import LatencyTracker
+from utils.latex import escape_latex_specials
+from utils.polling import PollSchedule, completion_time, poll_hint
+from utils.render_index import RenderIndex, render_key
+from utils.token_store import token_identity
 from utils.logger import setup_logger, log_message, LogType
 
 logger = setup_logger(__name__)
 
 class GeneratorService:
-  def __init__(self, auth_service: AuthService):
+  def __init__(self, auth_service: AuthService, render_index: Optional[RenderIndex] = None):
     self.auth_service = auth_service
+    self.http = get_http_client()
+    self.identity = token_identity(settings.RESUME_API_BASE_URL, settings.RESUME_API_USERNAME)
+    self.render_index = render_index or RenderIndex(settings.RENDER_INDEX_PATH, settings.RENDER_INDEX_TTL_SECONDS)
+    self.jobs: Dict[str, Dict] = {}
+    self.durations = LatencyTracker(settings.JOB_DURATION_HISTORY_PATH)
+    self.poll_stats = { "jobs": 0, "polls": 0, "overshoot": [] }
+    self._stats_lock = threading.Lock()
 
-  def generate_resume(self, resume_data: str, template_id: str, resume_name: str) -> str:
+  def _payload(self, resume_data: Dict, template_id: str, resume_name: str, escaped: bool = False) -> Dict:
+    return {
+      # callers rendering the same data more than once escape it up front and pass escaped=True
+      "resumeData": resume_data if escaped else escape_latex_specials(resume_data),
+      "templateId": template_id,
+      "resumeName": resume_name
+    }
+
+  def _pdf_available(self, pdf_url: str) -> bool:
+    try:
+      response = self.http.request("HEAD", pdf_url, allow_redirects=True)
+      if response.status_code in [405, 501]:
+        # some storage backends don't do HEAD; ask for the first byte instead
+        response = self.http.get(pdf_url, headers={ "Range": "bytes=0-0" }, stream=True)
+        response.close()
+      return response.status_code < 400
+    except requests.exceptions.RequestException as e:
+      logger.debug(f"Previous PDF check failed: {e}")
+      return False
+
+  def find_rendered(self, resume_data: Dict, template_id: str, resume_name: str, escaped: bool = False) -> Optional[Dict]:
+    key = render_key(self.identity, self._payload(resume_data, template_id, resume_name, escaped))
+    entry = self.render_index.get(key)
+    if entry is None:
+      return None
+
+    if not self._pdf_available(entry["pdfUrl"]):
+      log_message(logger, f"Previously rendered PDF for {resume_name} is no longer available, rendering again", LogType.WARNING)
+      self.render_index.invalidate(key)
+      return None
+
+    age_minutes = (time.time() - entry["renderedAt"]) / 60
+    log_message(logger, f"Reusing {resume_name} rendered {age_minutes:.0f} min ago with identical content", LogType.SUCCESS)
+    return { "status": "success", "pdfUrl": entry["pdfUrl"], "jobId": entry["jobId"], "reused": True }
+
+  async def find_rendered_async(
+    self,
+    resume_data: Dict,
+    template_id: str,
+    resume_name: str,
+    escaped: bool = False
+  ) -> Optional[Dict]:
+    return await asyncio.to_thread(self.find_rendered, resume_data, template_id, resume_name, escaped)
+
+  def generate_resume(
+    self,
+    resume_data: Dict,
+    template_id: str,
+    resume_name: str,
+    callback_url: Optional[str] = None,
+    escaped: bool = False
+  ) -> str:
     log_message(logger, "Generating resume....")
     logger.info(f"Template ID: {template_id}")
     logger.info(f"Resume Name: {resume_name}")
 
     url = f"{settings.RESUME_API_BASE_URL}/resume/generate"
-    headers = self.auth_service.get_auth_headers()
-
-    try:
-      resume_dict = json.loads(resume_data)
-    except json.JSONDecodeError:
-      log_message(logger, "Resume data is not a valid JSON")
-      raise
 
-    payload = {
-      "resumeData": resume_dict,
-      "templateId": template_id,
-      "resumeName": resume_name
-    }
+    payload = self._payload(resume_data, template_id, resume_name, escaped)
+    key = render_key(self.identity, payload)
+    if callback_url:
+      payload["callbackUrl"] = callback_url
 
     try:
       logger.debug(f"Sending POST to {url}")
 
-      response = requests.post(url, headers=headers, json=payload, timeout=30)
+      response = self.auth_service.request("POST", url, json=payload)
       response.raise_for_status()
 
       data = response.json()
@@ -44,6 +102,12 @@ class GeneratorService:
       if not job_id:
         raise ValueError("No 'jobId' field in API response")
 
+      self.jobs[job_id] = {
+        "submittedAt": time.time(),
+        "templateId": template_id,
+        "resumeName": resume_name,
+        "renderKey": key
+      }
       log_message(logger, "Resume data sent for generation successfully.", LogType.SUCCESS)
       logger.debug(f"Resume generation job id: {job_id}")
 
@@ -64,52 +128,305 @@ class GeneratorService:
       log_message(logger, f"Unexpected error while generating resume: {e}", LogType.ERROR)
       raise
 
-  def poll_job_status(self, job_id: str, max_attempts: int = None, interval: int = None) -> Dict:
+  def _check_job_status(self, url: str) -> Tuple[Optional[Dict], Optional[float]]:
+    # headers are rebuilt per request so a token refreshed mid-poll is picked up
+    response = self.auth_service.request("GET", url, endpoint="poll")
+    response.raise_for_status()
+
+    result = response.json()
+    status = result.get("status")
+
+    logger.info(f"Status: {status}")
+
+    if status in ["pending", "processing"]:
+      return None, poll_hint(response.headers, result)
+
+    if status == "success":
+      log_message(logger, "Job completed successfully.", LogType.SUCCESS)
+    elif status == "failed":
+      log_message(logger, f"Job failed: {result.get('error', 'Unknown error')}", LogType.ERROR)
+    else:
+      log_message(logger, f"Unknown status: {status}", LogType.WARNING)
+    return result, None
+
+  def _start_poll(self, job_id: str, max_attempts: Optional[int], interval: Optional[float], announce: bool = True) -> Dict:
     if max_attempts is None:
       max_attempts = settings.MAX_POLL_ATTEMPTS
     if interval is None:
       interval = settings.POLL_INTERVAL_SECONDS
 
-    log_message(logger, f"Polling job status (every {interval}s, max {max_attempts} attempts)...")
+    now = time.time()
+    job = self.jobs.get(job_id, {})
+    submitted_at = job.get("submittedAt", now)
+    template_id = job.get("templateId")
+
+    # first poll near the usual completion time for this template, then back off from there
+    expected = None
+    if template_id:
+      expected = self.durations.percentile(template_id, 50, min_samples=settings.POLL_PRIOR_MIN_SAMPLES)
+    first_delay = max(0.0, expected - (now - submitted_at)) if expected is not None else None
+
+    schedule = PollSchedule(
+      initial=settings.POLL_INITIAL_INTERVAL_SECONDS,
+      maximum=interval,
+      multiplier=settings.POLL_BACKOFF_MULTIPLIER,
+      jitter=settings.POLL_JITTER,
+      first_delay=first_delay
+    )
+
+    # the old fixed schedule's total wait is kept as the time budget
+    budget = max_attempts * interval
+    if announce and expected is not None:
+      log_message(logger, f"Polling job status (expecting ~{expected:.1f}s, up to {budget:g}s)...")
+    elif announce:
+      log_message(logger, f"Polling job status (backoff up to {interval:g}s, up to {budget:g}s)...")
+
+    return {
+      "jobId": job_id,
+      "url": f"{settings.RESUME_API_BASE_URL}/resume/status/{job_id}",
+      "templateId": template_id,
+      "schedule": schedule,
+      "submittedAt": submitted_at,
+      "deadline": now + budget,
+      "budget": budget,
+      "attempt": 0,
+      "lastPendingAt": submitted_at
+    }
+
+  def _next_poll_delay(self, state: Dict, hint: Optional[float]) -> float:
+    delay = state["schedule"].next_delay(hint)
+    remaining = state["deadline"] - time.time()
+    if remaining <= 0:
+      raise TimeoutError(f"Job {state['jobId']} did not complete within {state['budget']:g} seconds ({state['attempt']} polls)")
+    return min(delay, remaining)
+
+  def _finish_poll(self, state: Dict, result: Dict):
+    detected_at = time.time()
+    completed_at = completion_time(result)
+    if completed_at is None or not state["lastPendingAt"] <= completed_at <= detected_at:
+      # somewhere between the last "processing" answer and this one
+      completed_at = (state["lastPendingAt"] + detected_at) / 2
+
+    duration = completed_at - state["submittedAt"]
+    overshoot = detected_at - completed_at
+    if result.get("status") == "success" and state["templateId"]:
+      self.durations.record(state["templateId"], duration)
+
+    job = self.jobs.get(state["jobId"], {})
+    if result.get("status") == "success" and result.get("pdfUrl") and job.get("renderKey"):
+      self.render_index.put(job["renderKey"], result["pdfUrl"], state["jobId"], job["templateId"], job["resumeName"])
+
+    with self._stats_lock:
+      self.poll_stats["jobs"] += 1
+      self.poll_stats["polls"] += state["attempt"]
+      self.poll_stats["overshoot"].append(overshoot)
 
-    url = f"{settings.RESUME_API_BASE_URL}/resume/status/{job_id}"
-    headers = self.auth_service.get_auth_headers()
+    logger.info(
+      f"Job {state['jobId']} finished after ~{duration:.1f}s, detected {overshoot:.1f}s later "
+      f"({state['attempt']} polls)"
+    )
+
+  def _poll_failed(self, state: Dict, error: requests.exceptions.RequestException) -> float:
+    log_message(logger, f"Error polling job status: {error}", LogType.ERROR)
+    hint = None
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+      hint = poll_hint(error.response.headers, None)
+
+    try:
+      delay = self._next_poll_delay(state, hint)
+    except TimeoutError:
+      raise error
+
+    log_message(logger, f"Retrying in {delay:.1f}s", LogType.WARNING)
+    return delay
+
+  def poll_job_status(self, job_id: str, max_attempts: int = None, interval: float = None) -> Dict:
+    state = self._start_poll(job_id, max_attempts, interval)
+    delay = state["schedule"].first()
+
+    while True:
+      time.sleep(delay)
+      state["attempt"] += 1
+      logger.info(f"Attempt {state['attempt']} ({time.time() - state['submittedAt']:.0f}s since submit)...")
 
-    for attempt in range(1, max_attempts + 1):
       try:
-        logger.info(f"Attempt {attempt}/{max_attempts}...")
+        result, hint = self._check_job_status(state["url"])
+      except requests.exceptions.RequestException as e:
+        delay = self._poll_failed(state, e)
+        continue
 
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+      if result is not None:
+        self._finish_poll(state, result)
+        return result
 
-        result = response.json()
-        status = result.get("status")
+      state["lastPendingAt"] = time.time()
+      delay = self._next_poll_delay(state, hint)
 
-        logger.info(f"Status: {status}")
+  async def generate_resume_async(
+    self,
+    resume_data: Dict,
+    template_id: str,
+    resume_name: str,
+    callback_url: Optional[str] = None,
+    escaped: bool = False
+  ) -> str:
+    return await asyncio.to_thread(self.generate_resume, resume_data, template_id, resume_name, callback_url, escaped)
 
-        if status not in ["pending", "processing"]:
-          if status == "success":
-            log_message(logger, "Job completed successfully.", LogType.SUCCESS)
-            return result
-          elif status == "failed":
-            log_message(logger, f"Job failed: {result.get('error', 'Unknown error')}", LogType.ERROR)
-            return result
-          else:
-            log_message(logger, f"Unknown status: {status}", LogType.WARNING)
-            return result
+  async def poll_job_status_async(self, job_id: str, max_attempts: int = None, interval: float = None) -> Dict:
+    # same loop as poll_job_status, but waiting yields the event loop instead of blocking a thread
+    state = self._start_poll(job_id, max_attempts, interval)
+    delay = state["schedule"].first()
 
-        if attempt < max_attempts:
-          time.sleep(interval)
+    while True:
+      await asyncio.sleep(delay)
+      state["attempt"] += 1
+      logger.info(f"Attempt {state['attempt']} ({time.time() - state['submittedAt']:.0f}s since submit)...")
 
+      try:
+        result, hint = await asyncio.to_thread(self._check_job_status, state["url"])
       except requests.exceptions.RequestException as e:
-        log_message(logger, f"Error polling job status: {e}", LogType.ERROR)
-        if attempt < max_attempts:
-          log_message(logger, f"Retrying in {interval}s", LogType.WARNING)
-          time.sleep(interval)
-        else:
-          raise
-
-    raise TimeoutError(
-      f"Job {job_id} did not complete after {max_attempts} attempts"
-      f"({max_attempts * interval} seconds)"
-    )
\ No newline at end of file
+        delay = self._poll_failed(state, e)
+        continue
+
+      if result is not None:
+        self._finish_poll(state, result)
+        return result
+
+      state["lastPendingAt"] = time.time()
+      delay = self._next_poll_delay(state, hint)
+
+  async def poll_jobs_async(
+    self,
+    job_ids: List[str],
+    max_attempts: int = None,
+    interval: float = None
+  ) -> AsyncIterator[Tuple[str, Dict]]:
+    # one poller for many jobs: every tick checks all outstanding jobs, results are yielded as they land
+    single = len(job_ids) == 1
+    states = { job_id: self._start_poll(job_id, max_attempts, interval, announce=single) for job_id in job_ids }
+    if not states:
+      return
+
+    schedule = min((state["schedule"] for state in states.values()), key=lambda schedule: schedule.first())
+    delay = schedule.first()
+    if not single:
+      log_message(logger, f"Polling {len(states)} jobs together (first check in {delay:.1f}s)...")
+
+    while states:
+      await asyncio.sleep(delay)
+      tick = list(states.values())
+      outcomes = await asyncio.gather(
+        *(asyncio.to_thread(self._check_job_status, state["url"]) for state in tick),
+        return_exceptions=True
+      )
+
+      hints = []
+      for state, outcome in zip(tick, outcomes):
+        state["attempt"] += 1
+
+        if isinstance(outcome, requests.exceptions.RequestException):
+          log_message(logger, f"Error polling job {state['jobId']}: {outcome}", LogType.ERROR)
+          if isinstance(outcome, requests.exceptions.HTTPError) and outcome.response is not None:
+            hints.append(poll_hint(outcome.response.headers, None))
+          continue
+        if isinstance(outcome, BaseException):
+          raise outcome
+
+        result, hint = outcome
+        if result is None:
+          state["lastPendingAt"] = time.time()
+          hints.append(hint)
+          continue
+
+        self._finish_poll(state, result)
+        del states[state["jobId"]]
+        yield state["jobId"], result
+
+      now = time.time()
+      for job_id, state in list(states.items()):
+        if now >= state["deadline"]:
+          del states[job_id]
+          log_message(logger, f"Job {job_id} did not complete within {state['budget']:g} seconds", LogType.ERROR)
+          yield job_id, { "status": "failed", "error": f"Job {job_id} did not complete within {state['budget']:g} seconds" }
+
+      if states:
+        # the soonest hint wins: a tick costs one request per job either way
+        known = [hint for hint in hints if hint is not None]
+        delay = schedule.next_delay(min(known) if known else None)
+        delay = min(delay, max(0.0, min(state["deadline"] for state in states.values()) - now))
+
+  async def _callback_result(self, job_id: str, body: Dict) -> Optional[Dict]:
+    if body.get("status") in ["success", "failed"]:
+      if body["status"] == "success":
+        log_message(logger, f"Job {job_id} completed (callback).", LogType.SUCCESS)
+      else:
+        log_message(logger, f"Job {job_id} failed (callback): {body.get('error', 'Unknown error')}", LogType.ERROR)
+      return body
+
+    # a bare "done" ping: confirm with one status request
+    try:
+      result, _ = await asyncio.to_thread(self._check_job_status, f"{settings.RESUME_API_BASE_URL}/resume/status/{job_id}")
+      return result
+    except requests.exceptions.RequestException as e:
+      log_message(logger, f"Error checking job {job_id} after callback: {e}", LogType.WARNING)
+      return None
+
+  async def wait_for_jobs_async(
+    self,
+    job_ids: List[str],
+    callback_server: CallbackServer,
+    callback_tokens: Dict[str, str],
+    callback_timeout: float,
+    max_attempts: int = None,
+    interval: float = None
+  ) -> AsyncIterator[Tuple[str, Dict]]:
+    # callbacks first; anything the backend doesn't call back about is polled for as usual
+    pending = list(job_ids)
+    waits = {
+      asyncio.create_task(callback_server.wait(callback_tokens[job_id], callback_timeout)): job_id
+      for job_id in job_ids if job_id in callback_tokens
+    }
+    log_message(logger, f"Waiting up to {callback_timeout:g}s for {len(waits)} job callbacks...")
+
+    try:
+      remaining = set(waits)
+      while remaining:
+        done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          job_id = waits[task]
+          callback_server.forget(callback_tokens[job_id])
+          body = task.result()
+          if body is None:
+            continue
+
+          result = await self._callback_result(job_id, body)
+          if result is None:
+            continue
+
+          state = self._start_poll(job_id, max_attempts, interval, announce=False)
+          state["lastPendingAt"] = time.time()
+          self._finish_poll(state, result)
+          pending.remove(job_id)
+          yield job_id, result
+    finally:
+      for task in waits:
+        task.cancel()
+
+    if pending:
+      log_message(logger, f"No callback for {len(pending)} jobs after {callback_timeout:g}s, falling back to polling", LogType.WARNING)
+      async for job_id, result in self.poll_jobs_async(pending, max_attempts, interval):
+        yield job_id, result
+
+  def log_poll_stats(self):
+    with self._stats_lock:
+      jobs = self.poll_stats["jobs"]
+      polls = self.poll_stats["polls"]
+      overshoot = list(self.poll_stats["overshoot"])
+
+    if not jobs:
+      return
+
+    logger.info(
+      f"Polling: {jobs} jobs, {polls} status requests, overshoot avg {sum(overshoot) / len(overshoot):.1f}s "
+      f"/ max {max(overshoot):.1f}s"
+    )
@@ -1,6 +1,8 @@
+import asyncio
 import requests
 from typing import Optional
 from config.settings import settings
+from utils.http_client import get_http_client
 from utils.logger import setup_logger, log_message, LogType
 
 logger = setup_logger(__name__)
@@ -10,6 +12,7 @@ class NotificationService:
     self.bot_token = settings.TELEGRAM_BOT_TOKEN
     self.chat_id = settings.TELEGRAM_CHAT_ID
     self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+    self.http = get_http_client()
 
   def send_message(self, message: str, parse_mode: Optional[str] = None) -> bool:
     log_message(logger, "Sending telegram notification....")
@@ -26,7 +29,7 @@ class NotificationService:
     try:
       logger.debug(f"Sending to chat ID: {self.chat_id}")
 
-      response = requests.post(url, json=payload, timeout=30)
+      response = self.http.post(url, endpoint="notify", json=payload)
       response.raise_for_status()
 
       result = response.json()
@@ -59,6 +62,15 @@ class NotificationService:
     )
     return self.send_message(message)
 
+  def send_partial_success_notification(self, pdf_url: str, error: str, mode: str = "generic") -> bool:
+    message = (
+      f"Resume generation partly successful\n\n"
+      f"Mode: {mode.upper()}\n"
+      f"PDF URL: {pdf_url}\n\n"
+      f"Failed: {error}\n\n"
+    )
+    return self.send_message(message)
+
   def send_failure_notification(self, error: str, mode: str = "generic") -> bool:
     message = (
       f"Resume generation failed!\n\n"
@@ -73,4 +85,19 @@ class NotificationService:
       f"Mode: {mode.upper()}\n"
       f"Processing your resume...."
     )
-    return self.send_message(message)
\ No newline at end of file
+    return self.send_message(message)
+
+  async def send_message_async(self, message: str, parse_mode: Optional[str] = None) -> bool:
+    return await asyncio.to_thread(self.send_message, message, parse_mode)
+
+  async def send_success_notification_async(self, pdf_url: str, mode: str = "generic") -> bool:
+    return await asyncio.to_thread(self.send_success_notification, pdf_url, mode)
+
+  async def send_partial_success_notification_async(self, pdf_url: str, error: str, mode: str = "generic") -> bool:
+    return await asyncio.to_thread(self.send_partial_success_notification, pdf_url, error, mode)
+
+  async def send_failure_notification_async(self, error: str, mode: str = "generic") -> bool:
+    return await asyncio.to_thread(self.send_failure_notification, error, mode)
+
+  async def send_pipeline_start_notification_async(self, mode: str = "generic") -> bool:
+    return await asyncio.to_thread(self.send_pipeline_start_notification, mode)
\ No newline at end of file
@@ -1,24 +1,44 @@
+import asyncio
 import requests
 import json
-from typing import Dict
+from typing import Dict, Optional
 from config.settings import settings
 from services.auth_service import AuthService
+from utils.resume_snapshot import ResumeSnapshot, content_hash, load_resume_file
+from utils.token_store import token_identity
 from utils.logger import setup_logger, log_message, LogType
 
 logger = setup_logger(__name__)
 
 class ResumeService:
-  def __init__(self, auth_service: AuthService):
+  def __init__(self, auth_service: Optional[AuthService] = None, snapshot: Optional[ResumeSnapshot] = None):
     self.auth_service = auth_service
+    self.snapshot = snapshot or ResumeSnapshot(
+      settings.RESUME_SNAPSHOT_PATH,
+      token_identity(settings.RESUME_API_BASE_URL, settings.RESUME_API_USERNAME)
+    )
+
+  def _conditional_headers(self, entry: Optional[Dict]) -> Dict:
+    headers = {}
+    if entry and entry.get("etag"):
+      headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("lastModified"):
+      headers["If-Modified-Since"] = entry["lastModified"]
+    return headers
 
   def fetch_resume_data(self) -> Dict:
     log_message(logger, "Fetching resume data....")
 
     url = f"{settings.RESUME_API_BASE_URL}/resume"
-    headers = self.auth_service.get_auth_headers()
+    entry = self.snapshot.load()
 
     try:
-      response = requests.get(url, headers=headers, timeout=30)
+      response = self.auth_service.request("GET", url, headers=self._conditional_headers(entry))
+
+      if response.status_code == 304 and entry:
+        log_message(logger, "Resume data unchanged (304), using local snapshot.", LogType.SUCCESS)
+        return entry["data"]
+
       response.raise_for_status()
 
       data = response.json()
@@ -27,6 +47,20 @@ class ResumeService:
       if not resume_data:
         raise ValueError("No 'data' field in API response")
 
+      etag = response.headers.get("ETag")
+      last_modified = response.headers.get("Last-Modified")
+      unchanged = (
+        entry is not None
+        and entry.get("contentHash") == content_hash(resume_data)
+        and entry.get("etag") == etag
+        and entry.get("lastModified") == last_modified
+      )
+      if unchanged:
+        # without validators the API always sends the full body; the hash still spares a rewrite
+        logger.debug("Resume data matches the local snapshot")
+      else:
+        self.snapshot.save(resume_data, etag, last_modified)
+
       log_message(logger, "Resume data fetched successfully.", LogType.SUCCESS)
       logger.debug(f"Resume data keys: {list(resume_data.keys())}")
 
@@ -47,6 +81,32 @@ class ResumeService:
       log_message(logger, f"Unexpected error while fetching resume data: {e}", LogType.ERROR)
       raise
 
+  async def fetch_resume_data_async(self) -> Dict:
+    return await asyncio.to_thread(self.fetch_resume_data)
+
+  def load_offline_resume_data(self, path: Optional[str] = None) -> Dict:
+    if path:
+      log_message(logger, f"Loading resume data from {path} (offline)....")
+      try:
+        resume_data = load_resume_file(path)
+      except (OSError, json.JSONDecodeError, ValueError) as e:
+        log_message(logger, f"Failed to load resume data from {path}: {e}", LogType.ERROR)
+        raise
+    else:
+      log_message(logger, "Loading resume data from local snapshot (offline)....")
+      entry = self.snapshot.load()
+      if not entry:
+        log_message(logger, f"No resume snapshot for this account at {self.snapshot.path}", LogType.ERROR)
+        raise FileNotFoundError(f"No resume snapshot for this account at {self.snapshot.path}, run once online first")
+      resume_data = entry["data"]
+
+    log_message(logger, "Resume data loaded successfully.", LogType.SUCCESS)
+    logger.debug(f"Resume data keys: {list(resume_data.keys())}")
+    return resume_data
+
+  async def load_offline_resume_data_async(self, path: Optional[str] = None) -> Dict:
+    return await asyncio.to_thread(self.load_offline_resume_data, path)
+
   def stringify_resume_data(self, resume_data: Dict) -> str:
     log_message(logger, "Stringification of resume data....")
 
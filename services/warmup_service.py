@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from typing import Optional, Set
+import requests
+from config.settings import settings
+from utils.http_client import get_http_client
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+class WarmupService:
+  def __init__(self):
+    self.url = settings.RESUME_API_WARMUP_URL or settings.RESUME_API_BASE_URL
+    self.http = get_http_client()
+    self.stats = { "requests": 0, "warm_seconds": 0.0, "waited_seconds": 0.0, "hidden_seconds": 0.0 }
+    self._keep_warm_task: Optional[asyncio.Task] = None
+    self._pending: Optional[asyncio.Task] = None
+    self._tasks: Set[asyncio.Task] = set()
+    self._lock = threading.Lock()
+
+  def warm_up(self, reason: str) -> float:
+    start = time.perf_counter()
+
+    try:
+      # any response, even a 404, means the instance is awake
+      self.http.get(self.url, endpoint="warmup")
+      elapsed = time.perf_counter() - start
+      logger.debug(f"Resume API warm-up ({reason}) answered in {elapsed:.1f}s")
+    except requests.exceptions.RequestException as e:
+      elapsed = time.perf_counter() - start
+      log_message(logger, f"Resume API warm-up ({reason}) failed after {elapsed:.1f}s: {e}", LogType.WARNING)
+
+    # pings run on worker threads, possibly several at once
+    with self._lock:
+      self.stats["requests"] += 1
+      self.stats["warm_seconds"] += elapsed
+    return elapsed
+
+  def start(self, reason: str) -> asyncio.Task:
+    task = asyncio.create_task(asyncio.to_thread(self.warm_up, reason))
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+    return task
+
+  async def wait(self, task: asyncio.Task, step: str) -> float:
+    start = time.perf_counter()
+    duration = await task
+    waited = time.perf_counter() - start
+
+    hidden = max(0.0, duration - waited)
+    with self._lock:
+      self.stats["waited_seconds"] += waited
+      self.stats["hidden_seconds"] += hidden
+
+    if waited >= 0.1:
+      logger.info(f"Waited {waited:.1f}s for the Resume API to wake up before {step} ({hidden:.1f}s overlapped)")
+    else:
+      logger.debug(f"Resume API already warm before {step} ({hidden:.1f}s overlapped)")
+    return waited
+
+  def start_keep_warm(self, interval: float):
+    self._keep_warm_task = asyncio.create_task(self._keep_warm(interval))
+
+  async def _keep_warm(self, interval: float):
+    while True:
+      self._pending = self.start("keep-warm")
+      # shielded so stopping the loop does not abandon a wake-up that is already under way
+      await asyncio.shield(self._pending)
+      await asyncio.sleep(interval)
+
+  async def stop_keep_warm(self, step: str):
+    if self._keep_warm_task is not None:
+      self._keep_warm_task.cancel()
+      self._keep_warm_task = None
+
+    if self._pending is not None:
+      await self.wait(self._pending, step)
+      self._pending = None
+
+  def cancel(self):
+    if self._keep_warm_task is not None:
+      self._keep_warm_task.cancel()
+      self._keep_warm_task = None
+
+    # nobody is going to wait for these any more; the ping's thread finishes within
+    # HTTP_WARMUP_TIMEOUT_SECONDS on its own, but the loop no longer tracks it
+    for task in list(self._tasks):
+      task.cancel()
+    self._tasks.clear()
+    self._pending = None
+
+  def log_stats(self):
+    if not self.stats["requests"]:
+      return
+
+    logger.info(
+      f"Resume API warm-up: {self.stats['requests']} requests, {self.stats['warm_seconds']:.1f}s total, "
+      f"waited {self.stats['waited_seconds']:.1f}s, hid {self.stats['hidden_seconds']:.1f}s behind other work"
+    )
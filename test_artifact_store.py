@@ -0,0 +1,119 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 23, "Testing Artifact Store")
+
+PDF = b"%PDF-1.4 " + bytes(range(256)) * 40
+STATE = {"flaky": 0, "ranges": []}
+
+class StubStorage(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = PDF
+        headers = {"ETag": '"v1"'}
+        if self.path == "/pdf/bad-digest.pdf":
+            headers["Digest"] = "sha-256=" + base64.b64encode(hashlib.sha256(b"other").digest()).decode()
+        if self.path == "/pdf/md5-etag.pdf":
+            headers["ETag"] = f'"{hashlib.md5(PDF).hexdigest()}"'
+
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") == '"v1"':
+            STATE["ranges"].append(range_header)
+            start = int(range_header[len("bytes="):-1])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+            self.send_header("Content-Length", str(len(body) - start))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body[start:])
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if self.path == "/pdf/flaky.pdf" and STATE["flaky"] == 0:
+            # drop the connection half way through the first attempt
+            STATE["flaky"] += 1
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubStorage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    from utils.artifact_store import ArtifactStore, DownloadError, expected_digests
+    from utils.http_client import get_http_client
+
+    tmp = tempfile.mkdtemp()
+    store = ArtifactStore(os.path.join(tmp, "artifacts"), get_http_client(), chunk_size=1024, max_attempts=3)
+
+    # Test 1: a plain download is streamed, verified and named by run
+    logger.info("\n--- Test 1: Download ---")
+    saved = store.download(f"{base}/pdf/whole.pdf", "run-1/Jane_role.pdf")
+    with open(saved["path"], 'rb') as f:
+        assert f.read() == PDF
+    assert saved["sha256"] == hashlib.sha256(PDF).hexdigest() and not saved["deduplicated"]
+    assert saved["path"] == os.path.join(tmp, "artifacts", "run-1", "Jane_role.pdf")
+    log_message(logger, "PDF streamed to disk and verified", LogType.SUCCESS)
+
+    # Test 2: an interrupted download resumes with a Range request instead of starting over
+    logger.info("\n--- Test 2: Resume ---")
+    saved = store.download(f"{base}/pdf/flaky.pdf", "run-2/Jane_role.pdf")
+    with open(saved["path"], 'rb') as f:
+        assert f.read() == PDF
+    # only whole chunks reach the partial file, so the resume point is at or just before the cut
+    assert len(STATE["ranges"]) == 1 and 0 < int(STATE["ranges"][0][len("bytes="):-1]) <= len(PDF) // 2, STATE["ranges"]
+    assert store.stats["resumed"] == 1
+    assert not os.listdir(store.partial_dir)
+    log_message(logger, "Interrupted download resumed from the middle", LogType.SUCCESS)
+
+    # Test 3: identical content is stored once and hard-linked under each name
+    logger.info("\n--- Test 3: Dedup ---")
+    first = os.stat(os.path.join(tmp, "artifacts", "run-1", "Jane_role.pdf"))
+    second = os.stat(saved["path"])
+    assert saved["deduplicated"] and first.st_ino == second.st_ino
+    assert len(os.listdir(store.objects_dir)) == 1
+    log_message(logger, "Identical PDFs hard-linked to one object", LogType.SUCCESS)
+
+    # Test 4: checksums from the server are enforced
+    logger.info("\n--- Test 4: Checksums ---")
+    assert expected_digests({"ETag": '"' + "a" * 32 + '"'}) == {"md5": "a" * 32}
+    assert expected_digests({"ETag": '"v1"'}) == {}
+    store.download(f"{base}/pdf/md5-etag.pdf", "run-3/Jane_role.pdf")
+    try:
+        store.download(f"{base}/pdf/bad-digest.pdf", "run-3/Bad.pdf")
+        raise AssertionError("digest mismatch was not detected")
+    except DownloadError:
+        pass
+    assert not os.path.exists(os.path.join(tmp, "artifacts", "run-3", "Bad.pdf"))
+    store.log_stats()
+    log_message(logger, "MD5 ETags checked, bad digests rejected", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Artifact store test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,85 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 17, "Testing Async Polling")
+
+JOBS = 200
+STARTED = {}
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+
+    def do_GET(self):
+        job_id = self.path.rsplit("/", 1)[-1]
+        first_seen = STARTED.setdefault(job_id, time.monotonic())
+        done = time.monotonic() - first_seen >= 1
+        self._send({"status": "success", "pdfUrl": f"/pdf/{job_id}.pdf"} if done else {"status": "processing"})
+
+    def log_message(self, *args):
+        pass
+
+async def poll_all(generator_service) -> list:
+    return await asyncio.gather(*(
+        generator_service.poll_job_status_async(f"job-{n}", max_attempts=5, interval=1)
+        for n in range(JOBS)
+    ))
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    type(settings).RESUME_API_BASE_URL = f"http://127.0.0.1:{server.server_port}/api"
+    tmp = tempfile.mkdtemp()
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    type(settings).RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+
+    from services.auth_service import AuthService
+    from services.generator_service import GeneratorService
+
+    auth_service = AuthService(background_refresh=False)
+    auth_service.authenticate()
+    generator_service = GeneratorService(auth_service)
+
+    # Test 1: one event loop waits on many jobs without a thread per job
+    logger.info(f"\n--- Test 1: {JOBS} concurrent poll_job_status_async() ---")
+    # 200 jobs x 2 polls of per-attempt logging is just noise here
+    import logging
+    logging.getLogger("services.generator_service").setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    results = asyncio.run(poll_all(generator_service))
+    elapsed = time.perf_counter() - start
+
+    assert all(result["status"] == "success" for result in results)
+    assert elapsed < 10, f"Polls should overlap, took {elapsed:.1f}s"
+    log_message(logger, f"{JOBS} jobs polled to completion in {elapsed:.1f}s", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Async polling test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,56 @@
+from utils.ats_scoring import score_batch, score_resume, tokenize
+from utils.logger import setup_logger, log_step, log_message, LogType
+import time
+
+logger = setup_logger()
+
+log_step(logger, 13, "Testing Local ATS Scoring")
+
+try:
+    jd = "Senior backend engineer: Python, C#, AWS, Kubernetes and CI/CD. Python experience required."
+    strong = {
+        "summary": "Senior backend engineer building Python and C# services on AWS",
+        "experience": [{"bullets": ["Ran Kubernetes CI/CD pipelines", "Scaled Python APIs"]}],
+        "score": 12
+    }
+    weak = {"summary": "Frontend developer focused on React", "experience": [{"bullets": ["Built UI components"]}]}
+
+    # Test 1: tokenisation keeps technical terms
+    logger.info("\n--- Test 1: tokenize() ---")
+    tokens = tokenize(jd)
+    logger.info(f"  {tokens}")
+    for term in ("c#", "ci/cd", "python", "kubernetes"):
+        assert term in tokens, f"{term} should survive tokenisation"
+    assert "and" not in tokens and "required" not in tokens
+    log_message(logger, "Technical terms kept, stopwords dropped", LogType.SUCCESS)
+
+    # Test 2: scores rank resumes and are reproducible
+    logger.info("\n--- Test 2: score_resume() ---")
+    strong_score = score_resume(strong, jd)
+    weak_score = score_resume(weak, jd)
+    logger.info(f"  strong: {strong_score}")
+    logger.info(f"  weak:   {weak_score}")
+    assert strong_score["score"] > weak_score["score"]
+    assert strong_score["missing"] == [], "Every JD term appears in the strong resume"
+    assert "python" in weak_score["missing"]
+    assert score_resume({**strong, "score": 99}, jd) == strong_score, "The model's own score must not affect the result"
+    log_message(logger, f"Strong {strong_score['score']} vs weak {weak_score['score']}", LogType.SUCCESS)
+
+    # Test 3: batch scoring matches single scoring
+    logger.info("\n--- Test 3: score_batch() ---")
+    pairs = [(strong, jd), (weak, jd)] * 250
+    start = time.perf_counter()
+    batch = score_batch(pairs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert batch[0] == strong_score and batch[1] == weak_score, "Batch companions must not change a pair's score"
+    assert score_batch([]) == []
+    assert score_resume(strong, "")["score"] == 0.0
+    log_message(logger, f"Scored {len(pairs)} pairs in {elapsed_ms:.1f} ms", LogType.SUCCESS)
+
+    log_message(logger, "Local ATS scoring test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
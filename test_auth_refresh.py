@@ -0,0 +1,94 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 16, "Testing 401 Refresh and Replay")
+
+STATE = {"logins": 0, "valid": "token-1", "rejected": 0}
+LOCK = threading.Lock()
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, code: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/auth/login"):
+            with LOCK:
+                STATE["logins"] += 1
+                token = STATE["valid"]
+            time.sleep(0.2)
+            return self._send(200, {"token": {"accessToken": token, "expiresIn": 3600}})
+        self._send(404, {})
+
+    def do_GET(self):
+        with LOCK:
+            valid = self.headers.get("Authorization") == f"Bearer {STATE['valid']}"
+            if not valid:
+                STATE["rejected"] += 1
+        if not valid:
+            return self._send(401, {"error": "token expired"})
+        self._send(200, {"data": {"name": "Jane"}, "status": "success"})
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    type(settings).RESUME_API_BASE_URL = f"http://127.0.0.1:{server.server_port}/api"
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    type(settings).RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    type(settings).RESUME_SNAPSHOT_PATH = os.path.join(tmp, "resume_snapshot.json")
+
+    from services.auth_service import AuthService
+    from services.resume_service import ResumeService
+    from services.generator_service import GeneratorService
+
+    auth_service = AuthService(background_refresh=False)
+    auth_service.authenticate()
+
+    # Test 1: a token revoked mid-run is refreshed and the request replayed
+    logger.info("\n--- Test 1: Replay after 401 ---")
+    STATE["valid"] = "token-2"
+    resume = ResumeService(auth_service).fetch_resume_data()
+    assert resume == {"name": "Jane"}
+    assert STATE["logins"] == 2 and auth_service.access_token == "token-2"
+    log_message(logger, "Resume fetched after one refresh", LogType.SUCCESS)
+
+    # Test 2: concurrent pollers share a single login
+    logger.info("\n--- Test 2: Single-flight refresh ---")
+    STATE["valid"] = "token-3"
+    generator_service = GeneratorService(auth_service)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda job: generator_service.poll_job_status(job, max_attempts=1, interval=0), range(6)))
+
+    assert all(result["status"] == "success" for result in results)
+    assert STATE["logins"] == 3, f"Expected one shared login, got {STATE['logins'] - 2}"
+    log_message(logger, f"{STATE['rejected']} rejected requests, 1 login", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "401 refresh test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,174 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.helpers import resolve_jd_files, batch_resume_name
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 28, "Testing Batch JD Mode")
+
+RESUME = {"name": "Jane Doe", "summary": "Backend engineer", "skills": ["Python", "AWS"]}
+JOBS = {}
+LOCK = threading.Lock()
+
+class StubApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body: dict, code: int = 200):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith("/api/resume/status/"):
+            job_id = self.path.rsplit("/", 1)[-1]
+            return self._send({"status": "success", "pdfUrl": f"http://{self.headers['Host']}/pdf/{job_id}.pdf"})
+        if self.path == "/api/resume":
+            return self._send({"data": RESUME})
+        self._send({"ok": True})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.endswith("/auth/login"):
+            return self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+        if self.path.endswith("/resume/generate"):
+            with LOCK:
+                job_id = f"job-{len(JOBS)}"
+                JOBS[job_id] = body
+            return self._send({"data": {"jobId": job_id}})
+
+        user = json.loads(body["messages"][-1]["content"])
+        if "jd" in user and "broken" in user["jd"]:
+            return self._send({"error": "bad request"}, code=400)
+        output = dict(user["resume"], score=70) if "jd" in user else dict(user)
+        output["_issues"] = []
+        self._send({"choices": [{"message": {"content": json.dumps(output)}}]})
+
+    def log_message(self, *args):
+        pass
+
+class StubNotifications:
+    async def send_pipeline_start_notification_async(self, mode: str):
+        return True
+
+    async def send_failure_notification_async(self, error: str, mode: str):
+        return True
+
+    async def send_message_async(self, message: str, parse_mode: str = None):
+        return True
+
+try:
+    tmp = tempfile.mkdtemp()
+    jd_dir = os.path.join(tmp, "jds")
+    os.makedirs(os.path.join(jd_dir, "archive"))
+    for name, text in (("backend role.txt", "Python AWS"), ("data.md", "Python SQL"), ("z-broken.txt", "broken posting")):
+        with open(os.path.join(jd_dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    # Test 1: directories and globs resolve to sorted files only
+    logger.info("\n--- Test 1: resolve_jd_files() ---")
+    from_dir = resolve_jd_files(jd_dir)
+    assert [os.path.basename(path) for path in from_dir] == ["backend role.txt", "data.md", "z-broken.txt"], from_dir
+    assert [os.path.basename(path) for path in resolve_jd_files(os.path.join(jd_dir, "*.txt"))] == ["backend role.txt", "z-broken.txt"]
+    try:
+        resolve_jd_files(os.path.join(jd_dir, "*.pdf"))
+        raise AssertionError("an empty match should raise")
+    except FileNotFoundError:
+        pass
+    log_message(logger, "Directory and glob resolved, subdirectories skipped", LogType.SUCCESS)
+
+    # Test 2: resume names are suffixed with a sanitised JD stem
+    logger.info("\n--- Test 2: batch_resume_name() ---")
+    assert batch_resume_name("Jane_Doe", "jds/backend role.txt") == "Jane_Doe_backend_role"
+    assert batch_resume_name("Jane_Doe", "/tmp/Sr. Eng (Remote)!.md") == "Jane_Doe_Sr_Eng_Remote_"
+    assert batch_resume_name("Jane_Doe", "jds/data-eng_2.txt") == "Jane_Doe_data-eng_2"
+    log_message(logger, "JD stems sanitised into resume names", LogType.SUCCESS)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    settings_class = type(settings)
+    settings_class.RESUME_API_BASE_URL = f"{base}/api"
+    settings_class.OPENAI_BASE_URL = f"{base}/ai"
+    settings_class.AI_FALLBACK_MODELS = []
+    settings_class.AI_REQUESTS_PER_MINUTE = 0
+    for name in ("RESUME_API_USERNAME", "RESUME_API_PASSWORD", "GITHUB_PAT", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        setattr(settings_class, name, "test")
+    settings_class.AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    settings_class.RESUME_SNAPSHOT_PATH = os.path.join(tmp, "resume_snapshot.json")
+    settings_class.JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    settings_class.RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    settings_class.AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    settings_class.AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+    settings_class.POLL_INITIAL_INTERVAL_SECONDS = 0.1
+
+    import main
+    main.NotificationService = StubNotifications
+
+    # Test 3: one JSONL record per JD, failures recorded without stopping the batch
+    logger.info("\n--- Test 3: Summary records ---")
+    output_path = os.path.join(tmp, "batch.jsonl")
+    exit_code = asyncio.run(
+        main.run_batch_pipeline_async(jd_dir, "templates/a.cshtml", "Jane_Doe", output_path, concurrency=2, use_cache=False)
+    )
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        records = {os.path.basename(record["jd"]): record for record in map(json.loads, f)}
+
+    assert exit_code == 1, "a failed JD should fail the batch"
+    assert sorted(records) == ["backend role.txt", "data.md", "z-broken.txt"], records
+    for name in ("backend role.txt", "data.md"):
+        record = records[name]
+        assert record["status"] == "success" and record["score"] == 70 and record["pdfUrl"], record
+        assert record["localScore"] is not None and record["error"] is None
+        assert set(record["timings"]) >= {"p2", "generate", "poll", "total"}, record["timings"]
+    assert records["backend role.txt"]["resumeName"] == "Jane_Doe_backend_role"
+    broken = records["z-broken.txt"]
+    assert broken["status"] == "failed" and "400" in broken["error"] and broken["pdfUrl"] is None, broken
+    assert sorted(job["resumeName"] for job in JOBS.values()) == ["Jane_Doe_backend_role", "Jane_Doe_data"]
+    log_message(logger, "Successes and the failed JD both recorded", LogType.SUCCESS)
+
+    # Test 4: a broken local scorer leaves localScore empty but never fails a JD
+    logger.info("\n--- Test 4: Local scoring failure ---")
+    def broken_scorer(resume, job_description):
+        raise ValueError("scorer exploded")
+    main.score_resume = broken_scorer
+    output_path = os.path.join(tmp, "batch-unscored.jsonl")
+    exit_code = asyncio.run(
+        main.run_batch_pipeline_async(jd_dir, "templates/a.cshtml", "Jane_Doe", output_path, concurrency=2, use_cache=False)
+    )
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        records = {os.path.basename(record["jd"]): record for record in map(json.loads, f)}
+
+    assert exit_code == 1 and records["z-broken.txt"]["status"] == "failed"
+    for name in ("backend role.txt", "data.md"):
+        record = records[name]
+        assert record["status"] == "success" and record["pdfUrl"] and record["localScore"] is None, record
+    log_message(logger, "Scoring error logged, PDFs still generated", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Batch JD mode test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
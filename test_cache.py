@@ -0,0 +1,77 @@
+from utils.cache import ResponseCache, make_cache_key
+from utils.logger import setup_logger, log_step, log_message, LogType
+import os
+import shutil
+import tempfile
+import time
+
+logger = setup_logger()
+
+log_step(logger, 7, "Testing AI Response Cache")
+
+cache_dir = tempfile.mkdtemp(prefix="ai_cache_test_")
+
+try:
+    # Test 1: key canonicalisation
+    logger.info("\n--- Test 1: make_cache_key() ---")
+    key_a = make_cache_key("openai/gpt-4.1", "prompt", '{"b": 1, "a": [1, 2]}')
+    key_b = make_cache_key("openai/gpt-4.1", "prompt", {"a": [1, 2], "b": 1})
+    key_c = make_cache_key("openai/gpt-4o", "prompt", {"a": [1, 2], "b": 1})
+
+    assert key_a == key_b, "Equivalent payloads should share a key"
+    assert key_a != key_c, "Different models should not share a key"
+    log_message(logger, "Keys are stable across formatting and differ per model", LogType.SUCCESS)
+
+    # Test 2: miss, set, hit
+    logger.info("\n--- Test 2: get() / set() ---")
+    cache = ResponseCache(cache_dir, max_bytes=10 * 1024, max_age_seconds=3600)
+
+    assert cache.get(key_a) is None
+    cache.set(key_a, '{"name": "cached"}')
+    assert cache.get(key_a) == '{"name": "cached"}'
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+    log_message(logger, f"Stats after miss + hit: {cache.stats}", LogType.SUCCESS)
+
+    # Test 3: size-bounded LRU eviction
+    logger.info("\n--- Test 3: LRU eviction ---")
+    small_cache = ResponseCache(os.path.join(cache_dir, "small"), max_bytes=600, max_age_seconds=3600)
+    small_cache.set("first", "x" * 200)
+    time.sleep(0.01)
+    small_cache.set("second", "y" * 200)
+    time.sleep(0.01)
+    small_cache.get("first")
+    time.sleep(0.01)
+    small_cache.set("third", "z" * 200)
+
+    assert small_cache.get("first") is not None, "Recently used entry should survive"
+    assert small_cache.get("second") is None, "Least recently used entry should be evicted"
+    log_message(logger, f"Evictions: {small_cache.stats['evictions']}", LogType.SUCCESS)
+
+    # Test 4: age-bounded expiry
+    logger.info("\n--- Test 4: Expiry ---")
+    expiring_cache = ResponseCache(os.path.join(cache_dir, "expiring"), max_bytes=10 * 1024, max_age_seconds=0)
+    expiring_cache.set("stale", "{}")
+    time.sleep(0.01)
+    assert expiring_cache.get("stale") is None
+
+    # reading an entry keeps it in the LRU order but must not extend its lifetime
+    busy_cache = ResponseCache(os.path.join(cache_dir, "busy"), max_bytes=10 * 1024, max_age_seconds=0.3)
+    busy_cache.set("busy", "{}")
+    for _ in range(4):
+        time.sleep(0.1)
+        busy_cache.get("busy")
+    assert busy_cache.get("busy") is None, "Frequently read entry outlived its max age"
+    log_message(logger, "Expired entries are treated as misses, however often they were read", LogType.SUCCESS)
+
+    cache.log_stats()
+
+    log_message(logger, "AI response cache test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
+
+finally:
+    shutil.rmtree(cache_dir, ignore_errors=True)
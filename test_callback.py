@@ -0,0 +1,125 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import requests
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 21, "Testing Job Completion Callbacks")
+
+STATE = {"callbacks": True, "status_requests": 0}
+JOBS = {}
+LOCK = threading.Lock()
+
+def post_callback(url: str, job_id: str):
+    time.sleep(0.3)
+    requests.post(url, json={"jobId": job_id, "status": "success", "pdfUrl": f"/pdf/{job_id}.pdf"}, timeout=5)
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if self.path.endswith("/auth/login"):
+            return self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+
+        with LOCK:
+            job_id = f"job-{len(JOBS)}"
+            JOBS[job_id] = time.time()
+        if STATE["callbacks"] and payload.get("callbackUrl"):
+            threading.Thread(target=post_callback, args=(payload["callbackUrl"], job_id), daemon=True).start()
+        self._send({"data": {"jobId": job_id}})
+
+    def do_GET(self):
+        job_id = self.path.rsplit("/", 1)[-1]
+        with LOCK:
+            STATE["status_requests"] += 1
+        if time.time() - JOBS[job_id] >= 0.3:
+            return self._send({"status": "success", "pdfUrl": f"/pdf/{job_id}.pdf"})
+        self._send({"status": "processing"})
+
+    def log_message(self, *args):
+        pass
+
+async def render(generator_service, names: list, callback_timeout: float) -> dict:
+    from utils.callback_server import CallbackServer
+
+    server = CallbackServer()
+    server.start()
+    try:
+        tokens = {}
+        for name in names:
+            token = server.expect()
+            job_id = await generator_service.generate_resume_async({"name": "Jane"}, "templates/a.cshtml", name, server.callback_url(token))
+            tokens[job_id] = token
+
+        # callbacks for unknown jobs are turned away
+        unknown = await asyncio.to_thread(requests.post, f"{server.url}/not-a-token", json={"status": "success"}, timeout=5)
+        assert unknown.status_code == 404
+
+        results = {}
+        async for job_id, result in generator_service.wait_for_jobs_async(list(tokens), server, tokens, callback_timeout, max_attempts=10, interval=1):
+            results[job_id] = result
+        return results
+    finally:
+        server.stop()
+
+try:
+    api = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    type(settings).RESUME_API_BASE_URL = f"http://127.0.0.1:{api.server_port}/api"
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    type(settings).RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+
+    from services.auth_service import AuthService
+    from services.generator_service import GeneratorService
+
+    generator_service = GeneratorService(AuthService(background_refresh=False))
+
+    # Test 1: jobs resolve from callbacks without a single status request
+    logger.info("\n--- Test 1: Callbacks ---")
+    start = time.perf_counter()
+    results = asyncio.run(render(generator_service, ["Jane_a", "Jane_b"], callback_timeout=5))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 2 and all(result["status"] == "success" for result in results.values())
+    assert STATE["status_requests"] == 0, STATE["status_requests"]
+    assert elapsed < 2, f"Callbacks should resolve jobs right away, took {elapsed:.2f}s"
+    log_message(logger, f"2 jobs resolved by callback in {elapsed:.2f}s", LogType.SUCCESS)
+
+    # Test 2: a backend that never calls back is polled once the timeout passes
+    logger.info("\n--- Test 2: Fallback to polling ---")
+    STATE["callbacks"] = False
+    start = time.perf_counter()
+    results = asyncio.run(render(generator_service, ["Jane_c"], callback_timeout=0.5))
+    elapsed = time.perf_counter() - start
+
+    assert list(results.values())[0]["status"] == "success"
+    assert STATE["status_requests"] >= 1
+    assert elapsed >= 0.5
+    log_message(logger, f"Fell back to polling, done in {elapsed:.2f}s", LogType.SUCCESS)
+
+    api.shutdown()
+    log_message(logger, "Job callback test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,186 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 24, "Testing Concurrent Pipelines")
+
+RESUME = {"name": "Jane Doe", "summary": "Backend engineer", "skills": ["Python", "AWS"]}
+PIPELINES = 36
+STATE = {"in_flight": 0, "peak": 0, "ai": 0, "generated": 0}
+JOBS = {}
+LOCK = threading.Lock()
+
+class StubApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith("/api/resume/status/"):
+            job_id = self.path.rsplit("/", 1)[-1]
+            if time.time() - JOBS[job_id] >= 0.3:
+                return self._send({"status": "success", "pdfUrl": f"http://{self.headers['Host']}/pdf/{job_id}.pdf"})
+            return self._send({"status": "processing"})
+        if self.path == "/api/resume":
+            return self._send({"data": RESUME})
+        self._send({"ok": True})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.endswith("/auth/login"):
+            return self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+        if self.path.endswith("/resume/generate"):
+            with LOCK:
+                STATE["generated"] += 1
+                job_id = f"job-{STATE['generated']}"
+                JOBS[job_id] = time.time()
+            return self._send({"data": {"jobId": job_id}})
+
+        with LOCK:
+            STATE["ai"] += 1
+            STATE["in_flight"] += 1
+            STATE["peak"] = max(STATE["peak"], STATE["in_flight"])
+        try:
+            user = json.loads(body["messages"][-1]["content"])
+            output = dict(user["resume"], score=80) if "jd" in user else dict(user)
+            output["_issues"] = []
+            # long enough for every pipeline's AI call to be waiting here at once
+            time.sleep(1.0)
+        finally:
+            with LOCK:
+                STATE["in_flight"] -= 1
+        self._send({"choices": [{"message": {"content": json.dumps(output)}}]})
+
+    def log_message(self, *args):
+        pass
+
+class StubNotifications:
+    async def send_pipeline_start_notification_async(self, mode: str):
+        return True
+
+    async def send_success_notification_async(self, pdf_url: str, mode: str):
+        return True
+
+    async def send_failure_notification_async(self, error: str, mode: str):
+        return True
+
+    async def send_message_async(self, message: str, parse_mode: str = None):
+        return True
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    tmp = tempfile.mkdtemp()
+    settings_class = type(settings)
+    settings_class.RESUME_API_BASE_URL = f"{base}/api"
+    settings_class.OPENAI_BASE_URL = f"{base}/ai"
+    settings_class.AI_FALLBACK_MODELS = []
+    settings_class.AI_REQUESTS_PER_MINUTE = 0
+    for name in ("RESUME_API_USERNAME", "RESUME_API_PASSWORD", "GITHUB_PAT", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        setattr(settings_class, name, "test")
+    settings_class.AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    settings_class.RESUME_SNAPSHOT_PATH = os.path.join(tmp, "resume_snapshot.json")
+    settings_class.JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    settings_class.RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    settings_class.AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    settings_class.AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+    settings_class.POLL_INITIAL_INTERVAL_SECONDS = 0.1
+    settings_class.POLL_INTERVAL_SECONDS = 1
+    settings_class.ASYNC_WORKER_THREADS = 64
+
+    jd_dir = os.path.join(tmp, "jds")
+    os.makedirs(jd_dir)
+    for index in range(3):
+        with open(os.path.join(jd_dir, f"role_{index}.txt"), 'w', encoding='utf-8') as f:
+            f.write(f"Python engineer {index} with AWS")
+
+    import main
+    main.NotificationService = StubNotifications
+
+    class PoolDiscards(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.count = 0
+
+        def emit(self, record):
+            if "Connection pool is full" in record.getMessage():
+                self.count += 1
+
+    discards = PoolDiscards()
+    logging.getLogger("urllib3.connectionpool").addHandler(discards)
+
+    async def run_all():
+        pipelines = [
+            main.run_pipeline_async("generic", None, [("templates/a.cshtml", f"Jane_{index}")], use_cache=False)
+            for index in range(PIPELINES)
+        ]
+        # no job description, so this run fails while the others are still in flight
+        failing = main.run_pipeline_async("job-description", "no", [("templates/a.cshtml", "Jane_Broken")], use_cache=False)
+        batch = main.run_batch_pipeline_async(
+            jd_dir, "templates/a.cshtml", "Jane_Batch", os.path.join(tmp, "batch.jsonl"), concurrency=3, use_cache=False
+        )
+        return await asyncio.gather(*pipelines, failing, batch)
+
+    # Test 1: many pipelines and a batch share one event loop, a failed run doesn't stop the rest
+    logger.info("\n--- Test 1: Concurrent runs ---")
+    start = time.perf_counter()
+    statuses = main.run_async(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert statuses[:PIPELINES] == [0] * PIPELINES, statuses
+    assert statuses[PIPELINES] == 1 and statuses[-1] == 0, statuses
+
+    with open(os.path.join(tmp, "batch.jsonl"), 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 3 and all(record["status"] == "success" for record in records), records
+    assert STATE["generated"] == PIPELINES + 3, STATE
+    log_message(logger, f"{PIPELINES} pipelines and a 3-JD batch finished in {elapsed:.1f}s", LogType.SUCCESS)
+
+    # Test 2: blocking AI calls overlap beyond the default executor's thread cap
+    logger.info("\n--- Test 2: Worker threads ---")
+    default_cap = min(32, (os.cpu_count() or 1) + 4)
+    logger.info(f"Peak AI requests in flight: {STATE['peak']} (default executor: {default_cap} threads)")
+    assert STATE["peak"] > default_cap, STATE
+    log_message(logger, "AI calls from every pipeline ran at once", LogType.SUCCESS)
+
+    # Test 3: the shared pool holds a connection per worker thread, so none are thrown away
+    logger.info("\n--- Test 3: Connection reuse ---")
+    from utils.http_client import get_http_client
+    stats = get_http_client().connection_stats()[base]
+    logger.info(f"{stats['requests']} requests over {stats['connections']} connections")
+    assert discards.count == 0, f"{discards.count} connections discarded by a full pool"
+    assert stats["connections"] <= settings.ASYNC_WORKER_THREADS and stats["requests"] > 2 * stats["connections"], stats
+    log_message(logger, "Connections reused across pipelines", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Concurrent pipelines test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,154 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import tempfile
+import threading
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 32, "Testing Fused P1+P2 Fallback")
+
+RESUME = {"name": "Jane Doe", "summary": "Backend engineer", "skills": ["Python", "AWS"]}
+STATE = {"fused_reply": None, "passes": [], "generated": []}
+
+class StubApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith("/api/resume/status/"):
+            return self._send({"status": "success", "pdfUrl": f"http://{self.headers['Host']}/pdf/resume.pdf"})
+        if self.path == "/api/resume":
+            return self._send({"data": RESUME})
+        self._send({"ok": True})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.endswith("/auth/login"):
+            return self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+        if self.path.endswith("/resume/generate"):
+            STATE["generated"].append(body["resumeData"])
+            return self._send({"data": {"jobId": f"job-{len(STATE['generated'])}"}})
+
+        system = body["messages"][0]["content"]
+        user = json.loads(body["messages"][-1]["content"])
+        if system.startswith("Task: In a single pass"):
+            STATE["passes"].append("fused")
+            output = STATE["fused_reply"]
+        elif "jd" in user:
+            STATE["passes"].append("p2")
+            output = dict(user["resume"], score=65, _issues=[])
+        else:
+            STATE["passes"].append("p1")
+            output = dict(user, _issues=[])
+        self._send({"choices": [{"message": {"content": json.dumps(output)}}]})
+
+    def log_message(self, *args):
+        pass
+
+class StubNotifications:
+    async def send_pipeline_start_notification_async(self, mode: str):
+        return True
+
+    async def send_success_notification_async(self, pdf_url: str, mode: str):
+        return True
+
+    async def send_failure_notification_async(self, error: str, mode: str):
+        return True
+
+    async def send_message_async(self, message: str, parse_mode: str = None):
+        return True
+
+def run_fused(reply: dict) -> int:
+    STATE["fused_reply"] = reply
+    STATE["passes"].clear()
+    STATE["generated"].clear()
+    return asyncio.run(main.run_pipeline_async(
+        "job-description",
+        "Python engineer with AWS experience",
+        [("templates/a.cshtml", "Jane_Fused")],
+        use_cache=False,
+        fused=True,
+        hedge=False,
+        force_render=True
+    ))
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    tmp = tempfile.mkdtemp()
+    settings_class = type(settings)
+    settings_class.RESUME_API_BASE_URL = f"{base}/api"
+    settings_class.OPENAI_BASE_URL = f"{base}/ai"
+    settings_class.AI_FALLBACK_MODELS = []
+    settings_class.AI_REQUESTS_PER_MINUTE = 0
+    for name in ("RESUME_API_USERNAME", "RESUME_API_PASSWORD", "GITHUB_PAT", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        setattr(settings_class, name, "test")
+    settings_class.AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    settings_class.RESUME_SNAPSHOT_PATH = os.path.join(tmp, "resume_snapshot.json")
+    settings_class.JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    settings_class.RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    settings_class.AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    settings_class.AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+    settings_class.POLL_INITIAL_INTERVAL_SECONDS = 0.1
+
+    import main
+    main.NotificationService = StubNotifications
+
+    # Test 1: a valid fused reply is used as-is, no second pass
+    logger.info("\n--- Test 1: Valid fused reply ---")
+    status = run_fused({**RESUME, "summary": "Python backend engineer", "score": 88, "_issues": []})
+    assert status == 0 and STATE["passes"] == ["fused"], (status, STATE["passes"])
+    assert STATE["generated"][0]["score"] == 88 and STATE["generated"][0]["summary"] == "Python backend engineer"
+    log_message(logger, "One request, fused output rendered", LogType.SUCCESS)
+
+    # Test 2: a fused reply without a score falls back to P1 then P2
+    logger.info("\n--- Test 2: Missing score ---")
+    status = run_fused({**RESUME, "_issues": []})
+    assert status == 0 and STATE["passes"] == ["fused", "p1", "p2"], (status, STATE["passes"])
+    assert STATE["generated"][0]["score"] == 65
+    log_message(logger, "Fell back to two passes, P2 score rendered", LogType.SUCCESS)
+
+    # Test 3: extra top-level keys fail validation the same way
+    logger.info("\n--- Test 3: Extra keys ---")
+    status = run_fused({**RESUME, "score": 90, "notes": "tailored for AWS", "_issues": []})
+    assert status == 0 and STATE["passes"] == ["fused", "p1", "p2"], (status, STATE["passes"])
+    assert "notes" not in STATE["generated"][0]
+    log_message(logger, "Unexpected keys rejected, two-pass output rendered", LogType.SUCCESS)
+
+    # Test 4: the local ATS cross-check is advisory and can't fail the run
+    logger.info("\n--- Test 4: Local scoring failure ---")
+    def broken_scorer(resume, job_description):
+        raise ValueError("scorer exploded")
+    main.score_resume = broken_scorer
+    status = run_fused({**RESUME, "score": 88, "_issues": []})
+    assert status == 0 and len(STATE["generated"]) == 1, (status, STATE["generated"])
+    log_message(logger, "Scoring error logged, PDF still generated", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Fused P1+P2 test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
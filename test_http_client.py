@@ -0,0 +1,78 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import requests
+
+from utils.http_client import HttpClient
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 31, "Testing Shared HTTP Client")
+
+STATE = {"connections": set()}
+
+class StubServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        STATE["connections"].add(self.client_address)
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubServer)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    client = HttpClient(
+        pool_connections=2,
+        pool_maxsize=4,
+        connect_timeout=1,
+        timeouts={"default": 5, "poll": 0.2}
+    )
+
+    # Test 1: sequential calls share one keep-alive connection
+    logger.info("\n--- Test 1: Connection reuse ---")
+    for _ in range(5):
+        assert client.get(f"{base}/fast").json() == {"ok": True}
+    stats = client.connection_stats()[f"http://127.0.0.1:{server.server_port}"]
+    assert stats == {"requests": 5, "connections": 1}, stats
+    assert len(STATE["connections"]) == 1, STATE["connections"]
+    client.log_stats()
+    log_message(logger, "5 requests over 1 connection", LogType.SUCCESS)
+
+    # Test 2: each endpoint gets its own read timeout
+    logger.info("\n--- Test 2: Per-endpoint timeouts ---")
+    assert client.timeout_for("poll") == (1, 0.2)
+    assert client.timeout_for("ai") == (1, 5), "unknown endpoints fall back to the default"
+    assert client.get(f"{base}/slow").status_code == 200
+    start = time.perf_counter()
+    try:
+        client.get(f"{base}/slow", endpoint="poll")
+        raise AssertionError("poll timeout was not applied")
+    except requests.exceptions.ReadTimeout:
+        pass
+    assert time.perf_counter() - start < 0.45
+    assert client.requests_by_endpoint == {"default": 6, "poll": 1}, client.requests_by_endpoint
+    log_message(logger, "Poll requests time out after 0.2s, default ones wait", LogType.SUCCESS)
+
+    client.close()
+    server.shutdown()
+    log_message(logger, "Shared HTTP client test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
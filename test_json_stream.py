@@ -0,0 +1,73 @@
+from utils.json_stream import IncrementalJsonParser, JsonStreamError
+from utils.logger import setup_logger, log_step, log_message, LogType
+import json
+
+logger = setup_logger()
+
+log_step(logger, 8, "Testing Incremental JSON Parser")
+
+def feed_in_chunks(text: str, size: int = 7) -> IncrementalJsonParser:
+    parser = IncrementalJsonParser()
+    for i in range(0, len(text), size):
+        if parser.feed(text[i:i + size]):
+            break
+    return parser
+
+try:
+    document = {
+        "name": "Jane \"JD\" Doe",
+        "skills": ["Python", "C#", "SQL"],
+        "experience": [{"role": "Engineer", "years": 3.5, "current": True, "end": None}],
+        "unicode": "café – 50%"
+    }
+    raw = json.dumps(document)
+
+    # Test 1: plain document in small chunks
+    logger.info("\n--- Test 1: Chunked document ---")
+    parser = feed_in_chunks(raw)
+    assert parser.complete
+    assert json.loads(parser.close()) == document
+    log_message(logger, "Chunked document parsed and round-trips", LogType.SUCCESS)
+
+    # Test 2: fenced document, trailing fence ignored
+    logger.info("\n--- Test 2: Markdown fences ---")
+    parser = feed_in_chunks(f"```json\n{raw}\n```", size=3)
+    assert json.loads(parser.close()) == document
+    log_message(logger, "Fences stripped on the fly", LogType.SUCCESS)
+
+    # Test 3: early abort on structural errors
+    logger.info("\n--- Test 3: Early abort ---")
+    broken_inputs = [
+        '{"name": "x",, "skills": []}',
+        '{"name": "x"] ',
+        '{"name" "x"}',
+        '{"years": 01}',
+        '{"flag": tru }',
+        "{'single': 'quotes'}"
+    ]
+
+    for text in broken_inputs:
+        try:
+            feed_in_chunks(text + " " * 100 + "padding that never gets read")
+            log_message(logger, f"  ❌ Not rejected: {text}", LogType.ERROR)
+            raise AssertionError(f"Parser accepted invalid JSON: {text}")
+        except JsonStreamError as e:
+            assert e.position <= len(text), "Error should be raised before the padding"
+            logger.info(f"  ✅ {text!r} -> {e}")
+
+    # Test 4: truncated stream
+    logger.info("\n--- Test 4: Truncated stream ---")
+    parser = feed_in_chunks(raw[:-5])
+    try:
+        parser.close()
+        raise AssertionError("Truncated stream should not close cleanly")
+    except JsonStreamError as e:
+        log_message(logger, f"Truncated stream rejected: {e}", LogType.SUCCESS)
+
+    log_message(logger, "Incremental JSON parser test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
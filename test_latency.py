@@ -0,0 +1,41 @@
+from utils.latency import LatencyTracker, percentile
+from utils.logger import setup_logger, log_step, log_message, LogType
+import os
+import tempfile
+
+logger = setup_logger()
+
+log_step(logger, 11, "Testing AI Latency Tracker")
+
+try:
+    # Test 1: nearest-rank percentile
+    logger.info("\n--- Test 1: percentile() ---")
+    samples = [float(n) for n in range(1, 11)]
+    assert percentile(samples, 50) == 5.0
+    assert percentile(samples, 90) == 9.0
+    assert percentile(samples, 100) == 10.0
+    assert percentile([], 90) is None
+    log_message(logger, "p50/p90/p100 of 1..10 = 5/9/10", LogType.SUCCESS)
+
+    # Test 2: history persists per model and is capped
+    logger.info("\n--- Test 2: LatencyTracker ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "latency.json")
+        tracker = LatencyTracker(path, max_samples=5)
+        for seconds in range(1, 9):
+            tracker.record("primary", seconds)
+        tracker.record("backup", 0.5)
+
+        reloaded = LatencyTracker(path, max_samples=5)
+        assert reloaded.samples["primary"] == [4, 5, 6, 7, 8], reloaded.samples
+        assert reloaded.percentile("primary", 90) == 8
+        assert reloaded.percentile("backup", 90, min_samples=5) is None, "Too few samples should not set a threshold"
+        log_message(logger, "History reloaded and trimmed to the newest samples", LogType.SUCCESS)
+
+    log_message(logger, "AI latency tracker test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,49 @@
+from utils.latex import escape_latex_specials
+from utils.logger import setup_logger, log_step, log_message, LogType
+import copy
+
+logger = setup_logger()
+
+log_step(logger, 29, "Testing LaTeX Escaping")
+
+try:
+    # Test 1: specials in strings are escaped, already-escaped ones are left alone
+    logger.info("\n--- Test 1: Strings ---")
+    assert escape_latex_specials("Cut latency 40% on #1 service") == "Cut latency 40\\% on \\#1 service"
+    assert escape_latex_specials("Already 40\\% and #2") == "Already 40\\% and \\#2"
+    assert escape_latex_specials(escape_latex_specials("C# at 50%")) == "C\\# at 50\\%", "escaping twice must be harmless"
+    log_message(logger, "% and # escaped once", LogType.SUCCESS)
+
+    # Test 2: keys are never rewritten, only values
+    logger.info("\n--- Test 2: Keys ---")
+    escaped = escape_latex_specials({"skills": {"C#": ["ASP.NET"], "100%": "F#"}})
+    assert list(escaped["skills"]) == ["C#", "100%"], escaped
+    assert escaped["skills"]["100%"] == "F\\#"
+    log_message(logger, "Keys with # and % kept as-is", LogType.SUCCESS)
+
+    # Test 3: nested lists and non-string values
+    logger.info("\n--- Test 3: Nesting and non-strings ---")
+    resume = {
+        "experience": [
+            {"bullets": ["Grew revenue 20%", ["#nested", 3]], "current": True, "team": None, "years": 2.5}
+        ],
+        "score": 87
+    }
+    original = copy.deepcopy(resume)
+    escaped = escape_latex_specials(resume)
+    assert escaped == {
+        "experience": [
+            {"bullets": ["Grew revenue 20\\%", ["\\#nested", 3]], "current": True, "team": None, "years": 2.5}
+        ],
+        "score": 87
+    }, escaped
+    assert resume == original, "Escaping must not mutate the input"
+    log_message(logger, "Nested lists escaped, numbers, booleans and nulls untouched", LogType.SUCCESS)
+
+    log_message(logger, "LaTeX escaping test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
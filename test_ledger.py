@@ -0,0 +1,47 @@
+from utils.ledger import Ledger, load_ledger, summarise, format_report
+from utils.logger import setup_logger, log_step, log_message, LogType
+import os
+import tempfile
+
+logger = setup_logger()
+
+log_step(logger, 14, "Testing AI Usage Ledger")
+
+try:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.jsonl")
+
+        # Test 1: entries are appended per run
+        logger.info("\n--- Test 1: Ledger.record() ---")
+        first = Ledger(path, run_id="run-1")
+        for wall in (1.0, 2.0, 3.0, 4.0):
+            first.record({"pass": "AI P1", "status": "ok", "wall_seconds": wall, "ttfb_seconds": wall / 2,
+                          "prompt_tokens": 100, "completion_tokens": 80, "cost": 0.001})
+        first.record({"pass": "AI P1", "status": "ok", "cache_hit": True, "wall_seconds": 0.0})
+
+        second = Ledger(path, run_id="run-2")
+        second.record({"pass": "AI P2", "status": "error", "wall_seconds": 10.0})
+
+        assert len(load_ledger(path)) == 6
+        assert {entry["run"] for entry in load_ledger(path, last_runs=1)} == {"run-2"}
+        log_message(logger, "Ledger persisted and filtered by run", LogType.SUCCESS)
+
+        # Test 2: per-pass percentiles exclude cache hits
+        logger.info("\n--- Test 2: summarise() ---")
+        summary = summarise(load_ledger(path))
+        p1 = summary["AI P1"]
+        assert p1["calls"] == 4 and p1["cache_hits"] == 1
+        assert p1["wall_p50"] == 2.0 and p1["wall_p95"] == 4.0
+        assert p1["prompt_tokens"] == 400 and p1["completion_tokens"] == 320
+        assert summary["AI P2"]["errors"] == 1
+        for line in format_report(load_ledger(path)):
+            logger.info(line)
+        log_message(logger, "p50/p95 latency and token totals per pass", LogType.SUCCESS)
+
+    log_message(logger, "AI usage ledger test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
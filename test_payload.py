@@ -0,0 +1,132 @@
+from utils.payload import compact_payload, rehydrate_payload, minify_json, estimate_tokens
+from utils.logger import setup_logger, log_step, log_message, LogType
+import copy
+import json
+
+logger = setup_logger()
+
+log_step(logger, 9, "Testing Payload Compaction")
+
+try:
+    resume = {
+        "_id": "65f0c1",
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "summary": "Backend engineer",
+        "website": "https://jane.dev",
+        "experience": [
+            {
+                "role": "Engineer",
+                "startDate": "2020-01",
+                "endDate": None,
+                "bullets": ["Built APIs", "Cut latency 40%"],
+                "links": []
+            }
+        ],
+        "certifications": [],
+        "projects": [{"name": "Thing", "repo": "https://github.com/jane/thing", "description": "Made a thing"}]
+    }
+    original = copy.deepcopy(resume)
+
+    # Test 1: compaction strips empties and masked fields
+    logger.info("\n--- Test 1: compact_payload() ---")
+    compact, removed = compact_payload(resume)
+    sent = minify_json(compact)
+    logger.info(f"  Sent: {sent}")
+
+    for field in ("_id", "email", "website", "certifications", "startDate", "links", "github.com"):
+        assert field not in sent, f"{field} should not be sent to the model"
+    assert compact["experience"][0]["endDate"] is None, "null dates are sent so the model leaves those entries alone"
+    assert resume == original, "Compaction must not mutate the input"
+    log_message(logger, f"{len(removed)} fields masked", LogType.SUCCESS)
+
+    # Test 2: token estimate shrinks
+    logger.info("\n--- Test 2: estimate_tokens() ---")
+    before = estimate_tokens(json.dumps(resume))
+    after = estimate_tokens(sent)
+    assert after < before
+    log_message(logger, f"~{before} -> ~{after} tokens", LogType.SUCCESS)
+
+    # Test 3: rehydration restores masked fields and key order
+    logger.info("\n--- Test 3: rehydrate_payload() ---")
+    response = json.loads(sent)
+    response["summary"] = "Backend engineer focused on APIs"
+    response["_issues"] = []
+    restored = rehydrate_payload(response, removed, resume)
+
+    expected = copy.deepcopy(original)
+    expected["summary"] = "Backend engineer focused on APIs"
+    expected["_issues"] = []
+    assert restored == expected
+    assert list(restored.keys()) == list(expected.keys()), "Key order should match the source"
+    assert list(restored["experience"][0].keys()) == list(original["experience"][0].keys())
+    log_message(logger, "Masked fields restored in source order", LogType.SUCCESS)
+
+    # Test 4: structure changed by the model
+    logger.info("\n--- Test 4: Structural drift ---")
+    drifted = json.loads(sent)
+    drifted["experience"] = []
+    restored = rehydrate_payload(drifted, removed, resume)
+    assert restored["email"] == "jane@example.com"
+    log_message(logger, "Unreachable fields skipped, top-level fields still restored", LogType.SUCCESS)
+
+    # Test 5: model-owned fields survive a second pass
+    logger.info("\n--- Test 5: P2 issues and score ---")
+    p1_output = {**copy.deepcopy(original), "_issues": [], "score": None}
+    compact, removed = compact_payload(p1_output)
+    assert compact["_issues"] == [] and "score" in compact, "_issues and score should be sent as-is"
+    assert not any(path[0] in ("_issues", "score") for path, _ in removed)
+
+    response = json.loads(minify_json(compact))
+    response["_issues"] = ["missing dates"]
+    response["score"] = 82
+    response["email"] = "jane.doe@example.com"
+    restored = rehydrate_payload(response, removed, p1_output)
+    assert restored["_issues"] == ["missing dates"], restored["_issues"]
+    assert restored["score"] == 82
+    assert restored["email"] == "jane@example.com", "Masked fields the model returned must be restored"
+    assert restored["website"] == "https://jane.dev"
+    log_message(logger, "Model issues and score kept, masked fields restored", LogType.SUCCESS)
+
+    # Test 6: keys are masked on whole words, not substrings
+    logger.info("\n--- Test 6: Masked keys ---")
+    entry = {
+        "candidateSummary": "Led the platform team",
+        "validated": "Validated designs with users",
+        "paid": "Paid internship",
+        "startDate": "2020-01",
+        "github_url": "https://github.com/jane",
+        "linkedIn": "jane-doe",
+        "userId": "u1"
+    }
+    compact, removed = compact_payload(entry)
+    assert list(compact) == ["candidateSummary", "validated", "paid"], compact
+    assert sorted(path[0] for path, _ in removed) == ["github_url", "linkedIn", "startDate", "userId"], removed
+    log_message(logger, "Prose fields sent, date/url/id fields masked", LogType.SUCCESS)
+
+    # Test 7: the model can't overwrite masked values or invent containers
+    logger.info("\n--- Test 7: Restore contract ---")
+    compact, removed = compact_payload(original)
+    response = json.loads(minify_json(compact))
+    response["experience"][0]["startDate"] = "2099"
+    restored = rehydrate_payload(response, removed, original)
+    assert restored["experience"][0]["startDate"] == "2020-01", restored["experience"][0]
+    assert restored["experience"][0]["endDate"] is None
+
+    dropped = json.loads(minify_json(compact))
+    del dropped["experience"]
+    restored = rehydrate_payload(dropped, removed, original)
+    assert "experience" not in restored, restored
+    dropped = json.loads(minify_json(compact))
+    dropped["experience"] = {"role": "Engineer"}
+    restored = rehydrate_payload(dropped, removed, original)
+    assert restored["experience"] == {"role": "Engineer"}, restored["experience"]
+    log_message(logger, "Hallucinated dates replaced, dropped containers left alone", LogType.SUCCESS)
+
+    log_message(logger, "Payload compaction test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
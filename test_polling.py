@@ -0,0 +1,160 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import settings
+from utils.polling import PollSchedule, completion_time, parse_delay_hint, poll_hint
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 20, "Testing Adaptive Polling")
+
+JOB_SECONDS = {"slow": 1.5, "medium": 1.0}
+JOBS = {}
+LOCK = threading.Lock()
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, body: dict, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if self.path.endswith("/auth/login"):
+            self.rfile.read(length)
+            return self._send({"token": {"accessToken": "token", "expiresIn": 3600}})
+
+        payload = json.loads(self.rfile.read(length))
+        with LOCK:
+            job_id = f"job-{len(JOBS)}"
+            JOBS[job_id] = {"started": time.time(), "polls": 0, "seconds": JOB_SECONDS.get(payload["resumeName"], 0.6)}
+        self._send({"data": {"jobId": job_id}})
+
+    def do_GET(self):
+        job_id = self.path.rsplit("/", 1)[-1]
+        with LOCK:
+            job = JOBS[job_id]
+            job["polls"] += 1
+        done_at = job["started"] + job["seconds"]
+        if time.time() >= done_at:
+            return self._send({"status": "success", "pdfUrl": f"/pdf/{job_id}.pdf", "completedAt": done_at})
+        self._send({"status": "processing", "etaSeconds": round(done_at - time.time(), 3)})
+
+    def log_message(self, *args):
+        pass
+
+try:
+    # Test 1: backoff grows, is capped and stays within the jitter band
+    logger.info("\n--- Test 1: Backoff schedule ---")
+    schedule = PollSchedule(initial=1, maximum=10, multiplier=2, jitter=0.2, rng=random.Random(7))
+    delays = [schedule.next_delay() for _ in range(6)]
+    for delay, base in zip(delays, [1, 2, 4, 8, 10, 10]):
+        assert base * 0.8 <= delay <= min(10, base * 1.2), (delay, base)
+    log_message(logger, f"Delays: {', '.join(f'{delay:.2f}' for delay in delays)}", LogType.SUCCESS)
+
+    # Test 2: server hints win, within [initial, maximum]
+    logger.info("\n--- Test 2: Hints ---")
+    assert 5 <= schedule.next_delay(hint=5) <= 6
+    assert schedule.next_delay(hint=0.01) >= 1
+    assert schedule.next_delay(hint=500) == 10
+    assert parse_delay_hint("7") == 7
+    assert 55 <= parse_delay_hint(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_delay_hint("soon") is None
+    assert poll_hint(CaseInsensitiveDict({"Retry-After": "3"}), {"etaSeconds": 9}) == 3
+    assert poll_hint(CaseInsensitiveDict({"Retry-After-Ms": "1500"}), None) == 1.5
+    assert poll_hint({}, {"etaSeconds": 9}) == 9
+    assert completion_time({"completedAt": "2026-01-01T00:00:00Z"}) == 1767225600
+    assert completion_time({"completedAt": 1767225600000}) == 1767225600
+    log_message(logger, "Retry-After, ETA and completion timestamps parsed", LogType.SUCCESS)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    type(settings).RESUME_API_BASE_URL = f"http://127.0.0.1:{server.server_port}/api"
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    type(settings).RENDER_INDEX_PATH = os.path.join(tmp, "render_index.json")
+    type(settings).POLL_INITIAL_INTERVAL_SECONDS = 0.1
+
+    from services.auth_service import AuthService
+    from services.generator_service import GeneratorService
+
+    generator_service = GeneratorService(AuthService(background_refresh=False))
+
+    # Test 3: a short job is detected shortly after it finishes, not a full interval later
+    logger.info("\n--- Test 3: Overshoot ---")
+    job_id = generator_service.generate_resume({"name": "Jane"}, "templates/a.cshtml", "Jane")
+    start = time.perf_counter()
+    result = generator_service.poll_job_status(job_id, max_attempts=10, interval=30)
+    elapsed = time.perf_counter() - start
+
+    assert result["status"] == "success"
+    assert elapsed < 2, f"Should not wait a full interval, took {elapsed:.2f}s"
+    overshoot = generator_service.poll_stats["overshoot"][-1]
+    assert 0 <= overshoot < 0.5, overshoot
+    log_message(logger, f"Detected after {elapsed:.2f}s, overshoot {overshoot:.2f}s", LogType.SUCCESS)
+
+    # Test 4: once enough durations are known, the first poll lands near completion
+    logger.info("\n--- Test 4: Learned prior ---")
+    for _ in range(2):
+        job_id = generator_service.generate_resume({"name": "Jane"}, "templates/a.cshtml", "Jane")
+        generator_service.poll_job_status(job_id, max_attempts=10, interval=30)
+
+    job_id = generator_service.generate_resume({"name": "Jane"}, "templates/a.cshtml", "Jane")
+    generator_service.poll_job_status(job_id, max_attempts=10, interval=30)
+    assert JOBS[job_id]["polls"] <= 2, JOBS[job_id]["polls"]
+    generator_service.log_poll_stats()
+    log_message(logger, f"Job with a prior needed {JOBS[job_id]['polls']} polls", LogType.SUCCESS)
+
+    # Test 5: the time budget still bounds the wait
+    logger.info("\n--- Test 5: Timeout ---")
+    type(settings).POLL_PRIOR_MIN_SAMPLES = 100
+    job_id = generator_service.generate_resume({"name": "Jane"}, "templates/b.cshtml", "Jane")
+    try:
+        generator_service.poll_job_status(job_id, max_attempts=2, interval=0.1)
+        raise AssertionError("Expected a timeout")
+    except TimeoutError as e:
+        assert "did not complete" in str(e)
+    log_message(logger, "Poll budget enforced", LogType.SUCCESS)
+
+    # Test 6: one poller for several jobs finishes with the slowest, yielding each as it lands
+    logger.info("\n--- Test 6: Multiplexed polling ---")
+    job_ids = [
+        generator_service.generate_resume({"name": "Jane"}, f"templates/{name}.cshtml", name)
+        for name in ("slow", "fast", "medium")
+    ]
+
+    async def poll_all() -> list:
+        return [job_id async for job_id, _ in generator_service.poll_jobs_async(job_ids, max_attempts=10, interval=30)]
+
+    start = time.perf_counter()
+    order = asyncio.run(poll_all())
+    elapsed = time.perf_counter() - start
+
+    assert order == [job_ids[1], job_ids[2], job_ids[0]], order
+    assert elapsed < 2.2, f"Should take about as long as the slowest job, took {elapsed:.2f}s"
+    log_message(logger, f"3 jobs polled together in {elapsed:.2f}s", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Adaptive polling test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
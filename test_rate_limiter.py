@@ -0,0 +1,70 @@
+from utils.rate_limiter import RateLimiter, backoff_delay, parse_duration, parse_retry_after
+from utils.logger import setup_logger, log_step, log_message, LogType
+import time
+
+logger = setup_logger()
+
+log_step(logger, 10, "Testing AI Rate Limiter")
+
+try:
+    # Test 1: duration parsing
+    logger.info("\n--- Test 1: parse_duration() ---")
+    durations = [
+        ("12", 12.0),
+        ("1.5", 1.5),
+        ("250ms", 0.25),
+        ("6m0s", 360.0),
+        ("1h2m3s", 3723.0),
+        ("soon", None)
+    ]
+
+    for value, expected in durations:
+        result = parse_duration(value)
+        status = "✅" if result == expected else "❌"
+        logger.info(f"  {status} parse_duration('{value}') = {result}")
+        assert result == expected
+
+    # Test 2: retry hints
+    logger.info("\n--- Test 2: parse_retry_after() ---")
+    assert parse_retry_after({"retry-after": "7"}) == 7.0
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"x-ratelimit-reset-requests": "2s", "x-ratelimit-reset-tokens": "30s"}) == 30.0
+    assert parse_retry_after({}) is None
+    log_message(logger, "Retry-After and x-ratelimit-reset-* honoured", LogType.SUCCESS)
+
+    # Test 3: jittered exponential backoff stays within its cap
+    logger.info("\n--- Test 3: backoff_delay() ---")
+    for attempt in range(1, 8):
+        delay = backoff_delay(attempt, base_seconds=1, max_seconds=10)
+        assert 0 <= delay <= min(10, 2 ** (attempt - 1))
+        logger.info(f"  attempt {attempt}: {delay:.2f}s")
+
+    # Test 4: token bucket throttles once the burst is spent
+    logger.info("\n--- Test 4: Token bucket ---")
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600)
+    assert limiter.acquire(600) == 0, "Full bucket should not wait"
+
+    start = time.monotonic()
+    limiter.acquire(5)
+    waited = time.monotonic() - start
+    assert 0.3 < waited < 1.5, f"Expected ~0.5s wait, got {waited:.2f}s"
+    log_message(logger, f"Throttled for {waited:.2f}s after burst", LogType.SUCCESS)
+
+    # Test 5: server-requested pause applies to every caller
+    logger.info("\n--- Test 5: Pause from headers ---")
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+    limiter.update_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "300ms"})
+
+    start = time.monotonic()
+    limiter.acquire()
+    waited = time.monotonic() - start
+    assert waited >= 0.25, f"Expected to wait out the reset window, waited {waited:.2f}s"
+    limiter.log_stats()
+
+    log_message(logger, "AI rate limiter test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
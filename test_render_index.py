@@ -0,0 +1,109 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 22, "Testing Render Dedup Index")
+
+PDFS = {"/pdf/live.pdf", "/pdf/no-head.pdf"}
+STATE = {"generated": 0}
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, code: int, body: dict = None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_HEAD(self):
+        if self.path == "/pdf/no-head.pdf":
+            return self._send(405)
+        self._send(200 if self.path in PDFS else 404)
+
+    def do_GET(self):
+        if self.path.startswith("/pdf/"):
+            return self._send(206 if self.path in PDFS else 404, {})
+        self._send(200, {"status": "success", "pdfUrl": f"http://127.0.0.1:{self.server.server_port}/pdf/live.pdf"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/auth/login"):
+            return self._send(200, {"token": {"accessToken": "token", "expiresIn": 3600}})
+        STATE["generated"] += 1
+        self._send(200, {"data": {"jobId": f"job-{STATE['generated']}"}})
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    tmp = tempfile.mkdtemp()
+    type(settings).RESUME_API_BASE_URL = f"{base}/api"
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).JOB_DURATION_HISTORY_PATH = os.path.join(tmp, "job_durations.json")
+    type(settings).POLL_INITIAL_INTERVAL_SECONDS = 0.1
+
+    from services.auth_service import AuthService
+    from services.generator_service import GeneratorService
+    from utils.render_index import RenderIndex
+
+    index_path = os.path.join(tmp, "render_index.json")
+    generator_service = GeneratorService(AuthService(background_refresh=False), render_index=RenderIndex(index_path, ttl_seconds=3600))
+    resume = {"name": "Jane", "skills": ["python"]}
+
+    # Test 1: a finished render is indexed and reused for the identical payload
+    logger.info("\n--- Test 1: Reuse ---")
+    assert generator_service.find_rendered(resume, "templates/a.cshtml", "Jane") is None
+    job_id = generator_service.generate_resume(resume, "templates/a.cshtml", "Jane")
+    generator_service.poll_job_status(job_id, max_attempts=5, interval=1)
+
+    reused = generator_service.find_rendered(dict(resume), "templates/a.cshtml", "Jane")
+    assert reused and reused["pdfUrl"].endswith("/pdf/live.pdf") and reused["jobId"] == job_id
+    assert RenderIndex(index_path, ttl_seconds=3600).get(list(generator_service.render_index.entries)[0])
+    log_message(logger, "Identical render reused, index persisted", LogType.SUCCESS)
+
+    # Test 2: any change to data, template or name is a different render
+    logger.info("\n--- Test 2: Different payloads ---")
+    assert generator_service.find_rendered({**resume, "name": "Janet"}, "templates/a.cshtml", "Jane") is None
+    assert generator_service.find_rendered(resume, "templates/b.cshtml", "Jane") is None
+    assert generator_service.find_rendered(resume, "templates/a.cshtml", "Jane_2") is None
+    log_message(logger, "Changed payloads miss the index", LogType.SUCCESS)
+
+    # Test 3: a PDF that has disappeared is dropped from the index
+    logger.info("\n--- Test 3: Validity check ---")
+    key = list(generator_service.render_index.entries)[0]
+    entry = generator_service.render_index.entries[key]
+    entry["pdfUrl"] = f"{base}/pdf/gone.pdf"
+    assert generator_service.find_rendered(resume, "templates/a.cshtml", "Jane") is None
+    assert key not in generator_service.render_index.entries
+
+    generator_service.render_index.put(key, f"{base}/pdf/no-head.pdf", "job-x", "templates/a.cshtml", "Jane")
+    assert generator_service.find_rendered(resume, "templates/a.cshtml", "Jane") is not None
+    log_message(logger, "Missing PDFs invalidated, HEAD-less storage handled", LogType.SUCCESS)
+
+    # Test 4: entries expire after the TTL
+    logger.info("\n--- Test 4: TTL ---")
+    generator_service.render_index.entries[key]["renderedAt"] = time.time() - 7200
+    assert generator_service.find_rendered(resume, "templates/a.cshtml", "Jane") is None
+    generator_service.render_index.log_stats()
+    log_message(logger, "Expired entries ignored", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Render dedup index test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
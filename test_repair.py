@@ -0,0 +1,106 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 30, "Testing Structured Output Repair")
+
+RESUME = {"name": "Jane Doe", "summary": "Backend engineer", "skills": ["Python", "AWS"]}
+REPLIES = []
+REQUESTS = []
+
+class StubAi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        REQUESTS.append({"system": body["messages"][0]["content"], "user": json.loads(body["messages"][-1]["content"])})
+        content = REPLIES.pop(0)
+
+        if body.get("stream"):
+            # the reply is cut into deltas and the stream simply ends, however much JSON was sent
+            events = [
+                {"choices": [{"delta": {"content": content[i:i + 8]}}]}
+                for i in range(0, len(content), 8)
+            ]
+            data = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+            content_type = "text/event-stream"
+        else:
+            data = json.dumps({"choices": [{"message": {"content": content}}]})
+            content_type = "application/json"
+
+        data = data.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    settings_class = type(settings)
+    settings_class.OPENAI_BASE_URL = f"http://127.0.0.1:{server.server_port}/ai"
+    settings_class.AI_FALLBACK_MODELS = []
+    settings_class.AI_REQUESTS_PER_MINUTE = 0
+    settings_class.GITHUB_PAT = "test"
+    settings_class.AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    settings_class.AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+
+    from services.ai_service import AiService
+
+    # Test 1: a missing score is repaired against the whole resume, not an empty fragment
+    logger.info("\n--- Test 1: Re-scoring ---")
+    REPLIES[:] = [json.dumps({**RESUME, "_issues": []}), json.dumps({"score": 74, "_issues": []})]
+    REQUESTS.clear()
+    result = AiService(structured=True).optimise_with_jd(RESUME, "Python engineer")
+    assert result["score"] == 74 and result["summary"] == RESUME["summary"], result
+    assert len(REQUESTS) == 2 and "Repair:" in REQUESTS[1]["system"], REQUESTS
+    assert REQUESTS[1]["user"]["resume"] == RESUME, REQUESTS[1]["user"]
+    log_message(logger, "Score repaired with the full resume attached", LogType.SUCCESS)
+
+    # Test 2: a truncated stream is salvaged and only the missing fields are re-asked
+    logger.info("\n--- Test 2: Truncated stream ---")
+    REPLIES[:] = [
+        '{"name": "Jane Doe", "summary": "Backend engineer building APIs", "skills": ["Pyth',
+        json.dumps({"skills": ["Python", "AWS", "Docker"], "_issues": []})
+    ]
+    REQUESTS.clear()
+    result = AiService(stream=True, structured=True).optimise_generic(RESUME)
+    assert result["summary"] == "Backend engineer building APIs", result
+    assert result["skills"] == ["Python", "AWS", "Docker"], result
+    assert len(REQUESTS) == 2 and REQUESTS[1]["user"] == {"skills": RESUME["skills"]}, REQUESTS
+    log_message(logger, "Truncated stream salvaged, one field repaired", LogType.SUCCESS)
+
+    # Test 3: a stream that turns into invalid JSON goes through the same repair
+    logger.info("\n--- Test 3: Malformed stream ---")
+    REPLIES[:] = [
+        '{"name": "Jane Doe" "summary": "Backend engineer"}',
+        json.dumps({"summary": "Backend engineer", "skills": ["Python", "AWS"], "_issues": []})
+    ]
+    REQUESTS.clear()
+    result = AiService(stream=True, structured=True).optimise_generic(RESUME)
+    assert result == {**RESUME, "_issues": []}, result
+    assert sorted(REQUESTS[1]["user"]) == ["skills", "summary"], REQUESTS
+    log_message(logger, "Malformed stream salvaged and repaired", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Structured output repair test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
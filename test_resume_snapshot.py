@@ -0,0 +1,126 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 19, "Testing Conditional Resume Fetch")
+
+STATE = {"resume": {"name": "Jane", "skills": ["python"]}, "version": 1, "gets": 0, "not_modified": 0, "validators": True}
+LOCK = threading.Lock()
+
+class StubApi(BaseHTTPRequestHandler):
+    def _send(self, code: int, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(200, {"token": {"accessToken": "token", "expiresIn": 3600}})
+
+    def do_GET(self):
+        with LOCK:
+            STATE["gets"] += 1
+            etag = f'"v{STATE["version"]}"'
+            if STATE["validators"] and self.headers.get("If-None-Match") == etag:
+                STATE["not_modified"] += 1
+                return self._send(304, headers={"ETag": etag})
+            headers = {"ETag": etag} if STATE["validators"] else {}
+            self._send(200, {"data": STATE["resume"]}, headers)
+
+    def log_message(self, *args):
+        pass
+
+try:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    type(settings).RESUME_API_BASE_URL = f"http://127.0.0.1:{server.server_port}/api"
+    type(settings).AUTH_TOKEN_CACHE_PATH = os.path.join(tmp, "auth_token.json")
+    type(settings).RESUME_SNAPSHOT_PATH = os.path.join(tmp, "resume_snapshot.json")
+
+    from services.auth_service import AuthService
+    from services.resume_service import ResumeService
+    from utils.resume_snapshot import ResumeSnapshot
+
+    auth_service = AuthService(background_refresh=False)
+    resume_service = ResumeService(auth_service)
+
+    # Test 1: first fetch downloads and snapshots the resume with its ETag
+    logger.info("\n--- Test 1: Initial fetch ---")
+    data = resume_service.fetch_resume_data()
+    assert data == STATE["resume"]
+    entry = resume_service.snapshot.load()
+    assert entry["etag"] == '"v1"' and entry["data"] == data
+    log_message(logger, "Snapshot saved with ETag", LogType.SUCCESS)
+
+    # Test 2: unchanged resume comes back as 304 and is served from the snapshot
+    logger.info("\n--- Test 2: Conditional fetch ---")
+    data = resume_service.fetch_resume_data()
+    assert data == STATE["resume"]
+    assert STATE["not_modified"] == 1
+    log_message(logger, "304 served from snapshot", LogType.SUCCESS)
+
+    # Test 3: a changed resume replaces the snapshot
+    logger.info("\n--- Test 3: Changed resume ---")
+    with LOCK:
+        STATE["resume"] = {"name": "Jane", "skills": ["python", "go"]}
+        STATE["version"] = 2
+    data = resume_service.fetch_resume_data()
+    assert data["skills"] == ["python", "go"]
+    assert resume_service.snapshot.load()["etag"] == '"v2"'
+    log_message(logger, "Snapshot updated after change", LogType.SUCCESS)
+
+    # Test 4: without validators the content hash spares the rewrite
+    logger.info("\n--- Test 4: No validators ---")
+    with LOCK:
+        STATE["validators"] = False
+    resume_service.fetch_resume_data()
+    saved_at = resume_service.snapshot.load()["savedAt"]
+    resume_service.fetch_resume_data()
+    assert resume_service.snapshot.load()["savedAt"] == saved_at
+    log_message(logger, "Unchanged body detected by content hash", LogType.SUCCESS)
+
+    # Test 5: offline mode never touches the API
+    logger.info("\n--- Test 5: Offline ---")
+    gets = STATE["gets"]
+    data = ResumeService().load_offline_resume_data()
+    assert data["skills"] == ["python", "go"]
+
+    resume_file = os.path.join(tmp, "resume.json")
+    with open(resume_file, "w") as f:
+        json.dump({"data": {"name": "Offline"}}, f)
+    assert ResumeService().load_offline_resume_data(resume_file) == {"name": "Offline"}
+    assert STATE["gets"] == gets
+    log_message(logger, "Offline fetches served locally", LogType.SUCCESS)
+
+    # Test 6: snapshots from another account are ignored
+    logger.info("\n--- Test 6: Snapshot identity ---")
+    other = ResumeService(snapshot=ResumeSnapshot(settings.RESUME_SNAPSHOT_PATH, "someone-else"))
+    try:
+        other.load_offline_resume_data()
+        raise AssertionError("Expected the foreign snapshot to be ignored")
+    except FileNotFoundError:
+        pass
+    log_message(logger, "Foreign snapshot ignored", LogType.SUCCESS)
+
+    server.shutdown()
+    log_message(logger, "Conditional resume fetch test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from utils.scheduler import StageScheduler
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 18, "Testing Stage Scheduler")
+
+def sleeper(seconds: float, value=None):
+    async def stage(results: dict):
+        await asyncio.sleep(seconds)
+        return value
+    return stage
+
+def build(serial: bool = False) -> StageScheduler:
+    # a -> c, b -> c: a and b are independent
+    scheduler = StageScheduler(serial=serial)
+    scheduler.add("a", sleeper(0.2, 1))
+    scheduler.add("b", sleeper(0.3, 2))
+
+    async def join(results: dict):
+        await asyncio.sleep(0.1)
+        return results["a"] + results["b"]
+
+    scheduler.add("c", join, deps=["a", "b"])
+    return scheduler
+
+try:
+    # Test 1: independent stages overlap, dependents see their inputs
+    logger.info("\n--- Test 1: Concurrent run ---")
+    scheduler = build()
+    start = time.perf_counter()
+    results = asyncio.run(scheduler.run())
+    elapsed = time.perf_counter() - start
+
+    assert results["c"] == 3
+    assert elapsed < 0.55, f"a and b should overlap, took {elapsed:.2f}s"
+    assert scheduler.stages["c"].started >= scheduler.stages["b"].finished
+    log_message(logger, f"Ran 3 stages in {elapsed:.2f}s", LogType.SUCCESS)
+
+    # Test 2: critical path follows the slowest chain
+    logger.info("\n--- Test 2: Critical path ---")
+    path, length = scheduler.critical_path()
+    assert path == ["b", "c"], path
+    assert 0.38 < length < 0.5, length
+    scheduler.log_timings()
+    log_message(logger, f"Critical path {' -> '.join(path)} = {length:.2f}s", LogType.SUCCESS)
+
+    # Test 3: serial mode runs one stage at a time, in declaration order
+    logger.info("\n--- Test 3: Serial run ---")
+    scheduler = build(serial=True)
+    start = time.perf_counter()
+    results = asyncio.run(scheduler.run())
+    elapsed = time.perf_counter() - start
+
+    assert results["c"] == 3
+    assert elapsed >= 0.6, f"Serial run should not overlap, took {elapsed:.2f}s"
+    assert scheduler.stages["b"].started >= scheduler.stages["a"].finished
+    log_message(logger, f"Serial run took {elapsed:.2f}s", LogType.SUCCESS)
+
+    # Test 4: a failing stage surfaces its own error and cancels the rest
+    logger.info("\n--- Test 4: Failure ---")
+    scheduler = StageScheduler()
+
+    async def broken(results: dict):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("auth failed")
+
+    scheduler.add("auth", broken)
+    scheduler.add("fetch", sleeper(0.1), deps=["auth"])
+    scheduler.add("slow", sleeper(5))
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(scheduler.run())
+        raise AssertionError("Expected the stage error to propagate")
+    except RuntimeError as e:
+        assert str(e) == "auth failed"
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1, f"Independent stages should be cancelled, took {elapsed:.2f}s"
+    assert scheduler.failed == "auth"
+    assert scheduler.stages["fetch"].status == "pending"
+    assert scheduler.stages["slow"].status == "cancelled"
+    log_message(logger, "Failure propagated and remaining stages cancelled", LogType.SUCCESS)
+
+    # Test 5: bad graphs are rejected before anything runs
+    logger.info("\n--- Test 5: Invalid graphs ---")
+    scheduler = StageScheduler()
+    scheduler.add("a", sleeper(0), deps=["b"])
+    scheduler.add("b", sleeper(0), deps=["a"])
+    try:
+        asyncio.run(scheduler.run())
+        raise AssertionError("Expected a cycle error")
+    except ValueError as e:
+        assert "cycle" in str(e)
+
+    scheduler = StageScheduler()
+    scheduler.add("a", sleeper(0), deps=["missing"])
+    try:
+        scheduler.order()
+        raise AssertionError("Expected an unknown stage error")
+    except ValueError as e:
+        assert "unknown stage" in str(e)
+    log_message(logger, "Cycles and unknown dependencies rejected", LogType.SUCCESS)
+
+    log_message(logger, "Stage scheduler test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,49 @@
+from utils.schema import derive_schema, validate_schema, salvage_members
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 12, "Testing Resume Schema and Repair Helpers")
+
+try:
+    resume = {
+        "name": "Jane Doe",
+        "experience": [
+            {"role": "Engineer", "bullets": ["Built APIs"]},
+            {"role": "Intern", "location": "Remote", "bullets": ["Wrote tests"]}
+        ],
+        "years": 5
+    }
+
+    # Test 1: derived schema accepts the source and rejects drift
+    logger.info("\n--- Test 1: derive_schema() / validate_schema() ---")
+    schema = derive_schema(resume)
+    assert schema["required"] == ["name", "experience", "years"]
+    assert "anyOf" in schema["properties"]["experience"]["items"], "Differently shaped entries keep their own keys"
+    assert validate_schema(resume, schema) == []
+
+    drifted = {"name": "Jane Doe", "experience": [{"role": "Engineer"}], "years": "five", "extra": 1}
+    errors = validate_schema(drifted, schema)
+    for error in errors:
+        logger.info(f"  {error}")
+    assert any(error.startswith("$.years") for error in errors)
+    assert any(error.startswith("$.extra") for error in errors)
+    assert any(error.startswith("$.experience[0]") for error in errors)
+    log_message(logger, f"{len(errors)} schema violations reported with paths", LogType.SUCCESS)
+
+    # Test 2: members before the break survive
+    logger.info("\n--- Test 2: salvage_members() ---")
+    broken = '{"name": "Jane Doe", "summary": "Backend \\"engineer\\"", "experience": [{"role": "Eng'
+    salvaged = salvage_members(broken)
+    assert salvaged == {"name": "Jane Doe", "summary": 'Backend "engineer"'}, salvaged
+    assert salvage_members('{"name": "Jane" "summary": "x"}') == {"name": "Jane"}
+    assert salvage_members("not json") == {}
+    log_message(logger, f"Salvaged {list(salvaged.keys())} from truncated output", LogType.SUCCESS)
+
+    log_message(logger, "Resume schema test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
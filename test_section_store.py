@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+from config.settings import settings
+from utils.section_store import SectionStore, fingerprint_section
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 27, "Testing Incremental Section Store")
+
+CALLS = []
+
+FAILING = set()
+
+def fake_complete_resume(system_prompt: str, section: dict, pass_name: str, **kwargs) -> dict:
+    CALLS.append(", ".join(section))
+    if FAILING & set(section):
+        raise ValueError("AI output is not a JSON object")
+    return {**{key: f"optimised {value}" for key, value in section.items()}, "_issues": []}
+
+try:
+    tmp = tempfile.mkdtemp()
+    type(settings).AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    type(settings).AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+
+    # Test 1: fingerprints ignore key order but not content, model or prompt
+    logger.info("\n--- Test 1: fingerprint_section() ---")
+    base = fingerprint_section("gpt-4o", "prompt", {"skills": {"a": 1, "b": 2}})
+    assert base == fingerprint_section("gpt-4o", "prompt", {"skills": {"b": 2, "a": 1}})
+    assert base != fingerprint_section("gpt-4o", "prompt", {"skills": {"a": 1, "b": 3}})
+    assert base != fingerprint_section("gpt-4o-mini", "prompt", {"skills": {"a": 1, "b": 2}})
+    assert base != fingerprint_section("gpt-4o", "other prompt", {"skills": {"a": 1, "b": 2}})
+    log_message(logger, "Fingerprints track content, model and prompt", LogType.SUCCESS)
+
+    # Test 2: entries persist and only match their own fingerprint
+    logger.info("\n--- Test 2: Store round trip ---")
+    path = os.path.join(tmp, "sections.json")
+    store = SectionStore(path)
+    store.put("skills", base, {"skills": "optimised"}, ["check skills"])
+    store.save()
+    reloaded = SectionStore(path)
+    assert reloaded.get("skills", base)["output"] == {"skills": "optimised"}
+    assert reloaded.get("skills", "stale") is None
+    assert reloaded.get("projects", base) is None
+    log_message(logger, "Stored sections reloaded, stale fingerprints rejected", LogType.SUCCESS)
+
+    # Test 3: pruning drops sections that no longer exist in the resume
+    logger.info("\n--- Test 3: prune() ---")
+    reloaded.put("awards", base, {"awards": []}, [])
+    reloaded.prune(["skills"])
+    assert list(reloaded.sections) == ["skills"]
+    log_message(logger, "Removed sections pruned", LogType.SUCCESS)
+
+    from services.ai_service import AiService
+
+    ai_service = AiService()
+    ai_service._complete_resume = fake_complete_resume
+    store = SectionStore(os.path.join(tmp, "incremental.json"))
+    resume = {"name": "Jane", "skills": ["python"], "projects": [{"name": "thing"}], "awards": ["best"]}
+
+    # Test 4: a second run reuses every unchanged section
+    logger.info("\n--- Test 4: Reuse ---")
+    first, _ = ai_service.optimise_sections(resume, max_workers=2, store=store)
+    assert sorted(CALLS) == ["awards", "name", "projects", "skills"], CALLS
+    CALLS.clear()
+    second, _ = ai_service.optimise_sections(dict(resume), max_workers=2, store=SectionStore(os.path.join(tmp, "incremental.json")))
+    assert CALLS == [] and second == first, CALLS
+    log_message(logger, "Unchanged resume served entirely from the store", LogType.SUCCESS)
+
+    # Test 5: only the changed section is re-optimised, removed sections are pruned
+    logger.info("\n--- Test 5: Invalidation ---")
+    changed = {"name": "Jane", "skills": ["python", "aws"], "projects": [{"name": "thing"}]}
+    store = SectionStore(os.path.join(tmp, "incremental.json"))
+    third, _ = ai_service.optimise_sections(changed, max_workers=2, store=store)
+    assert CALLS == ["skills"], CALLS
+    assert third["projects"] == first["projects"] and third["skills"] != first["skills"]
+    assert "awards" not in SectionStore(os.path.join(tmp, "incremental.json")).sections
+    log_message(logger, "Changed section re-optimised, removed section pruned", LogType.SUCCESS)
+
+    # Test 6: a refresh ignores stored sections and overwrites them
+    logger.info("\n--- Test 6: Refresh ---")
+    CALLS.clear()
+    ai_service.refresh_cache = True
+    ai_service.optimise_sections(changed, max_workers=2, store=SectionStore(os.path.join(tmp, "incremental.json")))
+    ai_service.refresh_cache = False
+    assert sorted(CALLS) == ["name", "projects", "skills"], CALLS
+    log_message(logger, "Every section re-sent on refresh", LogType.SUCCESS)
+
+    # Test 7: sections that succeed are stored even when another one fails
+    logger.info("\n--- Test 7: Partial failure ---")
+    type(settings).AI_SECTION_RETRIES = 0
+    CALLS.clear()
+    FAILING.add("projects")
+    partial = {"name": "Janet", "skills": ["go"], "projects": [{"name": "other"}]}
+    try:
+        ai_service.optimise_sections(partial, max_workers=1, store=SectionStore(os.path.join(tmp, "incremental.json")))
+        raise AssertionError("failing section was not raised")
+    except ValueError as e:
+        assert "JSON object" in str(e), e
+    FAILING.clear()
+    CALLS.clear()
+    ai_service.optimise_sections(partial, max_workers=2, store=SectionStore(os.path.join(tmp, "incremental.json")))
+    assert CALLS == ["projects"], CALLS
+    log_message(logger, "Only the failed section was repeated on the next run", LogType.SUCCESS)
+
+    log_message(logger, "Section store test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
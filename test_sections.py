@@ -0,0 +1,95 @@
+import os
+import tempfile
+import threading
+import time
+
+from config.settings import settings
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 26, "Testing Section-Parallel AI P1")
+
+RESUME = {
+    "name": "Jane Doe",
+    "experience": [{"role": "Engineer", "bullets": ["built apis"]}],
+    "title": "Backend engineer",
+    "skills": ["python", "aws"],
+    "projects": [{"name": "thing", "description": "made a thing"}],
+    "_issues": ["from an earlier pass"]
+}
+CALLS = {}
+LOCK = threading.Lock()
+
+def rewrite(value):
+    if isinstance(value, str):
+        return value.upper()
+    if isinstance(value, list):
+        return [rewrite(item) for item in value]
+    if isinstance(value, dict):
+        return {key: rewrite(item) for key, item in value.items()}
+    return value
+
+def fake_complete_resume(system_prompt: str, section: dict, pass_name: str, **kwargs) -> dict:
+    label = ", ".join(section)
+    with LOCK:
+        CALLS[label] = CALLS.get(label, 0) + 1
+        attempt = CALLS[label]
+
+    # the first section finishes last, so merge order can't just follow completion order
+    time.sleep(0.2 if "experience" in section else 0.01)
+
+    if "projects" in section and attempt == 1:
+        raise ValueError("AI output is not a JSON object")
+    if "awards" in section:
+        return {"_issues": []}
+
+    return {**rewrite(section), "_issues": [f"check {label}"]}
+
+try:
+    tmp = tempfile.mkdtemp()
+    type(settings).AI_LATENCY_HISTORY_PATH = os.path.join(tmp, "ai_latency.json")
+    type(settings).AI_LEDGER_PATH = os.path.join(tmp, "ai_ledger.jsonl")
+    type(settings).AI_SECTION_RETRIES = 1
+
+    from services.ai_service import AiService
+
+    ai_service = AiService()
+    ai_service._complete_resume = fake_complete_resume
+
+    # Test 1: containers get a request each, scalars share one, _issues is never sent
+    logger.info("\n--- Test 1: _split_sections() ---")
+    sections = ai_service._split_sections(RESUME)
+    assert [list(section) for section in sections] == [["experience"], ["skills"], ["projects"], ["name", "title"]], sections
+    log_message(logger, f"{len(sections)} sections: {', '.join(ai_service._section_label(s) for s in sections)}", LogType.SUCCESS)
+
+    # Test 2: results are merged back in the source key order with labelled issues
+    logger.info("\n--- Test 2: Merge order ---")
+    merged, issues = ai_service.optimise_sections(RESUME, max_workers=4)
+    assert list(merged) == ["name", "experience", "title", "skills", "projects"], list(merged)
+    assert merged["experience"][0]["bullets"] == ["BUILT APIS"] and merged["title"] == "BACKEND ENGINEER"
+    assert "experience: check experience" in issues and "name, title: check name, title" in issues, issues
+    log_message(logger, "Sections merged in source order", LogType.SUCCESS)
+
+    # Test 3: a failing section is retried on its own
+    logger.info("\n--- Test 3: Per-section retry ---")
+    assert CALLS["projects"] == 2 and CALLS["experience"] == 1 and CALLS["skills"] == 1, CALLS
+    log_message(logger, "Only the failed section was re-sent", LogType.SUCCESS)
+
+    # Test 4: a response that drops the section's key is rejected after the retries
+    logger.info("\n--- Test 4: Missing keys ---")
+    try:
+        ai_service.optimise_sections({"name": "Jane", "awards": [{"title": "best"}]}, max_workers=2)
+        raise AssertionError("missing section key was not detected")
+    except ValueError as e:
+        assert "awards" in str(e), e
+    assert CALLS["awards"] == 2, CALLS
+    log_message(logger, "Missing section key retried, then raised", LogType.SUCCESS)
+
+    log_message(logger, "Section-parallel P1 test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,53 @@
+from utils.token_store import TokenStore, decode_jwt_expiry, token_identity
+from utils.logger import setup_logger, log_step, log_message, LogType
+import base64
+import json
+import os
+import stat
+import tempfile
+import time
+
+logger = setup_logger()
+
+log_step(logger, 15, "Testing Persistent Token Cache")
+
+def make_jwt(claims: dict) -> str:
+    encode = lambda value: base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'HS256'})}.{encode(claims)}.signature"
+
+try:
+    # Test 1: expiry from the JWT exp claim
+    logger.info("\n--- Test 1: decode_jwt_expiry() ---")
+    expires_at = int(time.time()) + 3600
+    assert decode_jwt_expiry(make_jwt({"sub": "jane", "exp": expires_at})) == expires_at
+    assert decode_jwt_expiry(make_jwt({"sub": "jane"})) is None
+    assert decode_jwt_expiry("opaque-token") is None
+    assert decode_jwt_expiry("a.!!!.c") is None
+    log_message(logger, "exp claim decoded, opaque tokens ignored", LogType.SUCCESS)
+
+    # Test 2: stored token is private and bound to the account
+    logger.info("\n--- Test 2: TokenStore ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache", "auth_token.json")
+        store = TokenStore(path)
+        identity = token_identity("https://api.example.com", "jane")
+
+        store.save(identity, "token-1", expires_at)
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        logger.info(f"  File mode: {oct(mode)}")
+        assert mode == 0o600, f"Token cache should be 0600, got {oct(mode)}"
+
+        assert store.load(identity)["accessToken"] == "token-1"
+        assert store.load(token_identity("https://api.example.com", "john")) is None, "Other accounts must not reuse the token"
+
+        store.clear()
+        assert store.load(identity) is None
+        log_message(logger, "Token cache written 0600, scoped per API and user", LogType.SUCCESS)
+
+    log_message(logger, "Persistent token cache test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import requests
+
+from services.warmup_service import WarmupService
+from utils.logger import setup_logger, log_step, log_message, LogType
+
+logger = setup_logger()
+
+log_step(logger, 25, "Testing Resume API Warm-up")
+
+class StubHttp:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, endpoint: str = "default", **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise requests.exceptions.ConnectionError("instance asleep")
+        return None
+
+def service_with(http: StubHttp) -> WarmupService:
+    service = WarmupService()
+    service.http = http
+    return service
+
+try:
+    # Test 1: a ping started early is partly hidden behind other work
+    logger.info("\n--- Test 1: Overlap ---")
+    async def overlap():
+        service = service_with(StubHttp(delay=0.3))
+        task = service.start("startup")
+        await asyncio.sleep(0.2)
+        waited = await service.wait(task, "authentication")
+        return service, waited
+
+    service, waited = asyncio.run(overlap())
+    assert service.stats["requests"] == 1
+    assert waited < 0.25 and service.stats["hidden_seconds"] > 0.1, service.stats
+    log_message(logger, f"Waited {waited:.2f}s, hid {service.stats['hidden_seconds']:.2f}s", LogType.SUCCESS)
+
+    # Test 2: failed pings are counted, never raised
+    logger.info("\n--- Test 2: Failures ---")
+    async def failing():
+        service = service_with(StubHttp(fail=True))
+        await service.wait(service.start("startup"), "authentication")
+        return service
+
+    service = asyncio.run(failing())
+    assert service.stats["requests"] == 1
+    log_message(logger, "Failed warm-up logged and counted", LogType.SUCCESS)
+
+    # Test 3: keep-warm pings repeat until stopped
+    logger.info("\n--- Test 3: Keep warm ---")
+    async def keep_warm():
+        http = StubHttp()
+        service = service_with(http)
+        service.start_keep_warm(0.05)
+        await asyncio.sleep(0.3)
+        await service.stop_keep_warm("generation")
+        calls = http.calls
+        await asyncio.sleep(0.2)
+        return service, calls, http.calls
+
+    service, calls, later_calls = asyncio.run(keep_warm())
+    assert calls >= 3 and later_calls == calls, (calls, later_calls)
+    log_message(logger, f"{calls} keep-warm pings, none after stopping", LogType.SUCCESS)
+
+    # Test 4: cancel() drops pending pings so the loop can shut down cleanly
+    logger.info("\n--- Test 4: Cancel ---")
+    async def cancel():
+        service = service_with(StubHttp(delay=0.5))
+        startup = service.start("startup")
+        service.start_keep_warm(60)
+        await asyncio.sleep(0.05)
+        service.cancel()
+        await asyncio.sleep(0)
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return startup, others
+
+    startup, others = asyncio.run(cancel())
+    assert startup.cancelled() and not others, others
+    log_message(logger, "Startup and keep-warm pings cancelled", LogType.SUCCESS)
+
+    # Test 5: stats stay consistent when pings finish on several threads at once
+    logger.info("\n--- Test 5: Thread safety ---")
+    service = service_with(StubHttp())
+    workers = [threading.Thread(target=lambda: [service.warm_up("load") for _ in range(200)]) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert service.stats["requests"] == 1600, service.stats
+    service.log_stats()
+    log_message(logger, "Concurrent pings all counted", LogType.SUCCESS)
+
+    log_message(logger, "Warm-up test completed!", LogType.SUCCESS)
+
+except Exception as e:
+    log_message(logger, f"Test failed: {e}", LogType.ERROR)
+    import traceback
+    traceback.print_exc()
+    exit(1)
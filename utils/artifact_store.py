@@ -0,0 +1,212 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Dict
+import requests
+from utils.http_client import HttpClient
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def safe_filename(name: str) -> str:
+  return re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('._') or "resume"
+
+def expected_digests(headers) -> Dict[str, str]:
+  # whatever the server tells us about the body, normalised to hex digests
+  digests = {}
+
+  for part in (headers.get("Digest") or "").split(","):
+    algorithm, _, value = part.strip().partition("=")
+    if algorithm.lower() == "sha-256" and value:
+      digests["sha256"] = base64.b64decode(value).hex()
+
+  if headers.get("x-amz-checksum-sha256"):
+    digests["sha256"] = base64.b64decode(headers["x-amz-checksum-sha256"]).hex()
+  if headers.get("Content-MD5"):
+    digests["md5"] = base64.b64decode(headers["Content-MD5"]).hex()
+
+  etag = (headers.get("ETag") or "").strip('W/"')
+  if "md5" not in digests and re.fullmatch(r'[0-9a-f]{32}', etag):
+    # single-part S3-style ETags are the MD5 of the body
+    digests["md5"] = etag
+  return digests
+
+class DownloadError(Exception):
+  pass
+
+class ArtifactStore:
+  def __init__(self, root: str, http: HttpClient, chunk_size: int = 64 * 1024, max_attempts: int = 3):
+    self.root = root
+    self.http = http
+    self.chunk_size = chunk_size
+    self.max_attempts = max_attempts
+    self.objects_dir = os.path.join(root, "objects")
+    self.partial_dir = os.path.join(root, ".partial")
+    self.stats = { "downloads": 0, "bytes": 0, "deduplicated": 0, "resumed": 0 }
+    self._lock = threading.Lock()
+
+    os.makedirs(self.objects_dir, exist_ok=True)
+    os.makedirs(self.partial_dir, exist_ok=True)
+
+  def _partial_paths(self, url: str):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(self.partial_dir, f"{key}.part"), os.path.join(self.partial_dir, f"{key}.json")
+
+  def _load_meta(self, meta_path: str) -> Dict:
+    try:
+      with open(meta_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+    except (OSError, json.JSONDecodeError):
+      return {}
+
+  def _save_meta(self, meta_path: str, meta: Dict):
+    with open(meta_path, 'w', encoding='utf-8') as f:
+      json.dump(meta, f)
+
+  def _fetch(self, url: str, part_path: str, meta_path: str) -> Dict:
+    have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    meta = self._load_meta(meta_path) if have else {}
+
+    headers = {}
+    if have:
+      headers["Range"] = f"bytes={have}-"
+      # only resume if the file behind the URL is still the one we started on
+      validator = meta.get("etag") or meta.get("lastModified")
+      if validator:
+        headers["If-Range"] = validator
+
+    with self.http.get(url, endpoint="download", headers=headers, stream=True) as response:
+      if response.status_code == 416 and have and have == meta.get("size"):
+        return meta
+      response.raise_for_status()
+
+      if response.status_code == 206 and have:
+        match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', response.headers.get("Content-Range", ""))
+        if not match or int(match.group(1)) != have:
+          raise DownloadError(f"Server resumed at the wrong offset: {response.headers.get('Content-Range')}")
+        total = int(match.group(2)) if match.group(2) != "*" else None
+        mode = 'ab'
+        with self._lock:
+          self.stats["resumed"] += 1
+        logger.info(f"Resuming download at {have} bytes")
+      else:
+        # a plain 200 means the server ignored the range (or the file changed): start over
+        have = 0
+        length = response.headers.get("Content-Length")
+        total = int(length) if length and "Content-Encoding" not in response.headers else None
+        mode = 'wb'
+        meta = {
+          "url": url,
+          "etag": response.headers.get("ETag"),
+          "lastModified": response.headers.get("Last-Modified"),
+          "digests": expected_digests(response.headers)
+        }
+
+      meta["size"] = total
+      self._save_meta(meta_path, meta)
+
+      with open(part_path, mode) as f:
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+          f.write(chunk)
+
+    return meta
+
+  def _digest(self, path: str) -> Dict[str, str]:
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+      for chunk in iter(lambda: f.read(self.chunk_size), b""):
+        sha256.update(chunk)
+        md5.update(chunk)
+    return { "sha256": sha256.hexdigest(), "md5": md5.hexdigest() }
+
+  def _verify(self, part_path: str, meta: Dict) -> Dict[str, str]:
+    size = os.path.getsize(part_path)
+    if meta.get("size") is not None and size != meta["size"]:
+      raise DownloadError(f"Size mismatch: got {size} bytes, expected {meta['size']}")
+
+    with open(part_path, 'rb') as f:
+      if f.read(5) != b"%PDF-":
+        raise DownloadError("Downloaded file is not a PDF")
+
+    digests = self._digest(part_path)
+    for algorithm, expected in meta.get("digests", {}).items():
+      if digests[algorithm] != expected:
+        raise DownloadError(f"{algorithm} mismatch: got {digests[algorithm]}, expected {expected}")
+    return digests
+
+  def _link(self, source: str, target: str):
+    if os.path.exists(target):
+      os.remove(target)
+    try:
+      os.link(source, target)
+    except OSError:
+      # filesystems without hard links still get the file
+      shutil.copyfile(source, target)
+
+  def download(self, url: str, name: str) -> Dict:
+    part_path, meta_path = self._partial_paths(url)
+    start = time.perf_counter()
+    meta = None
+
+    for attempt in range(1, self.max_attempts + 1):
+      try:
+        meta = self._fetch(url, part_path, meta_path)
+        digests = self._verify(part_path, meta)
+        break
+      except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        # keep the partial file; the next attempt picks up where this one stopped
+        if attempt == self.max_attempts:
+          log_message(logger, f"Download of {url} failed after {attempt} attempts: {e}", LogType.ERROR)
+          raise
+        log_message(logger, f"Download interrupted ({e}), retrying....", LogType.WARNING)
+      except DownloadError as e:
+        # a corrupt file can't be resumed into a good one
+        for path in (part_path, meta_path):
+          if os.path.exists(path):
+            os.remove(path)
+        if attempt == self.max_attempts:
+          log_message(logger, f"Download of {url} failed verification: {e}", LogType.ERROR)
+          raise
+        log_message(logger, f"Download failed verification ({e}), starting over....", LogType.WARNING)
+
+    object_path = os.path.join(self.objects_dir, f"{digests['sha256']}.pdf")
+    target = os.path.join(self.root, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    with self._lock:
+      duplicate = os.path.exists(object_path)
+      if duplicate:
+        os.remove(part_path)
+        self.stats["deduplicated"] += 1
+      else:
+        os.replace(part_path, object_path)
+      self._link(object_path, target)
+
+      size = os.path.getsize(object_path)
+      self.stats["downloads"] += 1
+      self.stats["bytes"] += size
+
+    if os.path.exists(meta_path):
+      os.remove(meta_path)
+
+    elapsed = time.perf_counter() - start
+    log_message(
+      logger,
+      f"Saved {target} ({size / 1024:.1f} KiB in {elapsed:.2f}s{', identical to an earlier download' if duplicate else ''})",
+      LogType.SUCCESS
+    )
+    return { "path": target, "bytes": size, "sha256": digests["sha256"], "deduplicated": duplicate }
+
+  def log_stats(self):
+    if not self.stats["downloads"]:
+      return
+    logger.info(
+      f"Artifacts: {self.stats['downloads']} PDFs, {self.stats['bytes'] / 1024:.1f} KiB, "
+      f"{self.stats['deduplicated']} deduplicated, {self.stats['resumed']} resumed"
+    )
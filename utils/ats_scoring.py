@@ -0,0 +1,103 @@
+import re
+from typing import Any, Dict, List, Sequence, Tuple, Union
+import numpy as np
+
+# keeps C#, C++, Node.js, CI/CD-style tokens intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could did do does
+doing during each either etc for from had has have having how i if in into is it its itself just may me
+might more most must my no nor not of off on once only or other our ours out over own per same shall should
+so some such than that the their them then there these they this those through to too under until up upon
+us very was we were what when where which while who whom why will with within without would you your
+ability able experience experienced including looking plus preferred required requirements responsibilities
+role strong team work working years
+""".split())
+
+# scoring keys the model adds, not resume content
+IGNORED_KEYS = frozenset(("_issues", "score"))
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+# fixed rather than averaged over the batch so a pair scores the same no matter what it is batched with
+AVERAGE_RESUME_TOKENS = 400
+# a JD term mentioned this often in an average-length resume earns full credit
+FULL_CREDIT_MENTIONS = 2
+
+def tokenize(text: str) -> List[str]:
+  tokens = []
+  for token in TOKEN_PATTERN.findall(text.lower()):
+    token = token.rstrip(".-/")
+    if len(token) > 1 and token not in STOPWORDS and not token.isdigit():
+      tokens.append(token)
+  return tokens
+
+def resume_text(resume: Any) -> str:
+  if isinstance(resume, dict):
+    return " ".join(resume_text(value) for key, value in resume.items() if key not in IGNORED_KEYS)
+  if isinstance(resume, list):
+    return " ".join(resume_text(item) for item in resume)
+  if isinstance(resume, str):
+    return resume
+  return ""
+
+def _bm25_saturation(counts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+  norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / AVERAGE_RESUME_TOKENS)
+  return counts * (BM25_K1 + 1) / (counts + norm[:, None])
+
+def score_batch(pairs: Sequence[Tuple[Union[Dict, str], str]], top_missing: int = 10) -> List[Dict]:
+  if not pairs:
+    return []
+
+  resume_tokens = [tokenize(resume if isinstance(resume, str) else resume_text(resume)) for resume, _ in pairs]
+  jd_tokens = [tokenize(job_description) for _, job_description in pairs]
+
+  vocabulary = {}
+  for tokens in resume_tokens + jd_tokens:
+    for token in tokens:
+      vocabulary.setdefault(token, len(vocabulary))
+  terms = np.array(list(vocabulary) or [""], dtype=object)
+
+  def count_matrix(documents: List[List[str]]) -> np.ndarray:
+    counts = np.zeros((len(documents), max(len(vocabulary), 1)))
+    rows = np.repeat(np.arange(len(documents)), [len(tokens) for tokens in documents])
+    columns = np.fromiter((vocabulary[token] for tokens in documents for token in tokens), dtype=np.int64)
+    np.add.at(counts, (rows, columns), 1)
+    return counts
+
+  resume_counts = count_matrix(resume_tokens)
+  jd_counts = count_matrix(jd_tokens)
+
+  # sublinear JD term frequency: a requirement repeated five times matters more, but not five times more
+  weights = np.zeros_like(jd_counts)
+  present = jd_counts > 0
+  weights[present] = 1 + np.log(jd_counts[present])
+  total_weight = weights.sum(axis=1)
+
+  lengths = resume_counts.sum(axis=1)
+  strength = _bm25_saturation(resume_counts, lengths)
+  full_credit = _bm25_saturation(np.full((1, 1), FULL_CREDIT_MENTIONS), np.array([AVERAGE_RESUME_TOKENS]))[0, 0]
+  credit = np.minimum(strength / full_credit, 1.0)
+
+  matched = present & (resume_counts > 0)
+  with np.errstate(invalid="ignore", divide="ignore"):
+    scores = np.where(total_weight > 0, 100 * (weights * credit).sum(axis=1) / total_weight, 0.0)
+    coverage = np.where(total_weight > 0, (weights * matched).sum(axis=1) / total_weight, 0.0)
+
+  results = []
+  for row in range(len(pairs)):
+    missing = present[row] & ~matched[row]
+    missing_order = np.argsort(-weights[row][missing], kind="stable")[:top_missing]
+    results.append({
+      "score": round(float(scores[row]), 1),
+      "coverage": round(float(coverage[row]), 3),
+      "matched": int(matched[row].sum()),
+      "terms": int(present[row].sum()),
+      "missing": [str(term) for term in terms[missing][missing_order]]
+    })
+
+  return results
+
+def score_resume(resume: Union[Dict, str], job_description: str) -> Dict:
+  return score_batch([(resume, job_description)])[0]
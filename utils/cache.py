@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def canonical_json(value: Any) -> str:
+  return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+def make_cache_keys(models: List[str], system_prompt: str, user_payload: Any) -> Dict[str, str]:
+  if isinstance(user_payload, str):
+    try:
+      user_payload = json.loads(user_payload)
+    except json.JSONDecodeError:
+      pass
+
+  # the payload is canonicalised once; only the model name differs between the keys
+  material = canonical_json({
+    "system": system_prompt,
+    "user": user_payload
+  })
+  return {
+    model: hashlib.sha256(f"{model}\n{material}".encode('utf-8')).hexdigest()
+    for model in models
+  }
+
+def make_cache_key(model: str, system_prompt: str, user_payload: Any) -> str:
+  return make_cache_keys([model], system_prompt, user_payload)[model]
+
+class ResponseCache:
+  def __init__(self, cache_dir: str, max_bytes: int, max_age_seconds: int):
+    self.cache_dir = cache_dir
+    self.max_bytes = max_bytes
+    self.max_age_seconds = max_age_seconds
+    self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+    self._lock = threading.Lock()
+
+    os.makedirs(self.cache_dir, exist_ok=True)
+
+  def _path(self, key: str) -> str:
+    return os.path.join(self.cache_dir, f"{key}.json")
+
+  def get(self, key: str) -> Optional[str]:
+    path = self._path(key)
+
+    with self._lock:
+      try:
+        with open(path, 'r', encoding='utf-8') as f:
+          entry = json.load(f)
+
+        # age counts from when the entry was written; mtime moves on every hit
+        if time.time() - entry.get("created_at", 0) > self.max_age_seconds:
+          os.remove(path)
+          self.stats["evictions"] += 1
+          self.stats["misses"] += 1
+          logger.debug(f"Cache entry expired: {key[:12]}")
+          return None
+
+        # bump mtime so eviction drops least recently used entries first
+        os.utime(path, None)
+
+      except FileNotFoundError:
+        self.stats["misses"] += 1
+        return None
+      except (OSError, json.JSONDecodeError) as e:
+        log_message(logger, f"Discarding unreadable cache entry {key[:12]}: {e}", LogType.WARNING)
+        self._remove(path)
+        self.stats["misses"] += 1
+        return None
+
+      self.stats["hits"] += 1
+      return entry.get("content")
+
+  def set(self, key: str, content: str, metadata: Optional[Dict] = None):
+    entry = {
+      "key": key,
+      "created_at": time.time(),
+      "metadata": metadata or {},
+      "content": content
+    }
+    path = self._path(key)
+    tmp_path = f"{path}.tmp"
+
+    with self._lock:
+      try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+          json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.stats["writes"] += 1
+      except OSError as e:
+        log_message(logger, f"Failed to write cache entry {key[:12]}: {e}", LogType.WARNING)
+        self._remove(tmp_path)
+        return
+
+      self._evict()
+
+  def _remove(self, path: str):
+    try:
+      os.remove(path)
+    except OSError:
+      pass
+
+  def _evict(self):
+    now = time.time()
+    entries = []
+
+    for name in os.listdir(self.cache_dir):
+      if not name.endswith(".json"):
+        continue
+
+      path = os.path.join(self.cache_dir, name)
+      try:
+        stat = os.stat(path)
+      except OSError:
+        continue
+
+      # mtime is never older than created_at, so this only catches entries unused for a whole
+      # max-age window; get() expires the rest on their next lookup
+      if now - stat.st_mtime > self.max_age_seconds:
+        self._remove(path)
+        self.stats["evictions"] += 1
+      else:
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    entries.sort()
+
+    while entries and total_bytes > self.max_bytes:
+      _, size, path = entries.pop(0)
+      self._remove(path)
+      total_bytes -= size
+      self.stats["evictions"] += 1
+
+  def clear(self):
+    with self._lock:
+      for name in os.listdir(self.cache_dir):
+        if name.endswith(".json"):
+          self._remove(os.path.join(self.cache_dir, name))
+
+  def hit_rate(self) -> float:
+    lookups = self.stats["hits"] + self.stats["misses"]
+    return self.stats["hits"] / lookups if lookups else 0.0
+
+  def log_stats(self):
+    logger.info(
+      f"AI cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+      f"{self.stats['writes']} writes, {self.stats['evictions']} evictions "
+      f"(hit rate {self.hit_rate():.0%})"
+    )
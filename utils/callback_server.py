@@ -0,0 +1,136 @@
+import asyncio
+import ipaddress
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from utils.logger import setup_logger, log_message
+
+logger = setup_logger(__name__)
+
+MAX_CALLBACK_BYTES = 1024 * 1024
+
+def is_loopback_url(url: str) -> bool:
+  host = urlsplit(url).hostname or ""
+  if host == "localhost":
+    return True
+  try:
+    return ipaddress.ip_address(host).is_loopback
+  except ValueError:
+    return False
+
+class CallbackServer:
+  def __init__(self, host: str = "127.0.0.1", port: int = 0, public_url: Optional[str] = None, path: str = "/callback"):
+    self.host = host
+    self.port = port
+    self.public_url = public_url.rstrip("/") if public_url else None
+    self.path = path
+    self.received = 0
+    self._server: Optional[ThreadingHTTPServer] = None
+    self._thread: Optional[threading.Thread] = None
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._waiters: Dict[str, asyncio.Future] = {}
+    self._lock = threading.Lock()
+
+  @property
+  def url(self) -> str:
+    if self.public_url:
+      return self.public_url
+    return f"http://{self.host}:{self.port}{self.path}"
+
+  def start(self):
+    server = self
+
+    class Handler(BaseHTTPRequestHandler):
+      def do_POST(self):
+        server._handle(self)
+
+      def log_message(self, format, *args):
+        logger.debug(f"Callback server: {format % args}")
+
+    self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+    self._server.daemon_threads = True
+    self.port = self._server.server_port
+    self._loop = asyncio.get_running_loop()
+    self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    self._thread.start()
+    log_message(logger, f"Listening for job callbacks on {self.host}:{self.port}")
+
+  def expect(self) -> str:
+    # one unguessable token per job, so a callback can't be spoofed or land on the wrong job
+    token = secrets.token_urlsafe(16)
+    with self._lock:
+      self._waiters[token] = self._loop.create_future()
+    return token
+
+  def callback_url(self, token: str) -> str:
+    return f"{self.url}/{token}"
+
+  async def wait(self, token: str, timeout: float) -> Optional[Dict]:
+    future = self._waiters[token]
+    try:
+      return await asyncio.wait_for(asyncio.shield(future), timeout)
+    except asyncio.TimeoutError:
+      return None
+
+  def forget(self, token: str):
+    with self._lock:
+      future = self._waiters.pop(token, None)
+    if future is not None and not future.done():
+      future.cancel()
+
+  def _resolve(self, token: str, body: Dict):
+    future = self._waiters.get(token)
+    if future is not None and not future.done():
+      future.set_result(body)
+
+  def _handle(self, request: BaseHTTPRequestHandler):
+    prefix = f"{self.path}/"
+    token = request.path[len(prefix):] if request.path.startswith(prefix) else None
+
+    with self._lock:
+      known = token in self._waiters
+
+    if not known:
+      request.send_response(404)
+      request.end_headers()
+      return
+
+    length = int(request.headers.get("Content-Length", 0) or 0)
+    if length > MAX_CALLBACK_BYTES:
+      request.send_response(413)
+      request.end_headers()
+      return
+
+    try:
+      body = json.loads(request.rfile.read(length) or b"{}")
+    except json.JSONDecodeError:
+      request.send_response(400)
+      request.end_headers()
+      return
+
+    request.send_response(204)
+    request.end_headers()
+
+    with self._lock:
+      self.received += 1
+    # some backends wrap the job in "data" like the rest of the API
+    if isinstance(body, dict) and isinstance(body.get("data"), dict) and "status" not in body:
+      body = body["data"]
+    self._loop.call_soon_threadsafe(self._resolve, token, body if isinstance(body, dict) else {})
+
+  def stop(self):
+    if self._server is None:
+      return
+
+    self._server.shutdown()
+    self._server.server_close()
+    self._server = None
+    with self._lock:
+      waiters = list(self._waiters.values())
+      self._waiters.clear()
+    for future in waiters:
+      if not future.done():
+        self._loop.call_soon_threadsafe(future.cancel)
@@ -1,5 +1,7 @@
+import glob
 import os
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 from utils.logger import setup_logger, log_message, LogType
 
 logger = setup_logger(__name__)
@@ -52,6 +54,45 @@ def get_job_description(jd_input: Optional[str]) -> Optional[str]:
   log_message(logger, f"Using job description as direct text ({len(jd_input)} chars)")
   return jd_input
 
+def resolve_jd_files(pattern: str) -> List[str]:
+  if os.path.isdir(pattern):
+    candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+  else:
+    candidates = glob.glob(pattern)
+
+  jd_files = sorted(path for path in candidates if os.path.isfile(path))
+
+  if not jd_files:
+    log_message(logger, f"No job description files match: {pattern}", LogType.ERROR)
+    raise FileNotFoundError(f"No job description files match: {pattern}")
+
+  log_message(logger, f"Found {len(jd_files)} job description files")
+  return jd_files
+
+def batch_resume_name(resume_name: str, jd_file: str) -> str:
+  stem = os.path.splitext(os.path.basename(jd_file))[0]
+  return f"{resume_name}_{re.sub(r'[^A-Za-z0-9_-]+', '_', stem)}"
+
+def resolve_render_targets(template_ids: List[str], resume_names: List[str]) -> List[Tuple[str, str]]:
+  if len(template_ids) == len(resume_names):
+    targets = list(zip(template_ids, resume_names))
+  elif len(resume_names) == 1:
+    # one name across several templates: suffix the template so the PDFs don't overwrite each other
+    targets = [(template_id, batch_resume_name(resume_names[0], template_id)) for template_id in template_ids]
+  elif len(template_ids) == 1:
+    targets = [(template_ids[0], resume_name) for resume_name in resume_names]
+  else:
+    raise ValueError(
+      f"Got {len(template_ids)} --template-id and {len(resume_names)} --resume-name values, "
+      f"expected matching counts or a single value on one side"
+    )
+
+  names = [resume_name for _, resume_name in targets]
+  duplicates = sorted({name for name in names if names.count(name) > 1})
+  if duplicates:
+    raise ValueError(f"Duplicate resume names: {', '.join(duplicates)}")
+  return targets
+
 def validate_template_id(template_id: str) -> bool:
   if not template_id:
     return False
@@ -0,0 +1,111 @@
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class HttpClient:
+  def __init__(
+    self,
+    pool_connections: int,
+    pool_maxsize: int,
+    connect_timeout: float,
+    timeouts: Dict[str, float],
+    default_headers: Optional[Dict[str, str]] = None
+  ):
+    self.connect_timeout = connect_timeout
+    self.timeouts = timeouts
+    self.session = requests.Session()
+    self.session.headers.update(default_headers or {})
+
+    # retries stay with the callers, which know which failures are safe to repeat
+    self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    self.session.mount("https://", self.adapter)
+    self.session.mount("http://", self.adapter)
+
+    self.requests_by_endpoint: Dict[str, int] = {}
+    self._lock = threading.Lock()
+
+  def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+    return (self.connect_timeout, self.timeouts.get(endpoint, self.timeouts["default"]))
+
+  def request(self, method: str, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", self.timeout_for(endpoint))
+
+    with self._lock:
+      self.requests_by_endpoint[endpoint] = self.requests_by_endpoint.get(endpoint, 0) + 1
+
+    return self.session.request(method, url, **kwargs)
+
+  def get(self, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return self.request("GET", url, endpoint=endpoint, **kwargs)
+
+  def post(self, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return self.request("POST", url, endpoint=endpoint, **kwargs)
+
+  def connection_stats(self) -> Dict[str, Dict[str, int]]:
+    stats = {}
+    pools = self.adapter.poolmanager.pools
+
+    for key in list(pools.keys()):
+      pool = pools.get(key)
+      if pool is None:
+        continue
+      host = f"{pool.scheme}://{pool.host}:{pool.port}"
+      entry = stats.setdefault(host, { "requests": 0, "connections": 0 })
+      entry["requests"] += pool.num_requests
+      entry["connections"] += pool.num_connections
+
+    return stats
+
+  def log_stats(self):
+    stats = self.connection_stats()
+    if not stats:
+      return
+
+    total_requests = sum(entry["requests"] for entry in stats.values())
+    total_connections = sum(entry["connections"] for entry in stats.values())
+    reused = total_requests - total_connections
+    logger.info(
+      f"HTTP: {total_requests} requests over {total_connections} connections "
+      f"({reused / total_requests if total_requests else 0:.0%} reused)"
+    )
+    for host, entry in stats.items():
+      logger.debug(f"  {urlsplit(host).hostname}: {entry['requests']} requests, {entry['connections']} connections")
+    with self._lock:
+      by_endpoint = ", ".join(f"{endpoint}: {count}" for endpoint, count in self.requests_by_endpoint.items())
+    logger.debug(f"  Requests by endpoint: {by_endpoint}")
+
+  def close(self):
+    self.session.close()
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+  global _shared_client
+
+  with _shared_lock:
+    if _shared_client is None:
+      _shared_client = HttpClient(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        # every pipeline worker thread may hold a connection at once; a smaller pool would open
+        # connections for those calls and then throw them away instead of reusing them
+        pool_maxsize=max(settings.HTTP_POOL_MAXSIZE, settings.ASYNC_WORKER_THREADS),
+        connect_timeout=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        timeouts={
+          "default": settings.HTTP_TIMEOUT_SECONDS,
+          "auth": settings.HTTP_AUTH_TIMEOUT_SECONDS,
+          "poll": settings.HTTP_POLL_TIMEOUT_SECONDS,
+          "ai": settings.HTTP_AI_TIMEOUT_SECONDS,
+          "notify": settings.HTTP_NOTIFY_TIMEOUT_SECONDS,
+          "warmup": settings.HTTP_WARMUP_TIMEOUT_SECONDS,
+          "download": settings.HTTP_DOWNLOAD_TIMEOUT_SECONDS
+        },
+        default_headers={ "User-Agent": "resume-automation" }
+      )
+    return _shared_client
@@ -0,0 +1,211 @@
+import re
+from typing import List
+
+NUMBER_PATTERN = re.compile(r'-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?')
+LITERALS = ("true", "false", "null")
+WHITESPACE = " \t\r\n"
+
+class JsonStreamError(ValueError):
+  def __init__(self, message: str, position: int):
+    super().__init__(f"{message} at char {position}")
+    self.position = position
+    # text received before the error, filled in by whoever was feeding the parser
+    self.partial = ""
+
+class IncrementalJsonParser:
+  VALUE = "value"
+  VALUE_OR_END = "value_or_end"
+  KEY = "key"
+  KEY_OR_END = "key_or_end"
+  COLON = "colon"
+  COMMA_OR_END = "comma_or_end"
+  DONE = "done"
+
+  def __init__(self):
+    self.state = self.VALUE
+    self.stack: List[str] = []
+    self.position = 0
+    self.chars: List[str] = []
+
+    self._fence_checked = False
+    self._fence_buffer = ""
+    self._token = None
+    self._token_text = ""
+    self._escape = False
+    self._unicode_left = 0
+    self._string_is_key = False
+
+  @property
+  def complete(self) -> bool:
+    return self.state == self.DONE
+
+  @property
+  def text(self) -> str:
+    return "".join(self.chars)
+
+  def feed(self, chunk: str) -> bool:
+    if not self._fence_checked:
+      chunk = self._strip_leading_fence(chunk)
+      if chunk is None:
+        return False
+
+    for char in chunk:
+      if self.state == self.DONE:
+        break
+      self._consume(char)
+      self.position += 1
+
+    return self.complete
+
+  def close(self) -> str:
+    if self._token == "number" and not self.stack:
+      self._finish_number()
+      self._after_value()
+
+    if not self.complete:
+      raise JsonStreamError("Stream ended before JSON document was complete", self.position)
+
+    return self.text
+
+  def _strip_leading_fence(self, chunk: str):
+    self._fence_buffer += chunk
+    stripped = self._fence_buffer.lstrip()
+
+    if not stripped:
+      return None
+    if "```".startswith(stripped[:3]) and len(stripped) < 3:
+      return None
+
+    if stripped.startswith("```"):
+      newline = stripped.find("\n")
+      if newline == -1:
+        return None
+      stripped = stripped[newline + 1:]
+
+    self._fence_checked = True
+    self._fence_buffer = ""
+    return stripped
+
+  def _error(self, message: str):
+    raise JsonStreamError(message, self.position)
+
+  def _consume(self, char: str):
+    if self._token == "string":
+      self.chars.append(char)
+      self._consume_string(char)
+      return
+
+    if self._token == "number":
+      if char in "0123456789+-.eE":
+        self.chars.append(char)
+        self._token_text += char
+        return
+      self._finish_number()
+      self._after_value()
+      if self.state == self.DONE:
+        return
+
+    if self._token == "literal":
+      self.chars.append(char)
+      self._token_text += char
+      matches = [literal for literal in LITERALS if literal.startswith(self._token_text)]
+      if not matches:
+        self._error(f"Invalid literal '{self._token_text}'")
+      if self._token_text in LITERALS:
+        self._token = None
+        self._after_value()
+      return
+
+    if char in WHITESPACE:
+      if self.stack or self.state != self.VALUE:
+        self.chars.append(char)
+      return
+
+    self.chars.append(char)
+
+    if self.state in (self.VALUE, self.VALUE_OR_END):
+      if char == "]" and self.state == self.VALUE_OR_END:
+        self._close_container("array")
+      else:
+        self._start_value(char)
+    elif self.state in (self.KEY, self.KEY_OR_END):
+      if char == '"':
+        self._start_string(is_key=True)
+      elif char == "}" and self.state == self.KEY_OR_END:
+        self._close_container("object")
+      else:
+        self._error(f"Expected object key, got '{char}'")
+    elif self.state == self.COLON:
+      if char != ":":
+        self._error(f"Expected ':', got '{char}'")
+      self.state = self.VALUE
+    elif self.state == self.COMMA_OR_END:
+      container = self.stack[-1]
+      if char == ",":
+        self.state = self.KEY if container == "object" else self.VALUE
+      elif char == "}" and container == "object":
+        self._close_container("object")
+      elif char == "]" and container == "array":
+        self._close_container("array")
+      else:
+        self._error(f"Expected ',' or end of {container}, got '{char}'")
+
+  def _start_value(self, char: str):
+    if char == "{":
+      self.stack.append("object")
+      self.state = self.KEY_OR_END
+    elif char == "[":
+      self.stack.append("array")
+      self.state = self.VALUE_OR_END
+    elif char == '"':
+      self._start_string(is_key=False)
+    elif char == "-" or char.isdigit():
+      self._token = "number"
+      self._token_text = char
+    elif char in "tfn":
+      self._token = "literal"
+      self._token_text = char
+    else:
+      self._error(f"Unexpected character '{char}'")
+
+  def _start_string(self, is_key: bool):
+    self._token = "string"
+    self._string_is_key = is_key
+    self._escape = False
+    self._unicode_left = 0
+
+  def _consume_string(self, char: str):
+    if self._unicode_left:
+      if char not in "0123456789abcdefABCDEF":
+        self._error("Invalid unicode escape")
+      self._unicode_left -= 1
+    elif self._escape:
+      if char == "u":
+        self._unicode_left = 4
+      elif char not in '"\\/bfnrt':
+        self._error(f"Invalid escape '\\{char}'")
+      self._escape = False
+    elif char == "\\":
+      self._escape = True
+    elif char == '"':
+      self._token = None
+      if self._string_is_key:
+        self.state = self.COLON
+      else:
+        self._after_value()
+    elif ord(char) < 0x20:
+      self._error("Unescaped control character in string")
+
+  def _finish_number(self):
+    if not NUMBER_PATTERN.fullmatch(self._token_text):
+      self._error(f"Invalid number '{self._token_text}'")
+    self._token = None
+
+  def _close_container(self, kind: str):
+    if not self.stack or self.stack[-1] != kind:
+      self._error(f"Unbalanced closing {kind}")
+    self.stack.pop()
+    self._after_value()
+
+  def _after_value(self):
+    self.state = self.COMMA_OR_END if self.stack else self.DONE
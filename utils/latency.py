@@ -0,0 +1,62 @@
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+  if not samples:
+    return None
+
+  ordered = sorted(samples)
+  index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+  return ordered[index]
+
+class LatencyTracker:
+  def __init__(self, path: str, max_samples: int = 100):
+    self.path = path
+    self.max_samples = max_samples
+    self.samples: Dict[str, List[float]] = {}
+    self._lock = threading.Lock()
+
+    self.load()
+
+  def load(self):
+    if not os.path.exists(self.path):
+      return
+
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        self.samples = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+      log_message(logger, f"Ignoring unreadable latency history {self.path}: {e}", LogType.WARNING)
+      self.samples = {}
+
+  def record(self, model: str, seconds: float):
+    with self._lock:
+      history = self.samples.setdefault(model, [])
+      history.append(round(seconds, 3))
+      del history[:-self.max_samples]
+
+      directory = os.path.dirname(self.path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+
+      try:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+          json.dump(self.samples, f)
+        os.replace(tmp_path, self.path)
+      except OSError as e:
+        logger.debug(f"Failed to save latency history: {e}")
+
+  def percentile(self, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+    with self._lock:
+      history = list(self.samples.get(model, []))
+
+    if len(history) < min_samples:
+      return None
+    return percentile(history, q)
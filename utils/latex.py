@@ -0,0 +1,17 @@
+import re
+from typing import Any
+
+# already-escaped characters are left alone so escaping twice is harmless
+LATEX_SPECIALS_PATTERN = re.compile(r'(?<!\\)([%#])')
+
+def escape_latex_specials(value: Any) -> Any:
+  if isinstance(value, str):
+    if '\\' in value:
+      return LATEX_SPECIALS_PATTERN.sub(r'\\\1', value)
+    return value.replace('%', '\\%').replace('#', '\\#')
+  if isinstance(value, dict):
+    return { k: escape_latex_specials(v) for k, v in value.items() }
+  if isinstance(value, list):
+    return [escape_latex_specials(v) for v in value]
+
+  return value
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from utils.latency import percentile
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def new_run_id() -> str:
+  return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+class Ledger:
+  def __init__(self, path: str, run_id: Optional[str] = None):
+    self.path = path
+    self.run_id = run_id or new_run_id()
+    self.entries: List[Dict] = []
+    self._lock = threading.Lock()
+
+  def record(self, entry: Dict):
+    entry = { "ts": round(time.time(), 3), "run": self.run_id, **entry }
+
+    with self._lock:
+      self.entries.append(entry)
+
+      directory = os.path.dirname(self.path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+
+      try:
+        with open(self.path, 'a', encoding='utf-8') as f:
+          f.write(json.dumps(entry) + "\n")
+      except OSError as e:
+        logger.debug(f"Failed to append to AI ledger: {e}")
+
+  def log_summary(self):
+    if not self.entries:
+      return
+
+    logger.info(f"AI usage for run {self.run_id}:")
+    for line in format_report(self.entries):
+      logger.info(line)
+
+def load_ledger(path: str, last_runs: int = 0) -> List[Dict]:
+  if not os.path.exists(path):
+    return []
+
+  entries = []
+  with open(path, 'r', encoding='utf-8') as f:
+    for line_number, line in enumerate(f, 1):
+      if not line.strip():
+        continue
+      try:
+        entries.append(json.loads(line))
+      except json.JSONDecodeError:
+        log_message(logger, f"Skipping malformed ledger line {line_number}", LogType.WARNING)
+
+  if last_runs > 0:
+    runs = list(dict.fromkeys(entry.get("run") for entry in entries))[-last_runs:]
+    entries = [entry for entry in entries if entry.get("run") in runs]
+
+  return entries
+
+def summarise(entries: List[Dict]) -> Dict[str, Dict]:
+  groups: Dict[str, List[Dict]] = {}
+  for entry in entries:
+    groups.setdefault(entry.get("pass", "unknown"), []).append(entry)
+
+  summary = {}
+  for pass_name, group in groups.items():
+    calls = [entry for entry in group if not entry.get("cache_hit")]
+    wall = [entry["wall_seconds"] for entry in calls if entry.get("wall_seconds") is not None]
+    ttfb = [entry["ttfb_seconds"] for entry in calls if entry.get("ttfb_seconds") is not None]
+    prompt = [entry.get("prompt_tokens") or 0 for entry in calls]
+    completion = [entry.get("completion_tokens") or 0 for entry in calls]
+
+    summary[pass_name] = {
+      "calls": len(calls),
+      "cache_hits": len(group) - len(calls),
+      "errors": sum(1 for entry in calls if entry.get("status") != "ok"),
+      "wall_p50": percentile(wall, 50),
+      "wall_p95": percentile(wall, 95),
+      "ttfb_p50": percentile(ttfb, 50),
+      "ttfb_p95": percentile(ttfb, 95),
+      "prompt_tokens": sum(prompt),
+      "prompt_p50": percentile(prompt, 50),
+      "prompt_p95": percentile(prompt, 95),
+      "completion_tokens": sum(completion),
+      "completion_p50": percentile(completion, 50),
+      "completion_p95": percentile(completion, 95),
+      "cost": sum(entry.get("cost") or 0 for entry in calls)
+    }
+
+  return summary
+
+def _seconds(value: Optional[float]) -> str:
+  return f"{value:.2f}s" if value is not None else "-"
+
+def _tokens(value: Optional[float]) -> str:
+  return f"{value:.0f}" if value is not None else "-"
+
+def format_report(entries: List[Dict]) -> List[str]:
+  summary = summarise(entries)
+  lines = [
+    f"  {'pass':<28} {'calls':>5} {'cached':>6} {'errors':>6} {'wall p50/p95':>15} {'ttfb p50/p95':>15} "
+    f"{'prompt p50/p95':>15} {'compl. p50/p95':>15} {'tokens':>9} {'cost':>8}"
+  ]
+
+  for pass_name, stats in sorted(summary.items()):
+    lines.append(
+      f"  {pass_name[:28]:<28} {stats['calls']:>5} {stats['cache_hits']:>6} {stats['errors']:>6} "
+      f"{_seconds(stats['wall_p50']) + '/' + _seconds(stats['wall_p95']):>15} "
+      f"{_seconds(stats['ttfb_p50']) + '/' + _seconds(stats['ttfb_p95']):>15} "
+      f"{_tokens(stats['prompt_p50']) + '/' + _tokens(stats['prompt_p95']):>15} "
+      f"{_tokens(stats['completion_p50']) + '/' + _tokens(stats['completion_p95']):>15} "
+      f"{stats['prompt_tokens'] + stats['completion_tokens']:>9} {stats['cost']:>8.4f}"
+    )
+
+  return lines
@@ -0,0 +1,118 @@
+import json
+import math
+import re
+from typing import Any, List, Tuple
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+# fields the model is told not to touch, so there is no point paying tokens to send them.
+# Keys are matched on whole camelCase/snake_case words, so startDate and github_url are masked
+# but candidateSummary, validated and paid are not
+MASKED_KEY_WORDS = frozenset({ "date", "url", "link", "href", "email", "phone", "website", "github", "linkedin", "id", "urls", "links" })
+MASKED_KEYS = frozenset({ "__v", "createdAt", "updatedAt" })
+KEY_WORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+URL_VALUE_PATTERN = re.compile(r'^(https?://|mailto:|www\.)\S+$', re.IGNORECASE)
+# model-owned outputs: always sent as-is and never restored over what the model returned
+PRESERVED_KEYS = frozenset({ "_issues", "score" })
+
+Path = Tuple[Any, ...]
+
+def minify_json(value: Any) -> str:
+  return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+def estimate_tokens(text: str) -> int:
+  # ~4 chars per token for English/JSON with GPT tokenisers, good enough to compare encodings
+  return math.ceil(len(text) / 4)
+
+def _is_empty(value: Any) -> bool:
+  return value is None or value == "" or value == [] or value == {}
+
+def _key_words(key: str) -> List[str]:
+  return [word.lower() for word in KEY_WORD_PATTERN.findall(key)]
+
+def _is_masked_key(key: Any) -> bool:
+  if not isinstance(key, str):
+    return False
+  if key in MASKED_KEYS or key.lower() in MASKED_KEY_WORDS:
+    return True
+  return any(word in MASKED_KEY_WORDS for word in _key_words(key))
+
+def _is_date_key(key: Any) -> bool:
+  return isinstance(key, str) and "date" in _key_words(key)
+
+def _is_masked(key: Any, value: Any) -> bool:
+  if isinstance(value, (dict, list)):
+    return False
+  if _is_masked_key(key):
+    return True
+  return isinstance(value, str) and bool(URL_VALUE_PATTERN.match(value))
+
+def compact_payload(value: Any) -> Tuple[Any, List[Tuple[Path, Any]]]:
+  removed: List[Tuple[Path, Any]] = []
+
+  def walk(node: Any, path: Path) -> Any:
+    if isinstance(node, dict):
+      compacted = {}
+      for key, child in node.items():
+        child_path = path + (key,)
+        if key not in PRESERVED_KEYS and (_is_empty(child) or _is_masked(key, child)):
+          removed.append((child_path, child))
+          if child is None and _is_date_key(key):
+            # the prompts leave entries with null dates alone, so the model still has to see the null;
+            # it is restored like any other masked field
+            compacted[key] = None
+          continue
+        compacted[key] = walk(child, child_path)
+      return compacted
+
+    if isinstance(node, list):
+      # list items are never dropped so indices stay valid for rehydration
+      return [walk(child, path + (index,)) for index, child in enumerate(node)]
+
+    return node
+
+  return walk(value, ()), removed
+
+def _reorder(value: Any, reference: Any) -> Any:
+  if isinstance(value, dict) and isinstance(reference, dict):
+    ordered = { key: _reorder(value[key], reference[key]) for key in reference if key in value }
+    ordered.update({ key: child for key, child in value.items() if key not in ordered })
+    return ordered
+
+  if isinstance(value, list) and isinstance(reference, list):
+    return [
+      _reorder(child, reference[index]) if index < len(reference) else child
+      for index, child in enumerate(value)
+    ]
+
+  return value
+
+def rehydrate_payload(value: Any, removed: List[Tuple[Path, Any]], reference: Any) -> Any:
+  skipped = 0
+
+  for path, original in removed:
+    node = value
+    reachable = True
+
+    for segment in path[:-1]:
+      # a container the model dropped or changed type is not rebuilt from scratch
+      if isinstance(node, dict) and isinstance(segment, str) and segment in node:
+        node = node[segment]
+      elif isinstance(node, list) and isinstance(segment, int) and segment < len(node):
+        node = node[segment]
+      else:
+        reachable = False
+        break
+
+    last = path[-1]
+    if reachable and isinstance(node, dict):
+      # masked fields are never the model's to change, so the original always wins
+      node[last] = original
+    else:
+      skipped += 1
+
+  if skipped:
+    log_message(logger, f"Could not restore {skipped} masked fields, AI output changed the structure", LogType.WARNING)
+
+  return _reorder(value, reference)
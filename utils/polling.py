@@ -0,0 +1,96 @@
+import random
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from utils.rate_limiter import parse_retry_after
+
+def parse_timestamp(value) -> Optional[float]:
+  if isinstance(value, bool):
+    return None
+  if isinstance(value, (int, float)):
+    # accept both epoch seconds and milliseconds
+    return value / 1000 if value > 1e11 else float(value)
+  if not isinstance(value, str) or not value:
+    return None
+
+  try:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+  except ValueError:
+    pass
+  try:
+    return parsedate_to_datetime(value).timestamp()
+  except (TypeError, ValueError):
+    return None
+
+def parse_delay_hint(value) -> Optional[float]:
+  if value is None:
+    return None
+
+  try:
+    return max(0.0, float(value))
+  except (TypeError, ValueError):
+    pass
+
+  # an absolute time (HTTP-date or ISO) means "come back then"
+  timestamp = parse_timestamp(value)
+  if timestamp is None:
+    return None
+  return max(0.0, timestamp - time.time())
+
+def poll_hint(headers: Optional[Mapping[str, str]], body: Optional[Dict]) -> Optional[float]:
+  if headers is not None:
+    # same header handling as the AI client's 429 backoff
+    hint = parse_retry_after(headers)
+    if hint is not None:
+      return hint
+
+  if not isinstance(body, dict):
+    return None
+  for key in ("retryAfter", "etaSeconds"):
+    hint = parse_delay_hint(body.get(key))
+    if hint is not None:
+      return hint
+  # "eta" is read as a completion time when it is a timestamp, as seconds otherwise
+  return parse_delay_hint(body.get("eta"))
+
+def completion_time(body: Optional[Dict]) -> Optional[float]:
+  if not isinstance(body, dict):
+    return None
+  for key in ("completedAt", "finishedAt"):
+    timestamp = parse_timestamp(body.get(key))
+    if timestamp is not None:
+      return timestamp
+  return None
+
+class PollSchedule:
+  def __init__(
+    self,
+    initial: float,
+    maximum: float,
+    multiplier: float = 2.0,
+    jitter: float = 0.2,
+    first_delay: Optional[float] = None,
+    rng: Optional[random.Random] = None
+  ):
+    self.initial = min(initial, maximum)
+    self.maximum = maximum
+    self.multiplier = multiplier
+    self.jitter = jitter
+    self.first_delay = self.initial if first_delay is None else max(0.0, first_delay)
+    self.rng = rng or random.Random()
+    self._backoff = self.initial
+
+  def first(self) -> float:
+    return self.first_delay
+
+  def next_delay(self, hint: Optional[float] = None) -> float:
+    if hint is not None:
+      # the server knows best, but never hammer it or go quiet for longer than the cap
+      delay = min(max(hint, self.initial), self.maximum)
+      return min(self.maximum, delay * self.rng.uniform(1.0, 1.0 + self.jitter))
+
+    delay = self._backoff
+    self._backoff = min(self._backoff * self.multiplier, self.maximum)
+    # jitter keeps a batch of jobs submitted together from polling in lockstep
+    return min(self.maximum, delay * self.rng.uniform(1.0 - self.jitter, 1.0 + self.jitter))
@@ -0,0 +1,153 @@
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+DURATION_PART_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+def parse_duration(value: str) -> Optional[float]:
+  value = value.strip()
+  if not value:
+    return None
+
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+
+  # Go-style durations as sent in x-ratelimit-reset-* headers, e.g. "6m0s", "250ms"
+  parts = DURATION_PART_PATTERN.findall(value)
+  if not parts or "".join(number + unit for number, unit in parts) != value:
+    return None
+
+  factors = { "h": 3600, "m": 60, "s": 1, "ms": 0.001 }
+  return sum(float(number) * factors[unit] for number, unit in parts)
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+  retry_after_ms = headers.get("retry-after-ms")
+  if retry_after_ms:
+    seconds = parse_duration(retry_after_ms)
+    if seconds is not None:
+      return seconds / 1000
+
+  retry_after = headers.get("retry-after")
+  if retry_after:
+    seconds = parse_duration(retry_after)
+    if seconds is not None:
+      return seconds
+    try:
+      return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+      pass
+
+  resets = [
+    parse_duration(headers[name])
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    if headers.get(name)
+  ]
+  resets = [reset for reset in resets if reset is not None]
+  return max(resets) if resets else None
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+  # "full jitter": spreads out retries from concurrent workers that failed together
+  return random.uniform(0, min(max_seconds, base_seconds * 2 ** (attempt - 1)))
+
+class TokenBucket:
+  def __init__(self, per_minute: float):
+    self.capacity = float(per_minute)
+    self.refill_per_second = self.capacity / 60
+    self.tokens = self.capacity
+    self.updated_at = time.monotonic()
+
+  @property
+  def enabled(self) -> bool:
+    return self.capacity > 0
+
+  def refill(self, now: float):
+    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+    self.updated_at = now
+
+  def wait_time(self, amount: float) -> float:
+    amount = min(amount, self.capacity)
+    if self.tokens >= amount:
+      return 0.0
+    return (amount - self.tokens) / self.refill_per_second
+
+class RateLimiter:
+  def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+    self.requests = TokenBucket(requests_per_minute)
+    self.tokens = TokenBucket(tokens_per_minute)
+    self.paused_until = 0.0
+    self.stats = { "throttled": 0, "throttle_seconds": 0.0, "pauses": 0 }
+    self._lock = threading.Lock()
+
+  def acquire(self, estimated_tokens: int = 0) -> float:
+    waited = 0.0
+    buckets = [(bucket, amount) for bucket, amount in ((self.requests, 1), (self.tokens, estimated_tokens)) if bucket.enabled]
+
+    while True:
+      with self._lock:
+        now = time.monotonic()
+        for bucket, _ in buckets:
+          bucket.refill(now)
+
+        wait = max([self.paused_until - now] + [bucket.wait_time(amount) for bucket, amount in buckets])
+        if wait <= 0:
+          for bucket, amount in buckets:
+            bucket.tokens -= min(amount, bucket.capacity)
+
+          if waited:
+            self.stats["throttled"] += 1
+            self.stats["throttle_seconds"] += waited
+          return waited
+
+      time.sleep(wait)
+      waited += wait
+
+  def pause(self, seconds: float):
+    with self._lock:
+      until = time.monotonic() + seconds
+      if until > self.paused_until:
+        self.paused_until = until
+        self.stats["pauses"] += 1
+
+  def log_stats(self):
+    logger.info(
+      f"AI rate limiter: throttled {self.stats['throttled']} requests for "
+      f"{self.stats['throttle_seconds']:.1f}s total, {self.stats['pauses']} server-requested pauses"
+    )
+
+  def update_from_headers(self, headers: Mapping[str, str]):
+    for kind in ("requests", "tokens"):
+      remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+      reset = headers.get(f"x-ratelimit-reset-{kind}")
+      if remaining is None or reset is None:
+        continue
+
+      try:
+        exhausted = float(remaining) <= 0
+      except ValueError:
+        continue
+
+      seconds = parse_duration(reset)
+      if exhausted and seconds:
+        logger.debug(f"Server reports {kind} quota exhausted, pausing for {seconds:.1f}s")
+        self.pause(seconds)
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+  global _shared_limiter
+
+  with _shared_lock:
+    if _shared_limiter is None:
+      _shared_limiter = RateLimiter(settings.AI_REQUESTS_PER_MINUTE, settings.AI_TOKENS_PER_MINUTE)
+    return _shared_limiter
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from utils.cache import canonical_json
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def render_key(identity: str, payload: Dict) -> str:
+  material = canonical_json({ "identity": identity, "payload": payload })
+  return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+class RenderIndex:
+  def __init__(self, path: str, ttl_seconds: float):
+    self.path = path
+    self.ttl_seconds = ttl_seconds
+    self.entries: Dict[str, Dict] = {}
+    self.stats = { "hits": 0, "misses": 0, "stale": 0 }
+    self._lock = threading.Lock()
+
+    self.load()
+
+  def load(self):
+    if not os.path.exists(self.path):
+      return
+
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        self.entries = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+      log_message(logger, f"Ignoring unreadable render index {self.path}: {e}", LogType.WARNING)
+      self.entries = {}
+
+  def get(self, key: str) -> Optional[Dict]:
+    with self._lock:
+      entry = self.entries.get(key)
+
+      if entry is None:
+        self.stats["misses"] += 1
+        return None
+      if time.time() - entry.get("renderedAt", 0) > self.ttl_seconds:
+        self.stats["stale"] += 1
+        return None
+
+      self.stats["hits"] += 1
+      return dict(entry)
+
+  def put(self, key: str, pdf_url: str, job_id: str, template_id: str, resume_name: str):
+    with self._lock:
+      self.entries[key] = {
+        "pdfUrl": pdf_url,
+        "jobId": job_id,
+        "templateId": template_id,
+        "resumeName": resume_name,
+        "renderedAt": time.time()
+      }
+      self._save()
+
+  def invalidate(self, key: str):
+    # the PDF behind a hit turned out to be gone; count it as a render after all
+    with self._lock:
+      if self.entries.pop(key, None) is not None:
+        self.stats["hits"] -= 1
+        self.stats["stale"] += 1
+        self._save()
+
+  def _save(self):
+    # expired entries are dropped on every write so the index can't grow without bound
+    now = time.time()
+    self.entries = {
+      key: entry for key, entry in self.entries.items()
+      if now - entry.get("renderedAt", 0) <= self.ttl_seconds
+    }
+
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{self.path}.tmp"
+    try:
+      with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(self.entries, f)
+      os.replace(tmp_path, self.path)
+    except OSError as e:
+      logger.debug(f"Failed to save render index: {e}")
+
+  def log_stats(self):
+    lookups = self.stats["hits"] + self.stats["misses"] + self.stats["stale"]
+    if not lookups:
+      return
+    logger.info(f"Render index: {self.stats['hits']} reused, {self.stats['misses'] + self.stats['stale']} rendered")
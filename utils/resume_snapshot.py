@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+from utils.cache import canonical_json
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def content_hash(resume_data: Dict) -> str:
+  return hashlib.sha256(canonical_json(resume_data).encode('utf-8')).hexdigest()
+
+def load_resume_file(path: str) -> Dict:
+  with open(path, 'r', encoding='utf-8') as f:
+    document = json.load(f)
+
+  # accept a snapshot, a raw API response ({"data": ...}) or the bare resume
+  if isinstance(document, dict) and isinstance(document.get("data"), dict):
+    document = document["data"]
+  if not isinstance(document, dict) or not document:
+    raise ValueError(f"No resume data in {path}")
+  return document
+
+class ResumeSnapshot:
+  def __init__(self, path: str, identity: str):
+    self.path = path
+    self.identity = identity
+
+  def load(self) -> Optional[Dict]:
+    if not os.path.exists(self.path):
+      return None
+
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+      log_message(logger, f"Ignoring unreadable resume snapshot {self.path}: {e}", LogType.WARNING)
+      return None
+
+    # a snapshot of another account's resume must never be served
+    if not isinstance(entry, dict) or entry.get("identity") != self.identity:
+      logger.debug(f"Resume snapshot {self.path} belongs to another API or account")
+      return None
+    if not isinstance(entry.get("data"), dict) or not entry["data"]:
+      return None
+    return entry
+
+  def save(self, resume_data: Dict, etag: Optional[str], last_modified: Optional[str]) -> Dict:
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+
+    entry = {
+      "identity": self.identity,
+      "etag": etag,
+      "lastModified": last_modified,
+      "contentHash": content_hash(resume_data),
+      "savedAt": time.time(),
+      "data": resume_data
+    }
+
+    tmp_path = f"{self.path}.tmp"
+    try:
+      with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+      os.replace(tmp_path, self.path)
+    except OSError as e:
+      log_message(logger, f"Failed to save resume snapshot: {e}", LogType.WARNING)
+    return entry
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class Stage:
+  def __init__(self, name: str, func: StageFunc, deps: Sequence[str] = ()):
+    self.name = name
+    self.func = func
+    self.deps = tuple(deps)
+    self.started: Optional[float] = None
+    self.finished: Optional[float] = None
+    self.status = "pending"
+
+  @property
+  def duration(self) -> float:
+    if self.started is None or self.finished is None:
+      return 0.0
+    return self.finished - self.started
+
+class StageScheduler:
+  def __init__(self, serial: bool = False):
+    self.serial = serial
+    self.stages: Dict[str, Stage] = {}
+    self.results: Dict[str, Any] = {}
+    self.failed: Optional[str] = None
+    self._origin: Optional[float] = None
+    self._finished: Optional[float] = None
+
+  def add(self, name: str, func: StageFunc, deps: Sequence[str] = ()):
+    if name in self.stages:
+      raise ValueError(f"Duplicate stage: {name}")
+    self.stages[name] = Stage(name, func, deps)
+
+  def order(self) -> List[str]:
+    # insertion order wherever the dependencies allow it, so --serial runs the stages as written
+    ordered: List[str] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str, path: Tuple[str, ...]):
+      if state.get(name) == "done":
+        return
+      if state.get(name) == "visiting":
+        raise ValueError(f"Stage dependency cycle: {' -> '.join(path + (name,))}")
+
+      state[name] = "visiting"
+      for dep in self.stages[name].deps:
+        if dep not in self.stages:
+          raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        visit(dep, path + (name,))
+      state[name] = "done"
+      ordered.append(name)
+
+    for name in self.stages:
+      visit(name, ())
+    return ordered
+
+  async def _run_stage(self, stage: Stage):
+    stage.started = time.perf_counter()
+    stage.status = "running"
+    logger.debug(f"Stage '{stage.name}' started at +{stage.started - self._origin:.2f}s")
+
+    try:
+      self.results[stage.name] = await stage.func(self.results)
+      stage.status = "done"
+    except asyncio.CancelledError:
+      stage.status = "cancelled"
+      raise
+    except BaseException:
+      stage.status = "failed"
+      if self.failed is None:
+        self.failed = stage.name
+      raise
+    finally:
+      stage.finished = time.perf_counter()
+
+  async def run(self) -> Dict[str, Any]:
+    order = self.order()
+    self._origin = time.perf_counter()
+
+    try:
+      if self.serial:
+        for name in order:
+          await self._run_stage(self.stages[name])
+      else:
+        await self._run_concurrently(order)
+    finally:
+      self._finished = time.perf_counter()
+
+    return self.results
+
+  async def _run_concurrently(self, order: List[str]):
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_when_ready(stage: Stage):
+      for dep in stage.deps:
+        await tasks[dep]
+      await self._run_stage(stage)
+
+    for name in order:
+      tasks[name] = asyncio.create_task(run_when_ready(self.stages[name]), name=f"stage:{name}")
+
+    try:
+      done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+      pending = [task for task in tasks.values() if not task.done()]
+      for task in pending:
+        task.cancel()
+      if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if self.failed is not None:
+      # dependents re-raise their dependency's error; surface the stage that actually broke
+      raise tasks[self.failed].exception()
+    for task in done:
+      if task.exception() is not None:
+        raise task.exception()
+
+  def critical_path(self) -> Tuple[List[str], float]:
+    # longest chain of measured stage durations; no amount of concurrency gets a run below this
+    longest: Dict[str, Tuple[float, List[str]]] = {}
+
+    for name in self.order():
+      stage = self.stages[name]
+      best_length, best_path = 0.0, []
+      for dep in stage.deps:
+        length, path = longest[dep]
+        if length > best_length:
+          best_length, best_path = length, path
+      longest[name] = (best_length + stage.duration, best_path + [name])
+
+    if not longest:
+      return [], 0.0
+    length, path = max(longest.values(), key=lambda entry: entry[0])
+    return [name for name in path if self.stages[name].status != "pending"], length
+
+  def log_timings(self):
+    if self._origin is None:
+      return
+
+    stages = [stage for stage in self.stages.values() if stage.started is not None]
+    if not stages:
+      return
+
+    path, path_length = self.critical_path()
+    wall = (self._finished or time.perf_counter()) - self._origin
+    busy = sum(stage.duration for stage in stages)
+
+    logger.info(f"Stage timings ({'serial' if self.serial else 'concurrent'}):")
+    logger.info(f"  {'stage':<14} {'start':>8} {'took':>8}  status")
+    for stage in sorted(stages, key=lambda stage: stage.started):
+      marker = " *" if stage.name in path else ""
+      logger.info(
+        f"  {stage.name:<14} {stage.started - self._origin:>7.2f}s {stage.duration:>7.2f}s  {stage.status}{marker}"
+      )
+
+    logger.info(
+      f"Critical path: {' -> '.join(path)} = {path_length:.2f}s "
+      f"(wall {wall:.2f}s, {busy:.2f}s of stage time, {busy / wall if wall else 0:.1f}x overlap)"
+    )
@@ -0,0 +1,131 @@
+import json
+from typing import Any, Dict, List
+from utils.cache import canonical_json
+
+def derive_schema(value: Any) -> Dict:
+  if isinstance(value, dict):
+    return {
+      "type": "object",
+      "properties": { key: derive_schema(item) for key, item in value.items() },
+      "required": list(value.keys()),
+      "additionalProperties": False
+    }
+
+  if isinstance(value, list):
+    variants = {}
+    for item in value:
+      item_schema = derive_schema(item)
+      variants.setdefault(canonical_json(item_schema), item_schema)
+
+    if not variants:
+      return { "type": "array", "items": { "type": "string" } }
+    if len(variants) == 1:
+      return { "type": "array", "items": next(iter(variants.values())) }
+    # entries with different shapes (e.g. one job without a location) each keep their own keys
+    return { "type": "array", "items": { "anyOf": list(variants.values()) } }
+
+  if isinstance(value, bool):
+    return { "type": "boolean" }
+  if isinstance(value, (int, float)):
+    return { "type": "number" }
+  if value is None:
+    return { "type": "null" }
+  return { "type": "string" }
+
+def object_schema(properties: Dict[str, Dict]) -> Dict:
+  return {
+    "type": "object",
+    "properties": properties,
+    "required": list(properties.keys()),
+    "additionalProperties": False
+  }
+
+def _type_matches(value: Any, expected: str) -> bool:
+  if expected == "object":
+    return isinstance(value, dict)
+  if expected == "array":
+    return isinstance(value, list)
+  if expected == "string":
+    return isinstance(value, str)
+  if expected == "boolean":
+    return isinstance(value, bool)
+  if expected == "number":
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+  if expected == "null":
+    return value is None
+  return True
+
+def validate_schema(value: Any, schema: Dict, path: str = "$") -> List[str]:
+  if "anyOf" in schema:
+    for option in schema["anyOf"]:
+      if not validate_schema(value, option, path):
+        return []
+    return [f"{path}: does not match any allowed shape"]
+
+  expected = schema.get("type")
+  if expected and not _type_matches(value, expected):
+    return [f"{path}: expected {expected}, got {type(value).__name__}"]
+
+  errors = []
+
+  if expected == "object":
+    properties = schema.get("properties", {})
+    for key in schema.get("required", []):
+      if key not in value:
+        errors.append(f"{path}.{key}: missing")
+    if schema.get("additionalProperties") is False:
+      errors.extend(f"{path}.{key}: unexpected" for key in value if key not in properties)
+    for key, item in value.items():
+      if key in properties:
+        errors.extend(validate_schema(item, properties[key], f"{path}.{key}"))
+
+  elif expected == "array" and "items" in schema:
+    for index, item in enumerate(value):
+      errors.extend(validate_schema(item, schema["items"], f"{path}[{index}]"))
+
+  elif expected == "number":
+    if "minimum" in schema and value < schema["minimum"]:
+      errors.append(f"{path}: below minimum {schema['minimum']}")
+    if "maximum" in schema and value > schema["maximum"]:
+      errors.append(f"{path}: above maximum {schema['maximum']}")
+
+  return errors
+
+def salvage_members(text: str) -> Dict:
+  # recover the top-level members that parsed cleanly before the document went bad
+  decoder = json.JSONDecoder()
+  members = {}
+
+  position = text.find("{")
+  if position < 0:
+    return members
+  position += 1
+
+  def skip_whitespace(index: int) -> int:
+    while index < len(text) and text[index] in " \t\r\n":
+      index += 1
+    return index
+
+  while True:
+    position = skip_whitespace(position)
+    try:
+      key, position = decoder.raw_decode(text, position)
+    except json.JSONDecodeError:
+      return members
+    if not isinstance(key, str):
+      return members
+
+    position = skip_whitespace(position)
+    if position >= len(text) or text[position] != ":":
+      return members
+
+    try:
+      value, position = decoder.raw_decode(text, skip_whitespace(position + 1))
+    except json.JSONDecodeError:
+      return members
+    members[key] = value
+
+    position = skip_whitespace(position)
+    if position >= len(text) or text[position] != ",":
+      return members
+    position += 1
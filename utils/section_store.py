@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from utils.cache import canonical_json
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def fingerprint_section(model: str, system_prompt: str, section: Dict) -> str:
+  material = canonical_json({
+    "model": model,
+    "system": system_prompt,
+    "section": section
+  })
+  return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+class SectionStore:
+  def __init__(self, path: str):
+    self.path = path
+    self.sections: Dict[str, Dict] = {}
+    self._lock = threading.Lock()
+
+    self.load()
+
+  def load(self):
+    if not os.path.exists(self.path):
+      return
+
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        self.sections = json.load(f).get("sections", {})
+      logger.debug(f"Loaded {len(self.sections)} stored sections from {self.path}")
+    except (OSError, json.JSONDecodeError) as e:
+      log_message(logger, f"Ignoring unreadable section store {self.path}: {e}", LogType.WARNING)
+      self.sections = {}
+
+  def get(self, label: str, fingerprint: str) -> Optional[Dict]:
+    entry = self.sections.get(label)
+    if entry and entry.get("fingerprint") == fingerprint:
+      return entry
+    return None
+
+  def put(self, label: str, fingerprint: str, output: Dict, issues: List):
+    with self._lock:
+      self.sections[label] = {
+        "fingerprint": fingerprint,
+        "output": output,
+        "issues": issues,
+        "updated_at": time.time()
+      }
+
+  def prune(self, labels: Iterable[str]):
+    keep = set(labels)
+    with self._lock:
+      for label in [label for label in self.sections if label not in keep]:
+        del self.sections[label]
+
+  def save(self):
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{self.path}.tmp"
+    with self._lock:
+      try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+          json.dump({ "sections": self.sections }, f)
+        os.replace(tmp_path, self.path)
+      except OSError as e:
+        log_message(logger, f"Failed to save section store {self.path}: {e}", LogType.WARNING)
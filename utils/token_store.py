@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+from utils.logger import setup_logger, log_message, LogType
+
+logger = setup_logger(__name__)
+
+def decode_jwt_expiry(token: str) -> Optional[float]:
+  parts = token.split(".")
+  if len(parts) != 3:
+    return None
+
+  payload = parts[1] + "=" * (-len(parts[1]) % 4)
+  try:
+    claims = json.loads(base64.urlsafe_b64decode(payload))
+  except (ValueError, json.JSONDecodeError):
+    return None
+
+  exp = claims.get("exp") if isinstance(claims, dict) else None
+  if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+    return None
+  return float(exp)
+
+def token_identity(base_url: str, username: str) -> str:
+  # tokens for another API or account must never be picked up
+  return hashlib.sha256(f"{base_url}\n{username}".encode("utf-8")).hexdigest()[:16]
+
+class TokenStore:
+  def __init__(self, path: str):
+    self.path = path
+
+  def load(self, identity: str) -> Optional[Dict]:
+    if not os.path.exists(self.path):
+      return None
+
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+      log_message(logger, f"Ignoring unreadable token cache {self.path}: {e}", LogType.WARNING)
+      return None
+
+    if not isinstance(entry, dict) or entry.get("identity") != identity:
+      return None
+    if not entry.get("accessToken") or not isinstance(entry.get("expiresAt"), (int, float)):
+      return None
+    return entry
+
+  def save(self, identity: str, access_token: str, expires_at: float):
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    entry = {
+      "identity": identity,
+      "accessToken": access_token,
+      "expiresAt": expires_at,
+      "savedAt": time.time()
+    }
+
+    tmp_path = f"{self.path}.tmp"
+    try:
+      # created 0600 up front so the token is never readable by others, even briefly
+      fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+      with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+      os.chmod(tmp_path, 0o600)
+      os.replace(tmp_path, self.path)
+    except OSError as e:
+      log_message(logger, f"Failed to save token cache: {e}", LogType.WARNING)
+
+  def clear(self):
+    try:
+      os.remove(self.path)
+    except FileNotFoundError:
+      pass
+    except OSError as e:
+      logger.debug(f"Failed to remove token cache: {e}")